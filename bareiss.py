@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+from fractions import Fraction
+from math import gcd
+
+from vector import Vector, FRACTION
+
+
+def _lcm(a, b):
+    return a * b // gcd(a, b)
+
+
+# 转成精确的有理数；float按其精确的二进制值转换，0.1 即 3602879701896397/2**55，
+# 结果是对实际存储的数精确求解，而不是对用户输入的十进制小数
+def _to_fraction(x):
+    if isinstance(x, Fraction):
+        return x
+    return Fraction(x)
+
+
+# Bareiss无分数消元：整数矩阵消元过程中每一步都能整除上一个主元，中间结果始终是整数子式，
+# 不需要容差判断，秩、奇异性和解都是精确的
+class BareissElimination(object):
+
+    MATRIX_MUST_BE_SQUARE_MSG = 'Determinant requires a square coefficient matrix'
+
+    def __init__(self, coefficients, constants=None):
+        if not coefficients or not coefficients[0]:
+            raise ValueError('The coefficient matrix must be nonempty')
+
+        self.num_rows = len(coefficients)
+        self.num_cols = len(coefficients[0])
+        if constants is None:
+            constants = [0] * self.num_rows
+
+        # 每行乘以分母的最小公倍数化为整数，记录缩放倍数用于还原行列式
+        self.rows = []
+        self.row_scales = []
+        for row, k in zip(coefficients, constants):
+            values = [_to_fraction(x) for x in row] + [_to_fraction(k)]
+            scale = 1
+            for v in values:
+                if v.denominator != 1:
+                    scale = _lcm(scale, v.denominator)
+            self.rows.append([int(v * scale) for v in values])
+            self.row_scales.append(scale)
+
+        self.num_swaps = 0
+        # 消元后主元位置 (行, 列)
+        self.pivots = []
+        self._eliminate()
+
+    @classmethod
+    def from_system(cls, system):
+        coefficients = [system.coefficient_row(i) for i in range(len(system))]
+        constants = [system.constant_term(i) for i in range(len(system))]
+        return cls(coefficients, constants)
+
+    def _eliminate(self):
+        a = self.rows
+        m, n = self.num_rows, self.num_cols
+        width = n + 1
+        prev = 1
+
+        r = 0
+        for j in range(n):
+            if r == m:
+                break
+            # 精确算术下只需要找到一个非零主元
+            p = r
+            while p < m and a[p][j] == 0:
+                p += 1
+            if p == m:
+                continue
+            if p != r:
+                a[p], a[r] = a[r], a[p]
+                self.num_swaps += 1
+
+            pivot_row = a[r]
+            pivot = pivot_row[j]
+            for i in range(r + 1, m):
+                row = a[i]
+                g = row[j]
+                row[j+1:width] = [(pivot * x - g * y) // prev
+                                  for x, y in zip(row[j+1:width], pivot_row[j+1:width])]
+                row[j] = 0
+
+            prev = pivot
+            self.pivots.append((r, j))
+            r += 1
+
+    @property
+    def rank(self):
+        return len(self.pivots)
+
+    def is_singular(self):
+        return self.num_rows != self.num_cols or self.rank < self.num_cols
+
+    # 存在 0 = k (k不为0) 的行即无解
+    def is_consistent(self):
+        n = self.num_cols
+        for row in self.rows[self.rank:]:
+            if row[n] != 0:
+                return False
+        return True
+
+    # 行列式：最后一个主元就是整数化后矩阵的行列式，再除去各行的缩放倍数
+    def determinant(self):
+        if self.num_rows != self.num_cols:
+            raise Exception(self.MATRIX_MUST_BE_SQUARE_MSG)
+        if self.rank < self.num_cols:
+            return Fraction(0)
+
+        det = Fraction(self.rows[-1][-2])
+        if self.num_swaps % 2:
+            det = -det
+        for scale in self.row_scales:
+            det /= scale
+        return det
+
+    # 回代得到基点（自由变量取0）
+    def extract_basepoint_for_parametrization(self):
+        return self._back_substitute(None)
+
+    # 每个自由变量对应一个方向向量
+    def extract_direction_vectors_for_parametrization(self):
+        pivot_cols = set(j for _, j in self.pivots)
+        return [self._back_substitute(f) for f in range(self.num_cols) if f not in pivot_cols]
+
+    def _back_substitute(self, free_var):
+        n = self.num_cols
+        x = [Fraction(0)] * n
+        if free_var is not None:
+            x[free_var] = Fraction(1)
+
+        for r, j in reversed(self.pivots):
+            row = self.rows[r]
+            s = 0 if free_var is not None else row[n]
+            for c in range(j + 1, n):
+                if row[c] and x[c]:
+                    s -= row[c] * x[c]
+            x[j] = Fraction(s) / row[j]
+
+        return Vector(x, FRACTION)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+from array import array
+from itertools import repeat
+from operator import add, mul
+
+from vector import Vector, VectorArray, get_backend
+
+
+# 子空间的标准正交基：由一组向量经修正Gram-Schmidt得到，基向量只单位化一次并缓存
+# 对每个新向量做两轮正交化（"twice is enough"），避免舍入误差使基失去正交性
+# 可以随时追加向量扩充子空间；与已有基线性相关的向量不会加入
+# 单位化要开方：decimal 后端按其上下文精度开方，fraction 后端借助30位Decimal开方，
+# 所以非float后端的基也只是近似单位正交（约30位有效数字），投影、距离并不精确
+class OrthonormalBasis(object):
+
+    WRONG_DIMENSION_MSG = 'Vector dimension does not match the basis'
+
+    def __init__(self, vectors=(), dimension=None, backend=None, tolerance=1e-10):
+        vectors = list(vectors)
+        if backend is None and vectors and isinstance(vectors[0], Vector):
+            backend = vectors[0].backend
+        self.backend = get_backend(backend)
+        if dimension is None:
+            if not vectors:
+                raise ValueError('dimension is required for an empty basis')
+            dimension = len(self._coords(vectors[0]))
+        self.dimension = dimension
+        self.tolerance = tolerance
+        # 基向量坐标（后端数值类型）
+        self.basis = []
+        self.extend(vectors)
+
+    def _coords(self, v):
+        return v.coordinates if isinstance(v, Vector) else v
+
+    def __len__(self):
+        return len(self.basis)
+
+    @property
+    def rank(self):
+        return len(self.basis)
+
+    def vectors(self):
+        return [Vector(q, self.backend) for q in self.basis]
+
+    # 追加一个向量，成功扩充子空间时返回True
+    def append(self, v):
+        convert = self.backend.convert
+        w = [convert(x) for x in self._coords(v)]
+        if len(w) != self.dimension:
+            raise ValueError(self.WRONG_DIMENSION_MSG)
+
+        norm0 = self.backend.sqrt(sum(x * x for x in w))
+        if self.backend.is_near_zero(norm0, self.tolerance):
+            return False
+        for _ in range(2):
+            for q in self.basis:
+                c = sum(map(mul, w, q))
+                w = [x - c * y for x, y in zip(w, q)]
+
+        norm = self.backend.sqrt(sum(x * x for x in w))
+        # 剩余部分相对原向量足够小，说明已在子空间内
+        if norm <= convert(self.tolerance) * norm0:
+            return False
+        inv = 1 / norm
+        self.basis.append(tuple(x * inv for x in w))
+        return True
+
+    def extend(self, vectors):
+        return [self.append(v) for v in vectors]
+
+    # 在基下的坐标 Q^T v；VectorArray 时返回每个基向量对应的一列系数 array('d')
+    def coefficients(self, vectors):
+        if isinstance(vectors, VectorArray):
+            self._check_dimension(vectors.dimension)
+            return [vectors.xiangliang_chengfa(q) for q in self.basis]
+        if isinstance(vectors, Vector):
+            coords = self._values(vectors)
+            return [sum(map(mul, coords, q)) for q in self.basis]
+        return [self.coefficients(v) for v in vectors]
+
+    def _check_dimension(self, dimension):
+        if dimension != self.dimension:
+            raise ValueError(self.WRONG_DIMENSION_MSG)
+
+    def _values(self, v):
+        coords = self._coords(v)
+        self._check_dimension(len(coords))
+        if isinstance(v, Vector) and v.backend is self.backend:
+            return coords
+        convert = self.backend.convert
+        return [convert(x) for x in coords]
+
+    def _project_values(self, coords):
+        result = [self.backend.convert(0)] * self.dimension
+        for q in self.basis:
+            c = sum(map(mul, coords, q))
+            result = [r + c * y for r, y in zip(result, q)]
+        return result
+
+    # 投影到子空间：Vector -> Vector，VectorArray -> VectorArray，列表 -> 列表
+    # VectorArray 按列批量计算，每个基向量只遍历一次所有向量
+    def project(self, vectors):
+        if isinstance(vectors, VectorArray):
+            n = len(vectors)
+            columns = [array('d', repeat(0.0, n)) for _ in range(self.dimension)]
+            for q, c in zip(self.basis, self.coefficients(vectors)):
+                columns = [array('d', map(add, col, map(mul, c, repeat(float(y)))))
+                           for col, y in zip(columns, q)]
+            return VectorArray.from_columns(columns)
+        if isinstance(vectors, Vector):
+            return Vector(self._project_values(self._values(vectors)), self.backend)
+        return [self.project(v) for v in vectors]
+
+    # 垂直于子空间的分量：v - 投影
+    def reject(self, vectors):
+        if isinstance(vectors, VectorArray):
+            return vectors.minus(self.project(vectors))
+        if isinstance(vectors, Vector):
+            coords = self._values(vectors)
+            return Vector([x - p for x, p in zip(coords, self._project_values(coords))], self.backend)
+        return [self.reject(v) for v in vectors]
+
+    # 到子空间的距离（垂直分量的大小）
+    def distance(self, vectors):
+        if isinstance(vectors, (Vector, VectorArray)):
+            return self.reject(vectors).xiangliang_val()
+        return [self.distance(v) for v in vectors]
+
+    def contains(self, v, tolerance=1e-10):
+        return self.distance(v) < tolerance
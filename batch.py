@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+
+from vector import Vector, get_backend, FLOAT
+from linsys import LinearSystem, Parametrization
+
+
+# 紧凑序列化：float后端直接打包成double字节串，decimal/fraction后端转成字符串
+# 避免把Plane/Vector对象整体pickle
+def _pack_values(values, backend):
+    if backend is FLOAT:
+        return array('d', values).tobytes()
+    return tuple(str(x) for x in values)
+
+
+def _unpack_values(data, backend):
+    if backend is FLOAT:
+        values = array('d')
+        values.frombytes(data)
+        return list(values)
+    convert = backend.convert
+    return [convert(x) for x in data]
+
+
+def encode_system(system):
+    if not isinstance(system, LinearSystem):
+        system = LinearSystem(system)
+    return (system.num_equations, system.dimension, system.backend.name,
+            _pack_values(system.matrix, system.backend))
+
+
+def decode_system(data):
+    num_equations, dimension, backend_name, values = data
+    backend = get_backend(backend_name)
+    return LinearSystem._from_flat(_unpack_values(values, backend), num_equations, dimension, backend)
+
+
+def encode_solution(solution, backend):
+    if not isinstance(solution, Parametrization):
+        return str(solution)
+    return (_pack_values(solution.basepoint.coordinates, backend),
+            [_pack_values(v.coordinates, backend) for v in solution.direction_vectors])
+
+
+def decode_solution(data, backend_name):
+    if isinstance(data, str):
+        return data
+    backend = get_backend(backend_name)
+    basepoint, directions = data
+    return Parametrization(basepoint=Vector(_unpack_values(basepoint, backend), backend),
+                           direction_vectors=[Vector(_unpack_values(d, backend), backend) for d in directions])
+
+
+# 子进程中求解一块方程组，返回编码后的结果
+def _solve_chunk(encoded_systems):
+    results = []
+    for data in encoded_systems:
+        system = decode_system(data)
+        results.append(encode_solution(system.compute_solution(), system.backend))
+    return results
+
+
+def _chunks(systems, chunksize):
+    it = iter(systems)
+    start = 0
+    while True:
+        chunk = [encode_system(s) for s in islice(it, chunksize)]
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+# 按块分发到进程池求解，(序号, 结果) 按完成先后逐个产出
+# 同时在途的块数有上限，输入可以是很大的生成器
+def iter_solve_batch(systems, max_workers=None, chunksize=256, max_pending=None):
+    if max_pending is None:
+        max_pending = 2 * (max_workers or os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        chunks = _chunks(systems, chunksize)
+
+        def submit(count):
+            for start, chunk in islice(chunks, count):
+                backends = [data[2] for data in chunk]
+                pending[executor.submit(_solve_chunk, chunk)] = (start, backends)
+
+        submit(max_pending)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                start, backends = pending.pop(future)
+                for k, (data, backend_name) in enumerate(zip(future.result(), backends)):
+                    yield start + k, decode_solution(data, backend_name)
+            submit(len(done))
+
+
+# 保持输入顺序逐个产出结果，先完成的块先缓存
+def solve_batch(systems, max_workers=None, chunksize=256, max_pending=None):
+    buffered = {}
+    next_index = 0
+    for index, result in iter_solve_batch(systems, max_workers, chunksize, max_pending):
+        buffered[index] = result
+        while next_index in buffered:
+            yield buffered.pop(next_index)
+            next_index += 1
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# 比较float / decimal / fraction 三种数值后端的点积、单位化和解方程组速度
+# 用法: python benchmarks/bench_backend.py [--repeat 5] [--number 2000]
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from vector import Vector, BACKENDS
+from plane import Plane
+from linsys import LinearSystem
+
+
+def make_cases(backend, seed=666, dimension=3, count=64):
+    rnd = random.Random(seed)
+    coords = [[round(rnd.uniform(-10, 10), 3) for _ in range(dimension)] for _ in range(count)]
+    vectors = [Vector([str(x) for x in c], backend) for c in coords]
+    planes = [Plane(normal_vector=v, constant_term=str(round(rnd.uniform(-10, 10), 3))) for v in vectors]
+    systems = [LinearSystem(planes[i:i+3]) for i in range(0, count - 2, 3)]
+    return vectors, systems
+
+
+def bench_backend(backend, repeat, number):
+    vectors, systems = make_cases(backend)
+    pairs = list(zip(vectors, vectors[1:]))
+
+    def dot():
+        for v, w in pairs:
+            v.xiangliang_chengfa(w)
+
+    def normalize():
+        for v in vectors:
+            v.unit_xiangliang()
+
+    def solve():
+        for s in systems:
+            s.compute_solution()
+
+    result = {}
+    for name, func, ops in (('dot', dot, len(pairs)),
+                            ('normalize', normalize, len(vectors)),
+                            ('solve', solve, len(systems))):
+        n = max(1, number // ops) if name == 'solve' else number
+        best = min(timeit.repeat(func, repeat=repeat, number=n))
+        result[name] = ops * n / best
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Vector numeric backend benchmark')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    results = {name: bench_backend(name, args.repeat, args.number) for name in ('decimal', 'float', 'fraction')}
+    baseline = results['decimal']
+
+    print('{:<10}{:>16}{:>16}{:>16}'.format('backend', 'dot/s', 'normalize/s', 'solve/s'))
+    for name in sorted(BACKENDS):
+        r = results[name]
+        print('{:<10}'.format(name) + ''.join(
+            '{:>16}'.format('{:.0f} ({:.1f}x)'.format(r[k], r[k] / baseline[k]))
+            for k in ('dot', 'normalize', 'solve')))
+
+
+if __name__ == '__main__':
+    main()
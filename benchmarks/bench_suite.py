@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# Vector / Plane / LinearSystem 基准测试，输入由 helper.generateMatrix / generatePoints 按种子生成，结果可复现
+# 输出JSON，可与上一次的结果比较以发现性能回退
+# 用法:
+#   python benchmarks/bench_suite.py --output bench.json
+#   python benchmarks/bench_suite.py --compare bench.json --threshold 0.2
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'linear_algebra-master'))
+
+from helper import generateMatrix, generatePoints
+from vector import Vector, get_backend
+from plane import Plane
+from linsys import LinearSystem
+
+SCHEMA_VERSION = 1
+
+
+def _rate(func, ops, repeat, min_time=0.05):
+    # 自动确定循环次数，使每次计时不少于 min_time 秒，取最快一次
+    number = 1
+    while True:
+        t = timeit.timeit(func, number=number)
+        if t >= min_time:
+            break
+        number *= 2
+    best = min(timeit.repeat(func, repeat=repeat, number=number))
+    return ops * number / best
+
+
+def bench_vector(seed, backend, repeat):
+    X, Y = generatePoints(seed, num=200)
+    planar = [Vector([x, y], backend) for x, y in zip(X, Y)]
+    spatial = [Vector(row, backend) for row in generateMatrix(3, seed).tolist()] * 64
+    pairs = list(zip(planar, planar[1:]))
+    triples = list(zip(spatial, spatial[1:]))
+
+    cases = {
+        'plus': (lambda: [v.plus(w) for v, w in pairs], len(pairs)),
+        'times_scalar': (lambda: [v.times_scalar(3) for v in planar], len(planar)),
+        'xiangliang_chengfa': (lambda: [v.xiangliang_chengfa(w) for v, w in pairs], len(pairs)),
+        'xiangliang_val': (lambda: [v.xiangliang_val() for v in planar], len(planar)),
+        'unit_xiangliang': (lambda: [v.unit_xiangliang() for v in planar], len(planar)),
+        'xiangliang_hudu': (lambda: [v.xiangliang_hudu(w) for v, w in pairs], len(pairs)),
+        'xiangliangji': (lambda: [v.xiangliangji(w) for v, w in triples], len(triples)),
+    }
+    return [{'group': 'vector', 'name': name, 'unit': 'ops/s', 'value': _rate(func, ops, repeat)}
+            for name, (func, ops) in sorted(cases.items())]
+
+
+def bench_plane(seed, backend, repeat):
+    planes = []
+    for k in range(32):
+        rows = generateMatrix(3, seed + k).tolist()
+        for i, row in enumerate(rows):
+            planes.append(Plane(normal_vector=Vector(row, backend), constant_term=i + 1))
+    # 加入一批平行与重合的平面
+    planes += [Plane(normal_vector=p.normal_vector.times_scalar(2), constant_term=p.constant_term * 2)
+               for p in planes[:32]]
+    pairs = list(zip(planes, planes[1:] + planes[:1]))
+
+    cases = {
+        'pingxing': (lambda: [p.pingxing(q) for p, q in pairs], len(pairs)),
+        '__eq__': (lambda: [p == q for p, q in pairs], len(pairs)),
+    }
+    return [{'group': 'plane', 'name': name, 'unit': 'ops/s', 'value': _rate(func, ops, repeat)}
+            for name, (func, ops) in sorted(cases.items())]
+
+
+def bench_linsys(seed, backend, repeat, sizes):
+    results = []
+    for n in sizes:
+        A = generateMatrix(n, seed).tolist()
+        b = list(range(n))
+        system = LinearSystem.from_matrix(A, b, backend)
+
+        best = min(timeit.repeat(system.compute_solution, repeat=repeat, number=1))
+
+        tracemalloc.start()
+        system.compute_solution()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results.append({'group': 'linsys', 'name': 'compute_solution', 'n': n,
+                        'unit': 's', 'value': best, 'peak_memory_bytes': peak})
+    return results
+
+
+def run(seed, backend, repeat, sizes):
+    results = []
+    results += bench_vector(seed, backend, repeat)
+    results += bench_plane(seed, backend, repeat)
+    results += bench_linsys(seed, backend, repeat, sizes)
+    return {
+        'schema': SCHEMA_VERSION,
+        'meta': {
+            'seed': seed,
+            'backend': get_backend(backend).name,
+            'repeat': repeat,
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def _key(r):
+    return (r['group'], r['name'], r.get('n'))
+
+
+# 与基线比较：ops/s 下降或耗时上升超过 threshold 视为回退
+def compare(current, baseline, threshold):
+    base = dict((_key(r), r) for r in baseline['results'])
+    regressions = []
+    for r in current['results']:
+        b = base.get(_key(r))
+        if b is None or not b['value']:
+            continue
+        if r['unit'] == 'ops/s':
+            change = b['value'] / r['value'] - 1 if r['value'] else float('inf')
+        else:
+            change = r['value'] / b['value'] - 1
+        if change > threshold:
+            regressions.append({'benchmark': list(_key(r)), 'baseline': b['value'],
+                                'current': r['value'], 'slowdown': change})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Vector / Plane / LinearSystem benchmark suite')
+    parser.add_argument('--seed', type=int, default=666)
+    parser.add_argument('--backend', default='float', choices=['float', 'decimal', 'fraction'])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--sizes', default='4,8,16,32,64',
+                        help='comma separated LinearSystem sizes')
+    parser.add_argument('--output', help='write JSON results to this file instead of stdout')
+    parser.add_argument('--compare', help='baseline JSON file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative slowdown reported as a regression')
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    report = run(args.seed, args.backend, args.repeat, sizes)
+
+    if args.compare:
+        with open(args.compare) as f:
+            report['regressions'] = compare(report, json.load(f), args.threshold)
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    return 1 if report.get('regressions') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
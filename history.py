@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+import mmap
+import os
+import struct
+import time
+import zlib
+
+# 环形缓冲区文件：32字节文件头 + capacity 条定长记录，通过mmap读写
+#   文件头 magic(4s) version(H) pad(2x) capacity(I) record_size(I) total(Q) reserved(8x)
+#   记录   timestamp(d) latency(f) check_id(I) status(B) pad(3x)
+# total 为累计写入条数，第 total % capacity 个位置是下一次写入的位置，写满后覆盖最旧的记录
+MAGIC = b'HIST'
+VERSION = 1
+HEADER = struct.Struct('<4sH2xIIQ8x')
+HEADER_SIZE = HEADER.size
+RECORD = struct.Struct('<dfIB3x')
+RECORD_SIZE = RECORD.size
+TOTAL_OFFSET = 16
+
+STATUS_OK = 1
+STATUS_FAIL = 0
+
+BAD_MAGIC_MSG = 'Not a history file'
+BAD_VERSION_MSG = 'Unsupported history file version'
+TRUNCATED_FILE_MSG = 'History file is shorter than its header declares'
+
+
+# 检查名称 -> 记录中的 check_id，与配置顺序无关
+def check_id(name):
+    if isinstance(name, int):
+        return name
+    return zlib.crc32(name.encode('utf-8'))
+
+
+# 按 p (0-100) 取百分位数，线性插值
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    k = (len(values) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+class HistoryStore(object):
+
+    def __init__(self, path, capacity=100000):
+        self.path = path
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, VERSION, capacity, RECORD_SIZE, 0))
+                f.truncate(HEADER_SIZE + capacity * RECORD_SIZE)
+
+        self.file = open(path, 'r+b')
+        self.mmap = mmap.mmap(self.file.fileno(), 0)
+        if len(self.mmap) < HEADER_SIZE:
+            self.close()
+            raise ValueError(BAD_MAGIC_MSG)
+        magic, version, capacity, record_size, total = HEADER.unpack_from(self.mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(BAD_MAGIC_MSG)
+        if version != VERSION or record_size != RECORD_SIZE:
+            self.close()
+            raise ValueError(BAD_VERSION_MSG)
+        # 文件被截断时追加会越界，读取会静默少返回记录
+        if len(self.mmap) < HEADER_SIZE + capacity * RECORD_SIZE:
+            self.close()
+            raise ValueError(TRUNCATED_FILE_MSG)
+        # 已存在的文件以文件头中的容量为准
+        self.capacity = capacity
+        self.total = total
+        # check_id -> 最近一次状态，append 时更新
+        self._last = {}
+
+    def close(self):
+        if not self.mmap.closed:
+            self.mmap.flush()
+            self.mmap.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def flush(self):
+        self.mmap.flush()
+
+    # O(1) 追加：写入一条记录并更新文件头中的计数
+    def append(self, check, ok, latency, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        cid = check_id(check)
+        status = STATUS_OK if ok else STATUS_FAIL
+        slot = self.total % self.capacity
+        RECORD.pack_into(self.mmap, HEADER_SIZE + slot * RECORD_SIZE, timestamp, latency, cid, status)
+        self.total += 1
+        struct.pack_into('<Q', self.mmap, TOTAL_OFFSET, self.total)
+        self._last[cid] = status
+
+    def append_result(self, result):
+        self.append(result.name, result.ok, result.latency, result.timestamp)
+
+    # 第i条仍保留的记录（0为最旧）的文件偏移
+    def _position(self, i):
+        start = self.total - len(self)
+        return HEADER_SIZE + ((start + i) % self.capacity) * RECORD_SIZE
+
+    def _timestamp(self, i):
+        return struct.unpack_from('<d', self.mmap, self._position(i))[0]
+
+    # 记录按写入时间有序，二分查找第一条 timestamp >= t 的记录
+    def _lower_bound(self, t):
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._timestamp(mid) < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    # 按时间顺序返回窗口内的记录 (timestamp, check_id, ok, latency)
+    # 环形缓冲区最多分成两段连续内存，每段用 iter_unpack 批量解析
+    def records(self, since=None, until=None, check=None):
+        n = len(self)
+        first = self._lower_bound(since) if since is not None else 0
+        last = self._lower_bound(until) if until is not None else n
+        cid = check_id(check) if check is not None else None
+
+        begin = (self.total - n + first) % self.capacity
+        count = last - first
+        segments = [(begin, min(count, self.capacity - begin))]
+        if begin + count > self.capacity:
+            segments.append((0, begin + count - self.capacity))
+
+        for slot, length in segments:
+            if length <= 0:
+                continue
+            offset = HEADER_SIZE + slot * RECORD_SIZE
+            for timestamp, latency, rid, status in RECORD.iter_unpack(
+                    self.mmap[offset:offset + length * RECORD_SIZE]):
+                if cid is None or rid == cid:
+                    yield timestamp, rid, status == STATUS_OK, latency
+
+    # 最近一次状态，没有记录时为 None
+    def last_status(self, check):
+        cid = check_id(check)
+        if cid not in self._last:
+            for i in range(len(self) - 1, -1, -1):
+                _, _, rid, status = RECORD.unpack_from(self.mmap, self._position(i))
+                if rid == cid:
+                    self._last[cid] = status
+                    break
+            else:
+                return None
+        return self._last[cid] == STATUS_OK
+
+    # 窗口内的可用率、延迟百分位和状态翻转次数
+    # window 为最近多少秒；flapping 表示翻转次数占样本比例超过 flap_threshold
+    def summary(self, check, window=3600.0, now=None, percentiles=(50, 99), flap_threshold=0.3):
+        if now is None:
+            now = time.time()
+        samples = 0
+        ok_count = 0
+        transitions = 0
+        previous = None
+        latencies = []
+        for _, _, ok, latency in self.records(since=now - window, check=check):
+            samples += 1
+            if ok:
+                ok_count += 1
+                latencies.append(latency)
+            if previous is not None and ok != previous:
+                transitions += 1
+            previous = ok
+
+        result = {
+            'samples': samples,
+            'availability': ok_count / float(samples) if samples else None,
+            'transitions': transitions,
+            'flapping': samples > 1 and transitions / float(samples - 1) >= flap_threshold,
+        }
+        for p in percentiles:
+            result['p{}'.format(p)] = percentile(latencies, p)
+        return result
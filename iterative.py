@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+import math
+
+from vector import Vector, FLOAT
+
+
+SYSTEM_MUST_BE_SQUARE_MSG = 'Iterative solvers require a square system'
+ZERO_DIAGONAL_MSG = 'Zero on the diagonal'
+
+
+# 把方程组转换成按行压缩的float形式：每行 (列下标列表, 系数列表)，零系数不保存
+# 支持 LinearSystem、SparseLinearSystem 以及任何提供 coefficient_row / constant_term 的对象
+def _as_operator(system):
+    n = len(system)
+    if n != system.dimension:
+        raise Exception(SYSTEM_MUST_BE_SQUARE_MSG)
+
+    rows = []
+    if hasattr(system, 'rows') and hasattr(system, 'constants'):
+        for r in system.rows:
+            cols = sorted(r)
+            rows.append((cols, [float(r[c]) for c in cols]))
+        b = [float(k) for k in system.constants]
+    else:
+        for i in range(n):
+            coefficients = system.coefficient_row(i)
+            cols = [j for j, x in enumerate(coefficients) if x != 0]
+            rows.append((cols, [float(coefficients[j]) for j in cols]))
+        b = [float(system.constant_term(i)) for i in range(n)]
+    return rows, b
+
+
+def _matvec(rows, x):
+    return [sum(v * x[c] for c, v in zip(cols, vals)) for cols, vals in rows]
+
+
+def _dot(u, v):
+    return sum(a * b for a, b in zip(u, v))
+
+
+def _norm(u):
+    return math.sqrt(_dot(u, u))
+
+
+def _diagonal(rows):
+    diag = []
+    for i, (cols, vals) in enumerate(rows):
+        d = 0.0
+        for c, v in zip(cols, vals):
+            if c == i:
+                d = v
+                break
+        if d == 0:
+            raise Exception(ZERO_DIAGONAL_MSG)
+        diag.append(d)
+    return diag
+
+
+def _initial_guess(x0, n):
+    if x0 is None:
+        return [0.0] * n
+    if isinstance(x0, Vector):
+        x0 = x0.coordinates
+    if len(x0) != n:
+        raise ValueError('Initial guess has the wrong dimension')
+    return [float(x) for x in x0]
+
+
+# Jacobi预条件：M = diag(A)
+class JacobiPreconditioner(object):
+    def __init__(self, rows):
+        self.inverse_diagonal = [1.0 / d for d in _diagonal(rows)]
+
+    def apply(self, r):
+        return [a * b for a, b in zip(self.inverse_diagonal, r)]
+
+
+# ILU(0)预条件：只在A原有的非零位置上做不完全LU分解，不产生填充
+class ILU0Preconditioner(object):
+    def __init__(self, rows):
+        n = len(rows)
+        lu = [dict(zip(cols, vals)) for cols, vals in rows]
+        for i in range(n):
+            row = lu[i]
+            for k in sorted(c for c in row if c < i):
+                pivot = lu[k].get(k)
+                if not pivot:
+                    raise Exception(ZERO_DIAGONAL_MSG)
+                factor = row[k] / pivot
+                row[k] = factor
+                for j, v in lu[k].items():
+                    if j > k and j in row:
+                        row[j] -= factor * v
+            if not row.get(i):
+                raise Exception(ZERO_DIAGONAL_MSG)
+
+        # 拆成严格下三角L（对角线为1）和上三角U，按列排序方便前代/回代
+        self.lower = [sorted((c, v) for c, v in row.items() if c < i) for i, row in enumerate(lu)]
+        self.upper = [sorted((c, v) for c, v in row.items() if c > i) for i, row in enumerate(lu)]
+        self.diagonal = [row[i] for i, row in enumerate(lu)]
+
+    def apply(self, r):
+        n = len(r)
+        y = [0.0] * n
+        for i in range(n):
+            y[i] = r[i] - sum(v * y[c] for c, v in self.lower[i])
+        z = [0.0] * n
+        for i in range(n - 1, -1, -1):
+            z[i] = (y[i] - sum(v * z[c] for c, v in self.upper[i])) / self.diagonal[i]
+        return z
+
+
+PRECONDITIONERS = {
+    'jacobi': JacobiPreconditioner,
+    'ilu0': ILU0Preconditioner,
+}
+
+
+def _make_preconditioner(preconditioner, rows):
+    if preconditioner is None:
+        return None
+    if hasattr(preconditioner, 'apply'):
+        return preconditioner
+    try:
+        return PRECONDITIONERS[preconditioner](rows)
+    except KeyError:
+        raise ValueError('Unknown preconditioner: {}'.format(preconditioner))
+
+
+# 迭代求解结果：解向量、迭代次数、每次迭代的残差范数、是否收敛
+class IterativeResult(object):
+    def __init__(self, solution, iterations, residual_norms, converged):
+        self.solution = solution
+        self.iterations = iterations
+        self.residual_norms = residual_norms
+        self.converged = converged
+
+    def __str__(self):
+        return 'IterativeResult: converged={} iterations={} residual={}'.format(
+            self.converged, self.iterations, self.residual_norms[-1] if self.residual_norms else None)
+
+
+# 记录残差并判断是否收敛；残差相对于 ||b|| 计算，b为0时使用绝对残差
+class _Monitor(object):
+    def __init__(self, b, tolerance, callback):
+        self.threshold = tolerance * (_norm(b) or 1.0)
+        self.callback = callback
+        self.residual_norms = []
+
+    def record(self, iteration, residual_norm):
+        self.residual_norms.append(residual_norm)
+        if self.callback is not None:
+            self.callback(iteration, residual_norm)
+        return residual_norm <= self.threshold
+
+    def result(self, x, iterations, converged):
+        return IterativeResult(Vector(x, FLOAT), iterations, self.residual_norms, converged)
+
+
+def _residual(rows, b, x):
+    return [bi - axi for bi, axi in zip(b, _matvec(rows, x))]
+
+
+# Jacobi迭代，适用于对角占优的方程组
+def jacobi(system, x0=None, tolerance=1e-10, max_iterations=1000, callback=None):
+    rows, b = _as_operator(system)
+    n = len(b)
+    diag = _diagonal(rows)
+    x = _initial_guess(x0, n)
+    monitor = _Monitor(b, tolerance, callback)
+
+    r = _residual(rows, b, x)
+    if monitor.record(0, _norm(r)):
+        return monitor.result(x, 0, True)
+
+    for it in range(1, max_iterations + 1):
+        x = [xi + ri / di for xi, ri, di in zip(x, r, diag)]
+        r = _residual(rows, b, x)
+        if monitor.record(it, _norm(r)):
+            return monitor.result(x, it, True)
+    return monitor.result(x, max_iterations, False)
+
+
+# Gauss-Seidel迭代，omega不为1时即SOR
+def gauss_seidel(system, x0=None, tolerance=1e-10, max_iterations=1000, callback=None, omega=1.0):
+    rows, b = _as_operator(system)
+    n = len(b)
+    diag = _diagonal(rows)
+    x = _initial_guess(x0, n)
+    monitor = _Monitor(b, tolerance, callback)
+
+    if monitor.record(0, _norm(_residual(rows, b, x))):
+        return monitor.result(x, 0, True)
+
+    for it in range(1, max_iterations + 1):
+        for i, (cols, vals) in enumerate(rows):
+            s = b[i] - sum(v * x[c] for c, v in zip(cols, vals))
+            x[i] += omega * s / diag[i]
+        if monitor.record(it, _norm(_residual(rows, b, x))):
+            return monitor.result(x, it, True)
+    return monitor.result(x, max_iterations, False)
+
+
+# 共轭梯度法，要求系数矩阵对称正定
+def conjugate_gradient(system, x0=None, tolerance=1e-10, max_iterations=1000, callback=None,
+                       preconditioner=None):
+    rows, b = _as_operator(system)
+    n = len(b)
+    M = _make_preconditioner(preconditioner, rows)
+    x = _initial_guess(x0, n)
+    monitor = _Monitor(b, tolerance, callback)
+
+    r = _residual(rows, b, x)
+    if monitor.record(0, _norm(r)):
+        return monitor.result(x, 0, True)
+
+    z = M.apply(r) if M else r
+    p = list(z)
+    rz = _dot(r, z)
+
+    for it in range(1, max_iterations + 1):
+        Ap = _matvec(rows, p)
+        pAp = _dot(p, Ap)
+        if pAp == 0:
+            break
+        alpha = rz / pAp
+        x = [xi + alpha * pi for xi, pi in zip(x, p)]
+        r = [ri - alpha * api for ri, api in zip(r, Ap)]
+        if monitor.record(it, _norm(r)):
+            return monitor.result(x, it, True)
+
+        z = M.apply(r) if M else r
+        rz_new = _dot(r, z)
+        beta = rz_new / rz
+        rz = rz_new
+        p = [zi + beta * pi for zi, pi in zip(z, p)]
+    return monitor.result(x, len(monitor.residual_norms) - 1, False)
+
+
+# 重启GMRES(m)，使用右预条件，残差即原方程组的残差
+def gmres(system, x0=None, tolerance=1e-10, max_iterations=1000, callback=None,
+          preconditioner=None, restart=30):
+    rows, b = _as_operator(system)
+    n = len(b)
+    M = _make_preconditioner(preconditioner, rows)
+    x = _initial_guess(x0, n)
+    monitor = _Monitor(b, tolerance, callback)
+
+    r = _residual(rows, b, x)
+    beta = _norm(r)
+    if monitor.record(0, beta):
+        return monitor.result(x, 0, True)
+
+    it = 0
+    while it < max_iterations:
+        # Arnoldi过程，修正Gram-Schmidt正交化，Givens旋转把Hessenberg矩阵化为上三角
+        V = [[ri / beta for ri in r]]
+        Z = []
+        H = []
+        cs = []
+        sn = []
+        g = [beta]
+        converged = False
+
+        for k in range(min(restart, max_iterations - it)):
+            it += 1
+            z = M.apply(V[k]) if M else V[k]
+            Z.append(z)
+            w = _matvec(rows, z)
+            h = []
+            for v in V:
+                hik = _dot(w, v)
+                w = [wi - hik * vi for wi, vi in zip(w, v)]
+                h.append(hik)
+            h_next = _norm(w)
+
+            for i in range(k):
+                h[i], h[i+1] = cs[i] * h[i] + sn[i] * h[i+1], -sn[i] * h[i] + cs[i] * h[i+1]
+            h.append(h_next)
+
+            denom = math.hypot(h[k], h[k+1])
+            c, s = (1.0, 0.0) if denom == 0 else (h[k] / denom, h[k+1] / denom)
+            cs.append(c)
+            sn.append(s)
+            h[k] = c * h[k] + s * h[k+1]
+            h[k+1] = 0.0
+            g.append(-s * g[k])
+            g[k] = c * g[k]
+            H.append(h)
+
+            if monitor.record(it, abs(g[k+1])):
+                converged = True
+                break
+            if h_next == 0:
+                break
+            V.append([wi / h_next for wi in w])
+
+        # 回代求 y，再更新 x = x + Z y
+        m = len(H)
+        y = [0.0] * m
+        for i in range(m - 1, -1, -1):
+            y[i] = (g[i] - sum(H[j][i] * y[j] for j in range(i + 1, m))) / H[i][i]
+        for j in range(m):
+            x = [xi + y[j] * zi for xi, zi in zip(x, Z[j])]
+
+        r = _residual(rows, b, x)
+        beta = _norm(r)
+        if converged or beta <= monitor.threshold:
+            return monitor.result(x, it, True)
+        if beta == 0:
+            break
+    return monitor.result(x, it, False)
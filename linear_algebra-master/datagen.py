@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+# 分块生成大规模测试数据：回归用的散点 (x, y) 和随机整数方阵
+# 数据按固定大小的块定义，第i块的随机数只由 (seed, i) 决定；输出分块（chunk_size）只是
+# 从这些块中切出对应区间，所以结果与分块大小、生成顺序、进程数都无关，可复现
+# 用法:
+#   python datagen.py points --total 1000000000 --chunk-size 1000000 --out points.npy --workers 8
+#   python datagen.py matrices --count 10000 --rank 30 --singular --out singular30.npy
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def chunk_rng(seed, index):
+    return np.random.default_rng(np.random.SeedSequence([seed, index]))
+
+
+# 直线参数只由seed决定，所有块共用，与 generatePoints 的取值范围相同
+def line_parameters(seed):
+    rng = np.random.default_rng(np.random.SeedSequence([seed]))
+    m = rng.random() * 10 - 5  # -5 ~ 5
+    b = rng.random() * 10 + 5  # 5 ~ 15
+    return m, b
+
+
+# 数据块的大小：每块散点数、每块矩阵数
+POINT_BLOCK = 8192
+MATRIX_BLOCK = 64
+
+
+# 从按块定义的数据中取出第 start 到 start+num 项写入 out，block(i) 返回第i块
+def _fill_from_blocks(out, block, block_size, start, num):
+    index, skip = divmod(start, block_size)
+    pos = 0
+    while pos < num:
+        data = block(index)[skip:skip + num - pos]
+        out[pos:pos + len(data)] = data
+        pos += len(data)
+        index += 1
+        skip = 0
+    return out
+
+
+# 第index块散点，shape (POINT_BLOCK, 2)，每行为 (x, y)
+def _point_block(seed, index, m, b):
+    rng = chunk_rng(seed, index)
+    points = np.empty((POINT_BLOCK, 2))
+    x = points[:, 0]
+    x[:] = rng.random(POINT_BLOCK) * 10 - 5
+    points[:, 1] = x * m + b + rng.normal(size=POINT_BLOCK)
+    return points
+
+
+# 第 start 到 start+num 个散点，返回 shape (num, 2) 的数组
+def point_range(seed, start, num):
+    m, b = line_parameters(seed)
+    return _fill_from_blocks(np.empty((num, 2)), lambda i: _point_block(seed, i, m, b),
+                             POINT_BLOCK, start, num)
+
+
+# 直接构造整数方阵，不做拒绝采样，元素范围与 generateMatrix 相同 ([-10, 10))
+# 可逆：先构造模2可逆的0/1矩阵 M = P L U（L、U为对角元为1的三角阵），再令 A = M + 2K。
+# det(A) 与 det(M) 模2同余，为奇数，因此A一定满秩；K为均匀随机整数，A的条件数与随机矩阵相当
+# 秩为 rank：在可逆矩阵中保留 rank 行，其余行替换为这些行之一的拷贝，再打乱行顺序
+def make_matrix(rng, n, rank=None, low=-10, high=10):
+    L = np.tril(rng.integers(0, 2, size=(n, n)), -1) + np.eye(n, dtype=np.int64)
+    U = np.triu(rng.integers(0, 2, size=(n, n)), 1) + np.eye(n, dtype=np.int64)
+    M = L.dot(U)[rng.permutation(n)] % 2
+    A = M + 2 * rng.integers(low // 2, high // 2, size=(n, n))
+
+    if rank is not None and rank < n:
+        A[rank:] = A[rng.integers(0, rank, size=n - rank)]
+        A = A[rng.permutation(n)]
+    return A
+
+
+# 第index块矩阵，shape (MATRIX_BLOCK, n, n) 的int64数组
+# singular 为真时每个矩阵的秩在 [1, n-1] 中随机选取
+def _matrix_block(seed, index, n, singular):
+    rng = chunk_rng(seed, index)
+    out = np.empty((MATRIX_BLOCK, n, n), dtype=np.int64)
+    for k in range(MATRIX_BLOCK):
+        rank = rng.integers(1, n) if singular and n > 1 else None
+        out[k] = make_matrix(rng, n, rank)
+    return out
+
+
+# 第 start 到 start+num 个矩阵，返回 shape (num, n, n) 的int64数组
+def matrix_range(seed, start, num, n, singular=False):
+    return _fill_from_blocks(np.empty((num, n, n), dtype=np.int64),
+                             lambda i: _matrix_block(seed, i, n, singular), MATRIX_BLOCK, start, num)
+
+
+def _chunks(total, chunk_size):
+    for start in range(0, total, chunk_size):
+        yield start, min(chunk_size, total - start)
+
+
+# 逐块产出数据，内存中只有一块
+def iter_points(seed, total, chunk_size=1000000):
+    for start, num in _chunks(total, chunk_size):
+        yield point_range(seed, start, num)
+
+
+def iter_matrices(seed, count, n, chunk_size=1000, singular=False):
+    for start, num in _chunks(count, chunk_size):
+        yield matrix_range(seed, start, num, n, singular)
+
+
+# 子进程：生成一块并写入预先分配好的 .npy 文件的对应位置
+def _write_chunk(path, kind, seed, start, num, n, singular):
+    if kind == 'points':
+        data = point_range(seed, start, num)
+    else:
+        data = matrix_range(seed, start, num, n, singular)
+    out = np.load(path, mmap_mode='r+')
+    out[start:start + num] = data
+    out.flush()
+    del out
+    return num
+
+
+# 把数据直接写入 .npy 文件（np.load(path, mmap_mode='r') 可按需读取）
+# workers > 1 时各块在进程池中生成，输出与 workers=1、与 chunk_size 取值都完全相同
+def write_dataset(path, kind, seed, total, chunk_size, n=None, singular=False, workers=1):
+    if kind == 'points':
+        shape, dtype = (total, 2), np.float64
+    elif kind == 'matrices':
+        shape, dtype = (total, n, n), np.int64
+    else:
+        raise ValueError('Unknown dataset kind: {}'.format(kind))
+
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+    del out
+
+    jobs = [(path, kind, seed, start, num, n, singular) for start, num in _chunks(total, chunk_size)]
+    if workers <= 1:
+        return sum(_write_chunk(*job) for job in jobs)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(_write_chunk, *zip(*jobs)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Chunked, reproducible synthetic dataset generator')
+    parser.add_argument('kind', choices=['points', 'matrices'])
+    parser.add_argument('--out', required=True, help='output .npy file')
+    parser.add_argument('--seed', type=int, default=666)
+    parser.add_argument('--total', type=int, default=100, help='number of points')
+    parser.add_argument('--count', type=int, default=100, help='number of matrices')
+    parser.add_argument('--rank', type=int, default=4, help='matrix size')
+    parser.add_argument('--singular', action='store_true')
+    parser.add_argument('--chunk-size', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    if args.kind == 'points':
+        total, chunk_size = args.total, args.chunk_size or 1000000
+    else:
+        total, chunk_size = args.count, args.chunk_size or 1000
+    write_dataset(args.out, args.kind, args.seed, total, chunk_size,
+                  n=args.rank, singular=args.singular, workers=args.workers)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# 项目中矩阵函数（shape / transpose / matxMultiply / augmentMatrix）的可导入版本
+# 矩阵统一使用二维列表表示
+from operator import mul
+
+# 分块大小：一次处理 TILE 行 A 与 TILE 列 B，使这部分 B 的列在内存中保持热
+TILE = 64
+# 整数方阵边长不小于该值时使用 Strassen 算法
+STRASSEN_THRESHOLD = 512
+# Strassen 递归到该边长以下改用分块乘法
+STRASSEN_LEAF = 128
+
+
+# 返回矩阵的行数和列数
+def shape(M):
+    return len(M), len(M[0])
+
+
+# 计算矩阵的转置，zip 在C层完成逐元素搬运
+def transpose(M):
+    return [list(col) for col in zip(*M)]
+
+
+# 构造增广矩阵，假设A，b行数相同，不修改A
+def augmentMatrix(A, b):
+    return [row + [bi[0]] for row, bi in zip(A, b)]
+
+
+# 计算矩阵乘法 AB，如果无法相乘则raise ValueError
+def matxMultiply(A, B):
+    if len(A[0]) != len(B):
+        raise ValueError("Matrix A's column number doesn't equal to Matrix B's row number")
+
+    n = len(A)
+    # Strassen 只用于整数，整数运算没有舍入，结果与逐项累加完全一致
+    if (n >= STRASSEN_THRESHOLD and n == len(A[0]) == len(B[0])
+            and _all_int(A) and _all_int(B)):
+        return _strassen(A, B)
+
+    return _tiled_multiply(A, B)
+
+
+def _all_int(M):
+    return all(type(x) is int for row in M for x in row)
+
+
+# B 只转置一次，之后按行连续访问；每个元素仍按 k 从小到大依次累加，
+# 与朴素三重循环的浮点结果逐位相同
+def _tiled_multiply(A, B, tile=TILE):
+    Bt = transpose(B)
+    res = [None] * len(A)
+    for i0 in range(0, len(A), tile):
+        a_block = A[i0:i0+tile]
+        rows = [[] for _ in a_block]
+        for j0 in range(0, len(Bt), tile):
+            b_block = Bt[j0:j0+tile]
+            for row, out in zip(a_block, rows):
+                out.extend([sum(map(mul, row, col)) for col in b_block])
+        res[i0:i0+len(a_block)] = rows
+    return res
+
+
+def _add(A, B):
+    return [list(map(int.__add__, a, b)) for a, b in zip(A, B)]
+
+
+def _sub(A, B):
+    return [list(map(int.__sub__, a, b)) for a, b in zip(A, B)]
+
+
+# 整数方阵的 Strassen 乘法，奇数边长时补一行一列0
+def _strassen(A, B):
+    n = len(A)
+    if n <= STRASSEN_LEAF:
+        return _tiled_multiply(A, B)
+
+    if n % 2:
+        A = [row + [0] for row in A] + [[0] * (n + 1)]
+        B = [row + [0] for row in B] + [[0] * (n + 1)]
+        C = _strassen(A, B)
+        return [row[:n] for row in C[:n]]
+
+    h = n // 2
+    A11 = [row[:h] for row in A[:h]]
+    A12 = [row[h:] for row in A[:h]]
+    A21 = [row[:h] for row in A[h:]]
+    A22 = [row[h:] for row in A[h:]]
+    B11 = [row[:h] for row in B[:h]]
+    B12 = [row[h:] for row in B[:h]]
+    B21 = [row[:h] for row in B[h:]]
+    B22 = [row[h:] for row in B[h:]]
+
+    M1 = _strassen(_add(A11, A22), _add(B11, B22))
+    M2 = _strassen(_add(A21, A22), B11)
+    M3 = _strassen(A11, _sub(B12, B22))
+    M4 = _strassen(A22, _sub(B21, B11))
+    M5 = _strassen(_add(A11, A12), B22)
+    M6 = _strassen(_sub(A21, A11), _add(B11, B12))
+    M7 = _strassen(_sub(A12, A22), _add(B21, B22))
+
+    C11 = _add(_sub(_add(M1, M4), M5), M7)
+    C12 = _add(M3, M5)
+    C21 = _add(M2, M4)
+    C22 = _add(_add(_sub(M1, M2), M3), M6)
+
+    return [r1 + r2 for r1, r2 in zip(C11, C12)] + [r1 + r2 for r1, r2 in zip(C21, C22)]
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# 流式一元线性回归 y = mx + b
+# 只保存充分统计量（点数、均值、离差平方和、协方差和），内存 O(1)，可以合并多个分片的结果
+
+
+class StreamingLinearRegression(object):
+
+    NOT_ENOUGH_POINTS_MSG = 'At least two points with distinct x are required'
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        # sum((x-mean_x)^2), sum((y-mean_y)^2), sum((x-mean_x)(y-mean_y))
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+
+    # Welford更新：先用旧均值算偏差，再用新均值算偏差，避免大数相减的精度损失
+    def update(self, x, y):
+        self.n += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.n
+        dy = y - self.mean_y
+        self.mean_y += dy / self.n
+        self.m2_x += dx * (x - self.mean_x)
+        self.m2_y += dy * (y - self.mean_y)
+        self.c_xy += dx * (y - self.mean_y)
+
+    # 接受任意 (x, y) 可迭代对象或生成器
+    def partial_fit(self, points):
+        for x, y in points:
+            self.update(x, y)
+        return self
+
+    # 合并另一个分片的统计量（Chan等人的并行公式），结果与顺序处理全部点相同
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean_x, self.mean_y = other.n, other.mean_x, other.mean_y
+            self.m2_x, self.m2_y, self.c_xy = other.m2_x, other.m2_y, other.c_xy
+            return self
+
+        n = self.n + other.n
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        w = float(self.n) * other.n / n
+
+        self.m2_x += other.m2_x + dx * dx * w
+        self.m2_y += other.m2_y + dy * dy * w
+        self.c_xy += other.c_xy + dx * dy * w
+        self.mean_x += dx * other.n / n
+        self.mean_y += dy * other.n / n
+        self.n = n
+        return self
+
+    # 统计量元组，便于跨进程传递或落盘
+    def state(self):
+        return (self.n, self.mean_x, self.mean_y, self.m2_x, self.m2_y, self.c_xy)
+
+    @classmethod
+    def from_state(cls, state):
+        model = cls()
+        model.n, model.mean_x, model.mean_y, model.m2_x, model.m2_y, model.c_xy = state
+        return model
+
+    # 返回 m, b
+    def coefficients(self):
+        if self.n < 2 or self.m2_x == 0:
+            raise ValueError(self.NOT_ENOUGH_POINTS_MSG)
+        m = self.c_xy / self.m2_x
+        b = self.mean_y - m * self.mean_x
+        return m, b
+
+    # 拟合直线的均方误差，由统计量直接得到，不需要再遍历数据
+    def mse(self):
+        if self.n < 2 or self.m2_x == 0:
+            raise ValueError(self.NOT_ENOUGH_POINTS_MSG)
+        ss_res = self.m2_y - self.c_xy * self.c_xy / self.m2_x
+        return max(ss_res, 0.0) / self.n
+
+
+# 与项目中 linearRegression(X,Y) 相同的返回值，但不构造矩阵
+def linearRegression(X, Y):
+    return StreamingLinearRegression().partial_fit(zip(X, Y)).coefficients()
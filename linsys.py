@@ -1,11 +1,19 @@
 # -*- coding: utf-8 -*-
-from decimal import Decimal, getcontext
-from copy import deepcopy
-
-from vector import Vector
-from plane import Plane
-
-getcontext().prec = 30
+import random
+from array import array
+from bisect import bisect_left
+from itertools import repeat
+from operator import add, mul
+
+from vector import Vector, VectorArray, get_backend, in_backend_context, is_near_zero
+from plane import Plane, canonical_keys, group_rows
+from lu import LUDecomposition
+from bareiss import BareissElimination
+from qr import QRLeastSquares
+from refinement import refine_solve
+from profiling import EliminationProfiler
+from basis import OrthonormalBasis
+from structured import StructureReport, detect_structure, solve_structured
 
 
 class LinearSystem(object):
@@ -14,95 +22,226 @@ class LinearSystem(object):
     NO_SOLUTIONS_MSG = 'No solutions'
     INF_SOLUTIONS_MSG = 'Infinitely many solutions'
 
+    # 性能记录器，默认关闭；见 enable_profiling
+    profiler = None
+    # 最近一次 compute_solution 的结构检测结果（StructureReport）
+    last_structure = None
+
     def __init__(self, planes):
         try:
             d = planes[0].dimension
             for p in planes:
                 assert p.dimension == d
 
-            self.planes = planes
             self.dimension = d
+            # 所有方程使用第一个方程的数值后端
+            self.backend = planes[0].backend
 
         except AssertionError:
             raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
 
+        # 增广矩阵按行连续存放在一个列表里，每行d个系数加1个常数项，行变换直接原地修改
+        convert = self.backend.convert
+        matrix = []
+        for p in planes:
+            if p.backend is self.backend:
+                matrix.extend(p.normal_vector.coordinates)
+                matrix.append(p.constant_term)
+            else:
+                matrix.extend([convert(x) for x in p.normal_vector.coordinates])
+                matrix.append(convert(p.constant_term))
+        self.matrix = matrix
+        self.num_equations = len(planes)
+        self._rref = None
+
+    # 由系数矩阵（二维列表）和常数项列表直接构造，不经过Plane对象
+    @classmethod
+    def from_matrix(cls, coefficients, constants, backend=None):
+        backend = get_backend(backend)
+        convert = backend.convert
+        if not coefficients or len(coefficients) != len(constants):
+            raise ValueError('coefficients and constants must be nonempty and of the same length')
+
+        d = len(coefficients[0])
+        matrix = []
+        for row, k in zip(coefficients, constants):
+            if len(row) != d:
+                raise Exception(cls.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
+            matrix.extend([convert(x) for x in row])
+            matrix.append(convert(k))
+
+        return cls._from_flat(matrix, len(coefficients), d, backend)
+
+    @classmethod
+    def _from_flat(cls, matrix, num_equations, dimension, backend):
+        system = cls.__new__(cls)
+        system.matrix = matrix
+        system.num_equations = num_equations
+        system.dimension = dimension
+        system.backend = backend
+        system._rref = None
+        return system
 
-    def swap_rows(self, row1, row2):
-        pass # add your code here
-        # tmp = self.planes[row1]
-        # self.planes[row1] = self.planes[row2]
-        # self.planes[row2] = tmp
-        # return self.planes
+    # 复制整个方程组，只需要复制一个列表
+    def copy(self):
+        profiler = self.profiler
+        if profiler is None:
+            return self._from_flat(self.matrix[:], self.num_equations, self.dimension, self.backend)
+
+        start = profiler.clock()
+        system = self._from_flat(self.matrix[:], self.num_equations, self.dimension, self.backend)
+        system.profiler = profiler
+        profiler.count('system_copies')
+        profiler.count('allocated_values', len(self.matrix))
+        profiler.record('copy', start)
+        return system
+
+    # 开启性能记录：统计每种行变换、主元查找的次数和耗时，算术运算次数和分配次数
+    # 消元时生成的副本共用同一个记录器
+    def enable_profiling(self, trace=False, profiler=None):
+        if profiler is None:
+            profiler = EliminationProfiler(trace=trace)
+        self.profiler = profiler
+        return profiler
+
+    def disable_profiling(self):
+        profiler = self.profiler
+        self.profiler = None
+        return profiler
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    # 第row行在matrix中的起始位置
+    def _offset(self, row):
+        if row < 0:
+            row += self.num_equations
+        if not 0 <= row < self.num_equations:
+            raise IndexError('list index out of range')
+        return row * (self.dimension + 1)
+
+    # 第row行的系数（列表副本）
+    def coefficient_row(self, row):
+        o = self._offset(row)
+        return self.matrix[o:o+self.dimension]
 
-        self[row1],self[row2]= self[row2],self[row1]
+    def constant_term(self, row):
+        return self.matrix[self._offset(row) + self.dimension]
+
+    # 第row行第col个变量的系数
+    def coefficient(self, row, col):
+        return self.matrix[self._offset(row) + col]
+
+    # 按需构造Plane对象
+    @property
+    def planes(self):
+        return [self[i] for i in range(self.num_equations)]
+
+
+    def swap_rows(self, row1, row2):
+        o1 = self._offset(row1)
+        o2 = self._offset(row2)
+        if o1 == o2:
+            return
+        profiler = self.profiler
+        if profiler is not None:
+            start = profiler.clock()
+        w = self.dimension + 1
+        m = self.matrix
+        m[o1:o1+w], m[o2:o2+w] = m[o2:o2+w], m[o1:o1+w]
+        self._rref = None
+        if profiler is not None:
+            profiler.count('allocated_values', 2*w)
+            profiler.record('swap_rows', start, (row1, row2))
 
 
     def multiply_coefficient_and_row(self, coefficient, row):
-        pass # add your code here
-        n = self.planes[row].normal_vector
-        k = self.planes[row].constant_term
-        new_normal_vector = n.times_scalar(coefficient)
-        new_constant_term = k * coefficient
-        self[row] = Plane(normal_vector=new_normal_vector,constant_term=new_constant_term)
-
-
-    def add_multiple_times_row_to_row(self, coefficient, row_to_add, row_to_be_added_to):
-        pass # add your code here
-        n1 = self.planes[row_to_add].normal_vector
-        k1 = self.planes[row_to_add].constant_term
-        n2 = self.planes[row_to_be_added_to].normal_vector
-        k2 = self.planes[row_to_be_added_to].constant_term
-
-        new_normal_vector = n1.times_scalar(coefficient).plus(n2)
-        new_constant_term = (k1 * coefficient) + k2
-        self[row_to_be_added_to] = Plane(normal_vector=new_normal_vector,constant_term=new_constant_term)
-
-        # normal_vector = self.planes[row_to_add].normal_vector.times_scalar(coefficient)
-        # constant_term = self.planes[row_to_add].constant_term * coefficient
-        # new_plane = Plane(normal_vector,constant_term)
-        # self.planes[row_to_be_added_to].normal_vector = new_plane.normal_vector.plus(self.planes[row_to_be_added_to].normal_vector)
-        # self.planes[row_to_be_added_to].constant_term += new_plane.constant_term
-        # # 重新设置选点
-        # self.planes[row_to_be_added_to].set_basepoint()
-        #
-        # return self.planes[row_to_be_added_to]
+        profiler = self.profiler
+        if profiler is not None:
+            start = profiler.clock()
+        o = self._offset(row)
+        w = self.dimension + 1
+        c = self.backend.convert(coefficient)
+        m = self.matrix
+        m[o:o+w] = [c*x for x in m[o:o+w]]
+        self._rref = None
+        if profiler is not None:
+            profiler.count(self.backend.name + '_mul', w)
+            profiler.count('allocated_values', w)
+            profiler.record('multiply_coefficient_and_row', start, (row,))
+
+
+    # start_col之前的系数已知为0时可以跳过，只更新后面的部分
+    def add_multiple_times_row_to_row(self, coefficient, row_to_add, row_to_be_added_to, start_col=0):
+        profiler = self.profiler
+        if profiler is not None:
+            start = profiler.clock()
+        o1 = self._offset(row_to_add) + start_col
+        o2 = self._offset(row_to_be_added_to) + start_col
+        w = self.dimension + 1 - start_col
+        c = self.backend.convert(coefficient)
+        m = self.matrix
+        m[o2:o2+w] = [y + c*x for x, y in zip(m[o1:o1+w], m[o2:o2+w])]
+        self._rref = None
+        if profiler is not None:
+            profiler.count(self.backend.name + '_mul', w)
+            profiler.count(self.backend.name + '_add', w)
+            profiler.count('allocated_values', 3*w)
+            profiler.record('add_multiple_times_row_to_row', start, (row_to_add, row_to_be_added_to))
 
 
     # 计算主编量索引，每行首项变量索引l列表
     def indices_of_first_nonzero_terms_in_each_row(self):
-        num_equations = len(self)
         num_variables = self.dimension
+        w = num_variables + 1
+        m = self.matrix
 
-        indices = [-1] * num_equations
+        indices = [-1] * self.num_equations
 
-        for i,p in enumerate(self.planes):
-            try:
-                indices[i] = p.first_nonzero_index(p.normal_vector)
-            except Exception as e:
-                if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
-                    continue
-                else:
-                    raise e
+        for i in range(self.num_equations):
+            o = i * w
+            for j in range(num_variables):
+                if not is_near_zero(m[o+j]):
+                    indices[i] = j
+                    break
 
         return indices
 
 
     def __len__(self):
-        return len(self.planes)
+        return self.num_equations
 
 
     def __getitem__(self, i):
-        return self.planes[i]
+        profiler = self.profiler
+        if profiler is not None:
+            start = profiler.clock()
+        o = self._offset(i)
+        d = self.dimension
+        normal_vector = Vector.__new__(Vector)
+        normal_vector.backend = self.backend
+        normal_vector.coordinates = tuple(self.matrix[o:o+d])
+        normal_vector.dimension = d
+        plane = Plane(normal_vector=normal_vector, constant_term=self.matrix[o+d])
+        if profiler is not None:
+            profiler.count('planes_built')
+            profiler.record('build_plane', start, (i,))
+        return plane
 
 
     def __setitem__(self, i, x):
         try:
             assert x.dimension == self.dimension
-            self.planes[i] = x
-
         except AssertionError:
             raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
 
+        o = self._offset(i)
+        convert = self.backend.convert
+        row = [convert(c) for c in x.normal_vector.coordinates]
+        row.append(convert(x.constant_term))
+        self.matrix[o:o+self.dimension+1] = row
+        self._rref = None
+
 
     def __str__(self):
         ret = 'Linear System:\n'
@@ -111,20 +250,25 @@ class LinearSystem(object):
         return ret
 
     # 构造三角形状
+    @in_backend_context
     def compute_triangular_form(self):
-        system = deepcopy(self)
+        profiler = self.profiler
+        if profiler is not None:
+            start = profiler.clock()
+        system = self.copy()
 
         # 方程数量
         num_equations = len(system)
         # 维度（变量数量）
         num_variables = system.dimension
+        w = num_variables + 1
 
         j = 0
         for i in range(num_equations):
             while j < num_variables:
                 # 第i个方程的第j个变量
-                c = MyDecimal(system[i].normal_vector[j])
-                if c.is_near_zero():
+                c = system.matrix[i*w + j]
+                if is_near_zero(c):
                     swap_succeeded = system.swap_with_row_below_for_nonzero_coefficient_if_able(i,j)
                     if not swap_succeeded:
                         j += 1
@@ -134,33 +278,54 @@ class LinearSystem(object):
                 j += 1
                 break
 
+        if profiler is not None:
+            profiler.record('compute_triangular_form', start)
         return system
 
     # 与其它非零行进行行行交换
     def swap_with_row_below_for_nonzero_coefficient_if_able(self,row,col):
+        profiler = self.profiler
+        if profiler is not None:
+            start = profiler.clock()
         num_equations = len(self)
+        w = self.dimension + 1
 
+        found = -1
         for k in range(row+1,num_equations):
-            coefficient = MyDecimal(self[k].normal_vector[col])
-            if not coefficient.is_near_zero():
-                self.swap_rows(row ,k)
-                return True
+            coefficient = self.matrix[k*w + col]
+            if not is_near_zero(coefficient):
+                found = k
+                break
+
+        if profiler is not None:
+            profiler.count('pivot_comparisons', (found if found >= 0 else num_equations) - row)
+            profiler.record('pivot_search', start, (row, col))
 
-        return False
+        if found < 0:
+            return False
+        self.swap_rows(row, found)
+        return True
 
     # 清除当前方程变量下面所有系数
     def clear_coefficients_below(self,row,col):
         num_equations = len(self)
-        beat = MyDecimal(self[row].normal_vector[col])
+        w = self.dimension + 1
+        beat = self.matrix[row*w + col]
 
         for k in range(row + 1, num_equations):
-            n = self[k].normal_vector
-            gamma = n[col]
+            gamma = self.matrix[k*w + col]
+            if gamma == 0:
+                continue
             alpha = -gamma/beat
-            self.add_multiple_times_row_to_row(alpha,row,k)
+            # 主元所在行col之前的系数都为0
+            self.add_multiple_times_row_to_row(alpha,row,k,start_col=col)
 
     # 构造简化阶梯型（rref）
+    @in_backend_context
     def compute_rref(self):
+        profiler = self.profiler
+        if profiler is not None:
+            start = profiler.clock()
         tf = self.compute_triangular_form()
 
         num_equations = len(self)
@@ -175,23 +340,123 @@ class LinearSystem(object):
             # 清除当前方程当前变量以上的变量
             tf.clear_coefficient_above(i,j)
 
+        if profiler is not None:
+            profiler.record('compute_rref', start)
         return tf
 
     # 将指定行的指定变量乘以自己系数的倒数，将系数变成1
     def scale_row_to_make_coefficient_equal_one(self,row,col):
-        n = self[row].normal_vector
-        beta = Decimal('1.0')/n[col]
+        beta = 1/self.coefficient(row, col)
         self.multiply_coefficient_and_row(beta,row)
 
     # 从指定行开始自下而上清除变量
     def clear_coefficient_above(self,row,col):
+        w = self.dimension + 1
         for k in range(row)[::-1]: #[5,4,3,2,1,0]从本行开始自下而上处理变量
-            n = self[k].normal_vector
-            alpha = -(n[col])
-            self.add_multiple_times_row_to_row(alpha,row,k)
+            alpha = -(self.matrix[k*w + col])
+            if alpha == 0:
+                continue
+            self.add_multiple_times_row_to_row(alpha,row,k,start_col=col)
+
+    # 按规范化哈希键把方程分成平行类和重合类，返回两个下标列表的列表
+    def group_equations(self, tolerance=1e-6):
+        w = self.dimension + 1
+        m = self.matrix
+        rows = ((m[o:o+w-1], m[o+w-1]) for o in range(0, self.num_equations * w, w))
+        return group_rows(rows, tolerance)
+
+    # 去掉重合（重复）的方程和 0 = 0 方程，返回新的方程组，消元前使用可减少行数
+    def drop_redundant_equations(self, tolerance=1e-6):
+        _, coincident = self.group_equations(tolerance)
+        w = self.dimension + 1
+        zero_row = canonical_keys([0] * self.dimension, 0)[1]
+        keep = []
+        for group in coincident:
+            i = group[0]
+            o = i * w
+            if canonical_keys(self.matrix[o:o+w-1], self.matrix[o+w-1], tolerance)[1] == zero_row:
+                continue
+            keep.append(i)
+        if not keep:
+            keep = [0]
+        keep.sort()
+
+        matrix = []
+        for i in keep:
+            matrix.extend(self.matrix[i*w:(i+1)*w])
+        return self._from_flat(matrix, len(keep), self.dimension, self.backend)
+
+    # 对系数矩阵做一次 PA = LU 分解，可用于多个常数项求解、行列式和秩
+    def lu(self, tolerance=1e-10):
+        return LUDecomposition.from_system(self, tolerance=tolerance)
+
+    # 精确模式：按有理数精确值做Bareiss无分数消元，不依赖容差判断主元
+    def bareiss(self):
+        return BareissElimination.from_system(self)
+
+    # 精确求解，结果使用fraction后端
+    # float后端的系数按其二进制值精确求解，十进制小数数据应以字符串给出并使用fraction/decimal后端
+    def compute_exact_solution(self):
+        elimination = self.bareiss()
+        if not elimination.is_consistent():
+            return self.NO_SOLUTIONS_MSG
+
+        direction_vectors = elimination.extract_direction_vectors_for_parametrization()
+        basepoint = elimination.extract_basepoint_for_parametrization()
+        return Parametrization(basepoint=basepoint,direction_vectors=direction_vectors)
 
-    # 计算方程组的结果
+    # Householder QR 分解，方程数多于未知数时可直接求最小二乘解，也可以继续追加方程
+    def qr(self, tolerance=1e-10):
+        return QRLeastSquares.from_system(self, tolerance=tolerance)
+
+    # 最小二乘解：返回 (解向量, 残差范数 ||Ax - b||)
+    def compute_least_squares_solution(self, tolerance=1e-10):
+        qr = self.qr(tolerance)
+        return qr.solve(), qr.residual_norm
+
+    # 混合精度求解：float64做LU分解，高精度计算残差并迭代修正，精度只在本次调用的局部上下文中生效
+    def compute_refined_solution(self, precision=50, residual='decimal', tolerance=None, max_iterations=20,
+                                 pivot_tolerance=1e-14):
+        return refine_solve(self, precision=precision, residual=residual, tolerance=tolerance,
+                            max_iterations=max_iterations, pivot_tolerance=pivot_tolerance)
+
+    # 检测系数矩阵的结构：对角、上/下三角、三对角、带状或一般
+    def detect_structure(self, tolerance=1e-10):
+        return detect_structure(self, tolerance)
+
+    # 按结构选择 O(n) / O(n*p*q) / O(n^2) 的求解方法，返回唯一解的参数化结果；
+    # 一般结构、奇异或需要选主元时返回 None。使用的方法记录在 last_structure 中
+    @in_backend_context
+    def compute_structured_solution(self, tolerance=1e-10):
+        profiler = self.profiler
+        if profiler is not None:
+            start = profiler.clock()
+        report = detect_structure(self, tolerance)
+        self.last_structure = report
+        if profiler is not None:
+            profiler.record('detect_structure', start, (report.kind,))
+            start = profiler.clock()
+
+        coordinates = solve_structured(self, report, tolerance)
+        if coordinates is None:
+            report.solver = 'rref'
+            return None
+        report.solver = report.kind
+        if profiler is not None:
+            profiler.record('structured_solve', start, (report.kind,))
+            profiler.count('structured_' + report.kind)
+        return Parametrization(basepoint=Vector(coordinates, self.backend), direction_vectors=[])
+
+    # 计算方程组的结果，方阵先尝试按结构求解；通过add_equation增量维护rref时直接参数化
     def compute_solution(self):
+        if self._rref is None:
+            solution = self.compute_structured_solution()
+            if solution is not None:
+                return solution
+        else:
+            report = StructureReport('incremental', None, None, len(self))
+            report.solver = 'incremental_rref'
+            self.last_structure = report
         try:
             # return self.do_gaosi_elimination_and_extract_solution()
             return self.do_gaosi_elimination_and_parametrize_solution()
@@ -204,6 +469,10 @@ class LinearSystem(object):
 
     # def do_gaosi_elimination_and_extract_solution(self):
     def do_gaosi_elimination_and_parametrize_solution(self):
+        if self._rref is not None:
+            # 已经通过add_equation增量维护了rref，直接参数化
+            return self._parametrize_maintained_rref()
+
         rref = self.compute_rref()
         # 检查0=k情况
         rref.raise_exception_if_contradictory_equation()
@@ -213,30 +482,117 @@ class LinearSystem(object):
         direction_vectors = rref.extract_direction_vectors_for_parametrization()
         # 提取参数化的基点
         basepoint = rref.extract_basepoint_for_parametrization()
-        # print direction_vectors
-        # print basepoint
 
         return Parametrization(basepoint=basepoint,direction_vectors=direction_vectors)
 
+    # 增量添加一个方程：只用已有主元行化简新方程，并更新维护的rref，每次O(n*rank)
+    # 返回加入后方程组是否仍然有解
+    @in_backend_context
+    def add_equation(self, plane):
+        if plane.dimension != self.dimension:
+            raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
+
+        convert = self.backend.convert
+        row = [convert(x) for x in plane.normal_vector.coordinates]
+        row.append(convert(plane.constant_term))
+
+        state = self._maintained_rref()
+        self.matrix.extend(row)
+        self.num_equations += 1
+
+        if state['inconsistent']:
+            return False
+
+        d = self.dimension
+        pivots = state['pivots']
+        rows = state['rows']
+
+        # 用已有主元行消去新方程中的主元变量
+        for p, prow in zip(pivots, rows):
+            f = row[p]
+            if f != 0:
+                row = [y - f*x for x, y in zip(prow, row)]
+
+        j = -1
+        for k in range(d):
+            if not is_near_zero(row[k]):
+                j = k
+                break
 
-        # num_variables = rref.dimension
-        # # 因为已经将变量系数处理为1，所以值就是解
-        # solution_coordinates = [rref.planes[i].constant_term for i in range(num_variables)]
-        #
-        # return Vector(solution_coordinates)
+        if j < 0:
+            if not is_near_zero(row[d]):
+                state['inconsistent'] = True
+                return False
+            # 新方程是已有方程的线性组合
+            return True
+
+        # 新主元系数化为1，并从已有主元行中消去这个变量
+        beta = 1/row[j]
+        row = [beta*x for x in row]
+        for i, prow in enumerate(rows):
+            f = prow[j]
+            if f != 0:
+                rows[i] = [y - f*x for x, y in zip(row, prow)]
+
+        pos = bisect_left(pivots, j)
+        pivots.insert(pos, j)
+        rows.insert(pos, row)
+        return True
+
+    # 方程组当前是否有解（使用维护的rref）
+    def is_consistent(self):
+        return not self._maintained_rref()['inconsistent']
+
+    # 维护的rref只保存主元行（按主元列排序）和是否出现0=k，第一次使用时完整消元一次
+    def _maintained_rref(self):
+        if self._rref is None:
+            rref = self.compute_rref()
+            w = self.dimension + 1
+            pivots = []
+            rows = []
+            inconsistent = False
+            for i, j in enumerate(rref.indices_of_first_nonzero_terms_in_each_row()):
+                row = rref.matrix[i*w:(i+1)*w]
+                if j >= 0:
+                    pivots.append(j)
+                    rows.append(row)
+                elif not is_near_zero(row[-1]):
+                    inconsistent = True
+            self._rref = {'pivots': pivots, 'rows': rows, 'inconsistent': inconsistent}
+        return self._rref
+
+    def _parametrize_maintained_rref(self):
+        state = self._rref
+        if state['inconsistent']:
+            raise Exception(self.NO_SOLUTIONS_MSG)
+
+        d = self.dimension
+        pivots = state['pivots']
+        rows = state['rows']
+        pivot_set = set(pivots)
+
+        basepoint_coords = [0] * d
+        for p, row in zip(pivots, rows):
+            basepoint_coords[p] = row[d]
+
+        direction_vectors = []
+        for free_var in range(d):
+            if free_var in pivot_set:
+                continue
+            vector_coords = [0] * d
+            vector_coords[free_var] = 1
+            for p, row in zip(pivots, rows):
+                vector_coords[p] = -row[free_var]
+            direction_vectors.append(Vector(vector_coords, self.backend))
+
+        return Parametrization(basepoint=Vector(basepoint_coords, self.backend),direction_vectors=direction_vectors)
 
     # 检查是否存在0=k的情况，如果有代表无解
     def raise_exception_if_contradictory_equation(self):
-        for p in self.planes:
-            try:
-                p.first_nonzero_index(p.normal_vector)
-            except Exception as e:
-                if str(e) == 'No nonzero elements found':
-                    constant_term = MyDecimal(p.constant_term)
-                    if not constant_term.is_near_zero():
-                        raise Exception(self.NO_SOLUTIONS_MSG)
-                else:
-                    raise e
+        pivot_indices = self.indices_of_first_nonzero_terms_in_each_row()
+        for i, pivot_var in enumerate(pivot_indices):
+            if pivot_var < 0 and not is_near_zero(self.constant_term(i)):
+                raise Exception(self.NO_SOLUTIONS_MSG)
 
     # 检查每个方程主元情况，如果主元总数比方程维度少，则表示存在0=0情况，方程有多个解
     def raise_exception_if_too_few_pivots(self):
@@ -250,21 +606,21 @@ class LinearSystem(object):
     def extract_direction_vectors_for_parametrization(self):
         # 方程组维度（即变量个数）
         num_variables = self.dimension
+        w = num_variables + 1
         # 每个方程主元位置列表
         pivot_indices = self.indices_of_first_nonzero_terms_in_each_row()
         free_variables_indices = set(range(num_variables)) - set(pivot_indices) #差值为自由变量的位置列表
 
         direction_vectors = []
 
-        for free_var in free_variables_indices:
+        for free_var in sorted(free_variables_indices):
             vector_coords = [0] * num_variables
             vector_coords[free_var] = 1
-            for i,p in enumerate(self.planes):
-                pivot_var = pivot_indices[i]
+            for i,pivot_var in enumerate(pivot_indices):
                 if pivot_var < 0:
                     break
-                vector_coords[pivot_var] = -p.normal_vector[free_var]
-            direction_vectors.append(Vector(vector_coords))
+                vector_coords[pivot_var] = -self.matrix[i*w + free_var]
+            direction_vectors.append(Vector(vector_coords, self.backend))
 
         return direction_vectors
 
@@ -273,25 +629,24 @@ class LinearSystem(object):
         pivot_indices = self.indices_of_first_nonzero_terms_in_each_row()
 
         basepoint_coords = [0] * num_variables
-        for i,p in enumerate(self.planes):
-            pivot_var = pivot_indices[i]
+        for i,pivot_var in enumerate(pivot_indices):
             if pivot_var < 0:
                 break
-            basepoint_coords[pivot_var] = p.constant_term
+            basepoint_coords[pivot_var] = self.constant_term(i)
 
-        return Vector(basepoint_coords)
-
-class MyDecimal(Decimal):
-    def is_near_zero(self, eps=1e-10):
-        return abs(self) < eps
+        return Vector(basepoint_coords, self.backend)
 
 class Parametrization(object):
     BASEPT_AND_DIR_VECTORS_MUST_BE_IN_SAME_DIM_MSG = 'The basepoint and direction vectors should all live in the same dimension'
 
+    WRONG_NUMBER_OF_PARAMETERS_MSG = 'The number of parameters does not match the direction vectors'
+
     def __init__(self,basepoint,direction_vectors):
         self.basepoint = basepoint
         self.direction_vectors = direction_vectors
         self.dimension = self.basepoint.dimension
+        # 方向向量的标准正交基，第一次判断距离/投影时才计算
+        self._basis = None
 
         try:
             for v in direction_vectors:
@@ -299,14 +654,102 @@ class Parametrization(object):
         except AssertionError:
             raise Exception(self.BASEPT_AND_DIR_VECTORS_MUST_BE_IN_SAME_DIM_MSG)
 
+    # 自由参数的个数
+    @property
+    def num_parameters(self):
+        return len(self.direction_vectors)
+
+    @property
+    def basis(self):
+        if self._basis is None:
+            self._basis = OrthonormalBasis(self.direction_vectors, dimension=self.dimension,
+                                           backend=self.basepoint.backend)
+        return self._basis
+
+    # 参数 t = (t_1, ..., t_k) 对应的解：basepoint + sum(t_j * d_j)
+    def evaluate(self, params):
+        if len(params) != self.num_parameters:
+            raise ValueError(self.WRONG_NUMBER_OF_PARAMETERS_MSG)
+        convert = self.basepoint.backend.convert
+        coords = list(self.basepoint.coordinates)
+        for t, d in zip(params, self.direction_vectors):
+            t = convert(t)
+            coords = [x + t * y for x, y in zip(coords, d.coordinates)]
+        return Vector(coords, self.basepoint.backend)
+
+    # 一次计算多组参数对应的解，按列计算，返回 VectorArray（float64）
+    def evaluate_batch(self, params):
+        params = [p for p in params]
+        if any(len(p) != self.num_parameters for p in params):
+            raise ValueError(self.WRONG_NUMBER_OF_PARAMETERS_MSG)
+        n = len(params)
+        t_columns = [array('d', col) for col in zip(*params)] if self.num_parameters else []
+        columns = []
+        for k, base in enumerate(self.basepoint.coordinates):
+            col = array('d', repeat(float(base), n))
+            for t, d in zip(t_columns, self.direction_vectors):
+                col = array('d', map(add, col, map(mul, t, repeat(float(d.coordinates[k])))))
+            columns.append(col)
+        return VectorArray.from_columns(columns)
+
+    # 惰性地随机抽取解，参数在 [-scale, scale] 中均匀分布；count 为 None 时无限产生
+    def sample(self, count=None, scale=1.0, seed=None):
+        rnd = random.Random(seed)
+        produced = 0
+        while count is None or produced < count:
+            yield self.evaluate([rnd.uniform(-scale, scale) for _ in range(self.num_parameters)])
+            produced += 1
+
+    # 单个点：Vector 或坐标序列（元素是数，而不是向量或序列），转为 basepoint 的后端
+    def _point(self, p):
+        if isinstance(p, Vector):
+            return p.to_backend(self.basepoint.backend)
+        if len(p) and not isinstance(p[0], Vector) and not hasattr(p[0], '__len__'):
+            return Vector(p, self.basepoint.backend)
+        return None
+
+    # 到解集的距离：点减去basepoint后，垂直于方向向量所张子空间的分量大小
+    # points 可以是单个点（Vector 或坐标序列）、点的列表或 VectorArray
+    def distance(self, points):
+        if isinstance(points, VectorArray):
+            return self.basis.distance(points.minus(self.basepoint))
+        point = self._point(points)
+        if point is not None:
+            return self.basis.distance(point.minus(self.basepoint))
+        return [self.distance(p) for p in points]
+
+    def contains(self, points, tolerance=1e-10):
+        distance = self.distance(points)
+        if isinstance(distance, (array, list)):
+            return [d < tolerance for d in distance]
+        return distance < tolerance
+
+    # 解集中离给定点最近的点
+    def project(self, points):
+        if isinstance(points, VectorArray):
+            return self.basis.project(points.minus(self.basepoint)).plus(self.basepoint)
+        point = self._point(points)
+        if point is not None:
+            return self.basis.project(point.minus(self.basepoint)).plus(self.basepoint)
+        return [self.project(p) for p in points]
+
+    # 逐个坐标写出参数方程，如 x_1 = 1.000 + -2.000 t_1
     def __str__(self):
-        return str(self.basepoint.dimension)
-
-
-p1 = Plane(normal_vector=Vector(['0.786','0.786','0.588']), constant_term='-0.714')
-p2 = Plane(normal_vector=Vector(['-0.138','-0.138','0.244']), constant_term='0.319')
-s = LinearSystem([p1,p2])
-print s.compute_solution()
+        lines = []
+        for k, base in enumerate(self.basepoint.coordinates):
+            terms = ['{:.3f}'.format(float(base))]
+            for j, d in enumerate(self.direction_vectors):
+                coefficient = d.coordinates[k]
+                if not is_near_zero(coefficient):
+                    terms.append('{:.3f} t_{}'.format(float(coefficient), j + 1))
+            lines.append('x_{} = {}'.format(k + 1, ' + '.join(terms)))
+        return '\n'.join(lines)
+
+
+# p1 = Plane(normal_vector=Vector(['0.786','0.786','0.588']), constant_term='-0.714')
+# p2 = Plane(normal_vector=Vector(['-0.138','-0.138','0.244']), constant_term='0.319')
+# s = LinearSystem([p1,p2])
+# print s.compute_solution()
 
 # p1 = Plane(normal_vector=Vector(['8.631','5.112','-1.816']), constant_term='-5.113')
 # p2 = Plane(normal_vector=Vector(['4.315','11.132','-5.27']), constant_term='-6.775')
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+from vector import Vector, get_backend, in_backend_context
+
+
+# PA = LU 分解（部分主元），分解一次后可以对任意多个常数项重复求解
+class LUDecomposition(object):
+
+    MATRIX_MUST_BE_SQUARE_MSG = 'LU solve requires a square coefficient matrix'
+    SINGULAR_MATRIX_MSG = 'Matrix is singular'
+    WRONG_RHS_LENGTH_MSG = 'Right-hand side length does not match the number of equations'
+
+    def __init__(self, coefficients, backend=None, tolerance=1e-10):
+        if not coefficients or not coefficients[0]:
+            raise ValueError('The coefficient matrix must be nonempty')
+
+        self.backend = get_backend(backend)
+        self.tolerance = tolerance
+        convert = self.backend.convert
+
+        self.num_rows = len(coefficients)
+        self.num_cols = len(coefficients[0])
+        # lu中对角线以下存放L的乘子（L对角线为1），对角线及以上存放U
+        self.lu = [[convert(x) for x in row] for row in coefficients]
+        # perm[i]表示分解后第i行对应原矩阵的哪一行
+        self.perm = list(range(self.num_rows))
+        self.num_swaps = 0
+        # 每一步消元的 (行, 列) 主元位置
+        self.pivots = []
+
+        self._factorize()
+
+    @classmethod
+    def from_system(cls, system, tolerance=1e-10):
+        coefficients = [system.coefficient_row(i) for i in range(len(system))]
+        return cls(coefficients, backend=system.backend, tolerance=tolerance)
+
+    @in_backend_context
+    def _factorize(self):
+        lu = self.lu
+        m, n = self.num_rows, self.num_cols
+        is_near_zero = self.backend.is_near_zero
+        tolerance = self.tolerance
+
+        r = 0
+        for j in range(n):
+            if r == m:
+                break
+            # 部分主元：选当前列绝对值最大的行
+            p = max(range(r, m), key=lambda i: abs(lu[i][j]))
+            if is_near_zero(lu[p][j], tolerance):
+                # 此列没有可用主元，秩不增加
+                continue
+
+            if p != r:
+                lu[p], lu[r] = lu[r], lu[p]
+                self.perm[p], self.perm[r] = self.perm[r], self.perm[p]
+                self.num_swaps += 1
+
+            pivot_row = lu[r]
+            pivot = pivot_row[j]
+            tail = pivot_row[j+1:]
+            for i in range(r + 1, m):
+                row = lu[i]
+                if row[j] == 0:
+                    continue
+                factor = row[j] / pivot
+                row[j] = factor
+                row[j+1:] = [y - factor*x for x, y in zip(tail, row[j+1:])]
+
+            self.pivots.append((r, j))
+            r += 1
+
+    @property
+    def rank(self):
+        return len(self.pivots)
+
+    def is_singular(self):
+        return self.num_rows != self.num_cols or self.rank < self.num_cols
+
+    # 行列式 = 置换符号 * U对角线乘积
+    def determinant(self):
+        if self.num_rows != self.num_cols:
+            raise Exception(self.MATRIX_MUST_BE_SQUARE_MSG)
+        if self.rank < self.num_cols:
+            return self.backend.convert(0)
+
+        det = self.backend.convert(-1 if self.num_swaps % 2 else 1)
+        for i in range(self.num_rows):
+            det *= self.lu[i][i]
+        return det
+
+    # 对一个常数项做前代、回代，返回解向量
+    def solve(self, b):
+        return self.solve_many([b])[0]
+
+    # 对多个常数项逐一求解，只做前代和回代，不重复消元
+    @in_backend_context
+    def solve_many(self, B):
+        if self.is_singular():
+            if self.num_rows != self.num_cols:
+                raise Exception(self.MATRIX_MUST_BE_SQUARE_MSG)
+            raise Exception(self.SINGULAR_MATRIX_MSG)
+
+        lu = self.lu
+        n = self.num_rows
+        perm = self.perm
+        convert = self.backend.convert
+
+        solutions = []
+        for b in B:
+            if isinstance(b, Vector):
+                b = b.coordinates
+            if len(b) != n:
+                raise ValueError(self.WRONG_RHS_LENGTH_MSG)
+
+            # 前代 Ly = Pb
+            y = [convert(b[p]) for p in perm]
+            for i in range(n):
+                row = lu[i]
+                s = y[i]
+                for k in range(i):
+                    s -= row[k] * y[k]
+                y[i] = s
+
+            # 回代 Ux = y
+            x = y
+            for i in range(n - 1, -1, -1):
+                row = lu[i]
+                s = x[i]
+                for k in range(i + 1, n):
+                    s -= row[k] * x[k]
+                x[i] = s / row[i]
+
+            solutions.append(Vector(x, self.backend))
+
+        return solutions
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+import csv
+import mmap
+import struct
+from array import array
+from operator import mul
+
+from vector import Vector, ArrayVector, FLOAT, FRACTION
+from linsys import LinearSystem
+
+
+# 二进制格式：32字节文件头 + 按行连续存放的系数块（小端）
+#   magic(4s) version(H) dtype(c: 'd'=float64 / 'q'=int64) pad(x) flags(I) rows(Q) cols(Q) reserved(4x)
+# flags 第0位为1时每行末尾多存一个常数项（增广矩阵），否则就是一组 cols 维向量
+MAGIC = b'LSYS'
+VERSION = 1
+HEADER = struct.Struct('<4sHcxIQQ4x')
+HEADER_SIZE = HEADER.size
+FLAG_CONSTANTS = 1
+DTYPES = {'d': FLOAT, 'q': FRACTION}
+
+BAD_MAGIC_MSG = 'Not a linear system file'
+BAD_VERSION_MSG = 'Unsupported file version'
+TRUNCATED_FILE_MSG = 'File is shorter than its header declares'
+WRONG_ROW_LENGTH_MSG = 'Row has the wrong number of values'
+
+
+def _check_dtype(dtype):
+    if dtype not in DTYPES:
+        raise ValueError('Unsupported dtype: {}'.format(dtype))
+
+
+# 流式写入：逐行追加，关闭时回填行数，内存中不保留整个矩阵
+class MatrixWriter(object):
+
+    def __init__(self, path, num_cols, dtype='d', has_constants=True):
+        _check_dtype(dtype)
+        self.path = path
+        self.num_cols = num_cols
+        self.dtype = dtype
+        self.has_constants = has_constants
+        self.row_width = num_cols + (1 if has_constants else 0)
+        self.num_rows = 0
+        self.file = open(path, 'wb')
+        self._write_header()
+
+    def _write_header(self):
+        flags = FLAG_CONSTANTS if self.has_constants else 0
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.dtype.encode('ascii'), flags,
+                                    self.num_rows, self.num_cols))
+
+    # values 为一行的系数（有常数项时 constant 为该行常数项）
+    def write_row(self, values, constant=None):
+        row = list(values)
+        if self.has_constants:
+            if constant is None:
+                raise ValueError('constant is required for an augmented matrix file')
+            row.append(constant)
+        if len(row) != self.row_width:
+            raise ValueError(WRONG_ROW_LENGTH_MSG)
+        if self.dtype == 'q':
+            row = [int(x) for x in row]
+        else:
+            row = [float(x) for x in row]
+        array(self.dtype, row).tofile(self.file)
+        self.num_rows += 1
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.seek(0)
+        self._write_header()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# 以mmap只读打开，行数据是对映射内存的memoryview切片，读取不复制
+# 提供 len() / dimension / coefficient_row / constant_term，可以直接交给 iterative、LUDecomposition 等使用
+class MappedMatrix(object):
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法映射
+            self.file.close()
+            raise ValueError(BAD_MAGIC_MSG)
+
+        # 不足一个文件头时无法解析，按格式错误处理
+        if len(self.mmap) < HEADER_SIZE:
+            self.close()
+            raise ValueError(BAD_MAGIC_MSG)
+        magic, version, dtype, flags, rows, cols = HEADER.unpack_from(self.mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(BAD_MAGIC_MSG)
+        if version != VERSION:
+            self.close()
+            raise ValueError(BAD_VERSION_MSG)
+
+        self.dtype = dtype.decode('latin-1')
+        if self.dtype not in DTYPES:
+            self.close()
+            _check_dtype(self.dtype)
+        self.backend = DTYPES[self.dtype]
+        self.has_constants = bool(flags & FLAG_CONSTANTS)
+        self.num_rows = rows
+        self.dimension = cols
+        self.row_width = cols + (1 if self.has_constants else 0)
+
+        size = rows * self.row_width * struct.calcsize(self.dtype)
+        # 文件被截断（例如复制不完整）时切片会静默变短，读取时越界或得到错误的行
+        if len(self.mmap) < HEADER_SIZE + size:
+            self.close()
+            raise ValueError(TRUNCATED_FILE_MSG)
+        self.buffer = memoryview(self.mmap)[HEADER_SIZE:HEADER_SIZE+size]
+        self.values = self.buffer.cast(self.dtype)
+
+    def close(self):
+        values = getattr(self, 'values', None)
+        if values is not None:
+            values.release()
+            self.buffer.release()
+            self.values = None
+        if not self.mmap.closed:
+            self.mmap.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.num_rows
+
+    def _offset(self, row):
+        if row < 0:
+            row += self.num_rows
+        if not 0 <= row < self.num_rows:
+            raise IndexError('list index out of range')
+        return row * self.row_width
+
+    # 第row行的系数，memoryview切片，不复制
+    def coefficient_row(self, row):
+        o = self._offset(row)
+        return self.values[o:o+self.dimension]
+
+    def constant_term(self, row):
+        if not self.has_constants:
+            return self.backend.convert(0)
+        return self.values[self._offset(row) + self.dimension]
+
+    # float64文件返回映射内存上的零复制 ArrayVector，需在 close() 之前释放
+    def vector(self, row):
+        if self.dtype == 'd':
+            return ArrayVector._from_buffer(self.values, self._offset(row), self.dimension)
+        return Vector(self.coefficient_row(row), self.backend)
+
+    # A x，逐行直接在映射内存上计算
+    def matvec(self, x):
+        if isinstance(x, Vector):
+            x = x.coordinates
+        w = self.row_width
+        d = self.dimension
+        values = self.values
+        return [sum(map(mul, values[i*w:i*w+d], x)) for i in range(self.num_rows)]
+
+    # 每一行与向量v的点积（向量集合时即逐个内积）
+    def dot_rows(self, v):
+        return self.matvec(v)
+
+    def to_linear_system(self):
+        coefficients = [self.coefficient_row(i).tolist() for i in range(self.num_rows)]
+        constants = [self.constant_term(i) for i in range(self.num_rows)]
+        return LinearSystem.from_matrix(coefficients, constants, self.backend)
+
+
+def write_system(path, system, dtype='d'):
+    with MatrixWriter(path, system.dimension, dtype=dtype, has_constants=True) as writer:
+        for i in range(len(system)):
+            writer.write_row(system.coefficient_row(i), system.constant_term(i))
+
+
+def write_vectors(path, vectors, dtype='d'):
+    writer = None
+    try:
+        for v in vectors:
+            coords = v.coordinates if isinstance(v, Vector) else v
+            if writer is None:
+                writer = MatrixWriter(path, len(coords), dtype=dtype, has_constants=False)
+            writer.write_row(coords)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+# CSV逐行转换为二进制文件；has_constants 为真时每行最后一列作为常数项
+def csv_to_binary(csv_path, out_path, dtype='d', has_constants=True, delimiter=',', skip_header=False):
+    writer = None
+    with open(csv_path) as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        if skip_header:
+            next(reader, None)
+        try:
+            for record in reader:
+                if not record:
+                    continue
+                values = [float(x) if dtype == 'd' else int(x) for x in record]
+                if writer is None:
+                    num_cols = len(values) - (1 if has_constants else 0)
+                    writer = MatrixWriter(out_path, num_cols, dtype=dtype, has_constants=has_constants)
+                if has_constants:
+                    writer.write_row(values[:-1], values[-1])
+                else:
+                    writer.write_row(values)
+        finally:
+            if writer is not None:
+                writer.close()
+    return writer.num_rows if writer is not None else 0
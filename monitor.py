@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+# 并发健康检查守护进程，替代 server_monitor.sh
+# 进程检查 / TCP端口探测 / ping探测并发执行，每个检查有独立超时；
+# 失败时执行配置的重启命令，报警短信经同一个连接池批量发送并限速
+# 配置了 history 时每次结果写入环形缓冲区文件，用于报警去重和延迟统计
+# 用法:
+#   python monitor.py --config monitor.example.json
+#   python monitor.py --config monitor.example.json --once
+#   python monitor.py --config monitor.example.json --report 3600
+import argparse
+import asyncio
+import http.client
+import json
+import logging
+import queue
+import sys
+import time
+from urllib.parse import urlencode, urlsplit
+
+from history import HistoryStore
+
+logger = logging.getLogger('monitor')
+
+
+# 一次检查的结果；latency 为秒
+class CheckResult(object):
+    def __init__(self, name, ok, latency, detail=''):
+        self.name = name
+        self.ok = ok
+        self.latency = latency
+        self.detail = detail
+        self.timestamp = time.time()
+
+    def __str__(self):
+        return '{} {} {:.1f}ms {}'.format(self.name, 'ok' if self.ok else 'FAIL',
+                                          self.latency * 1000, self.detail)
+
+
+class Check(object):
+
+    def __init__(self, name, timeout=5.0, restart=None, restart_timeout=30.0):
+        self.name = name
+        self.timeout = timeout
+        # 检查失败时执行的shell命令（如 /app/apache2/bin/apachectl start）
+        self.restart = restart
+        self.restart_timeout = restart_timeout
+
+    # 返回 (是否正常, 说明)
+    async def probe(self):
+        raise NotImplementedError
+
+    # 探测中的任何异常都记为失败，一个检查出错不影响同一轮的其他检查
+    async def run(self):
+        start = time.perf_counter()
+        try:
+            ok, detail = await asyncio.wait_for(self.probe(), self.timeout)
+        except asyncio.TimeoutError:
+            ok, detail = False, 'timeout after {}s'.format(self.timeout)
+        except OSError as e:
+            ok, detail = False, str(e)
+        except Exception as e:
+            ok, detail = False, '{}: {}'.format(type(e).__name__, e)
+        return CheckResult(self.name, ok, time.perf_counter() - start, detail)
+
+
+async def _run_command(*args):
+    proc = await asyncio.create_subprocess_exec(*args, stdout=asyncio.subprocess.DEVNULL,
+                                                stderr=asyncio.subprocess.DEVNULL)
+    try:
+        return await proc.wait()
+    except asyncio.CancelledError:
+        # 超时被取消时不留下子进程
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+
+
+# 进程是否存在（pgrep）
+class ProcessCheck(Check):
+    def __init__(self, name, pattern, **kwargs):
+        super(ProcessCheck, self).__init__(name, **kwargs)
+        self.pattern = pattern
+
+    async def probe(self):
+        code = await _run_command('pgrep', self.pattern)
+        if code == 0:
+            return True, ''
+        return False, 'no process matching {}'.format(self.pattern)
+
+
+# 端口能否建立TCP连接
+class TcpCheck(Check):
+    def __init__(self, name, host, port, **kwargs):
+        super(TcpCheck, self).__init__(name, **kwargs)
+        self.host = host
+        self.port = port
+
+    async def probe(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.close()
+        await writer.wait_closed()
+        return True, ''
+
+
+# ping count 次，收到任意一个回复即认为存活（原脚本 ping -c 3）
+# 原始ICMP套接字需要root权限，这里调用系统ping
+class IcmpCheck(Check):
+    def __init__(self, name, host, count=3, **kwargs):
+        super(IcmpCheck, self).__init__(name, **kwargs)
+        self.host = host
+        self.count = count
+
+    async def probe(self):
+        wait = max(1, int(self.timeout))
+        code = await _run_command('ping', '-c', str(self.count), '-W', str(wait), self.host)
+        if code == 0:
+            return True, ''
+        return False, 'no reply from {}'.format(self.host)
+
+
+CHECK_TYPES = {
+    'process': ProcessCheck,
+    'tcp': TcpCheck,
+    'icmp': IcmpCheck,
+}
+
+
+def make_check(spec):
+    spec = dict(spec)
+    kind = spec.pop('type')
+    if kind not in CHECK_TYPES:
+        raise ValueError('Unknown check type: {}'.format(kind))
+    return CHECK_TYPES[kind](**spec)
+
+
+# 同步HTTP连接池：每个 (scheme, host, port) 最多保留 max_connections 个keep-alive连接
+# 请求在线程池中执行，不阻塞事件循环
+class HttpClient(object):
+
+    # 连接失败后可以安全重发的方法；POST 可能已被服务端处理，重发会重复发送短信
+    IDEMPOTENT_METHODS = ('GET', 'HEAD')
+
+    def __init__(self, max_connections=2, timeout=10.0):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.pools = {}
+
+    def _pool(self, key):
+        pool = self.pools.get(key)
+        if pool is None:
+            pool = self.pools[key] = queue.LifoQueue()
+            for _ in range(self.max_connections):
+                pool.put(None)
+        return pool
+
+    def _connect(self, scheme, host, port):
+        if scheme == 'https':
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _request(self, method, url, body, headers):
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        pool = self._pool(key)
+        conn = pool.get()
+        try:
+            # 复用的连接可能已被服务端关闭，幂等请求失败时新建连接重试一次
+            attempts = (0, 1) if method in self.IDEMPOTENT_METHODS else (1,)
+            for attempt in attempts:
+                if conn is None:
+                    conn = self._connect(*key)
+                try:
+                    conn.request(method, path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    data = response.read()
+                    if response.will_close:
+                        conn.close()
+                        conn = None
+                    return response.status, data
+                except (http.client.HTTPException, OSError):
+                    conn.close()
+                    conn = None
+                    if attempt:
+                        raise
+        finally:
+            pool.put(conn)
+
+    async def post_form(self, url, fields):
+        body = urlencode(fields)
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._request, 'POST', url, body, headers)
+
+    def close(self):
+        for pool in self.pools.values():
+            while not pool.empty():
+                conn = pool.get_nowait()
+                if conn is not None:
+                    conn.close()
+        self.pools = {}
+
+
+# 短信报警：消息先入队，每隔 batch_interval 秒合并成一条短信发送；
+# 每 rate_window 秒最多发送 max_per_window 条，超出的消息留到下一批合并发送
+class SmsAlerter(object):
+
+    def __init__(self, url, username, password, mobiles, client=None,
+                 batch_interval=5.0, max_per_window=10, rate_window=60.0, separator=';'):
+        self.url = url
+        self.username = username
+        self.password = password
+        self.mobiles = mobiles if isinstance(mobiles, str) else ','.join(mobiles)
+        self.client = client or HttpClient()
+        self.batch_interval = batch_interval
+        self.max_per_window = max_per_window
+        self.rate_window = rate_window
+        self.separator = separator
+        self.pending = []
+        self.sent_times = []
+        self.sent = 0
+        self.failed = 0
+        self._wakeup = asyncio.Event()
+
+    def alert(self, message):
+        self.pending.append(message)
+        self._wakeup.set()
+
+    def _allowed(self, now):
+        self.sent_times = [t for t in self.sent_times if now - t < self.rate_window]
+        return len(self.sent_times) < self.max_per_window
+
+    # 原脚本的短信接口参数
+    def _fields(self, message):
+        return {
+            'func': 'sendsms', 'username': self.username, 'password': self.password,
+            'mobiles': self.mobiles, 'message': message, 'smstype': 0,
+            'timerflag': 0, 'timervalue': '', 'timertype': 0, 'timerid': 0,
+        }
+
+    # 发送当前积压的消息，返回是否发出了一条短信
+    async def flush(self):
+        if not self.pending or not self._allowed(time.monotonic()):
+            return False
+        messages, self.pending = self.pending, []
+        self.sent_times.append(time.monotonic())
+        message = self.separator.join(messages)
+        try:
+            status, _ = await self.client.post_form(self.url, self._fields(message))
+        except (OSError, http.client.HTTPException) as e:
+            logger.error('sms request failed: %s', e)
+            status = None
+        except BaseException:
+            # 被取消或其他异常时消息也不能丢失
+            self.pending = messages + self.pending
+            raise
+        if status is None or status >= 400:
+            # 发送失败的消息放回队列，下一批重试
+            self.failed += 1
+            self.pending = messages + self.pending
+            return False
+        self.sent += 1
+        return True
+
+    async def run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # 等待一个批次间隔，让同一轮的报警合并
+            await asyncio.sleep(self.batch_interval)
+            try:
+                await self.flush()
+            except Exception:
+                # 发送任务不能因为一次异常退出，否则之后的报警全部丢失
+                logger.exception('sms flush failed')
+            if self.pending:
+                self._wakeup.set()
+
+
+class Monitor(object):
+
+    def __init__(self, checks, alerter=None, interval=60.0, history=None, realert_interval=3600.0):
+        self.checks = checks
+        self.alerter = alerter
+        self.interval = interval
+        self.history = history
+        # 持续失败时，距上次报警超过 realert_interval 秒才再次报警
+        self.realert_interval = realert_interval
+        self.last_alert = {}
+
+    @classmethod
+    def from_config(cls, config, client=None):
+        checks = [make_check(spec) for spec in config.get('checks', [])]
+        alerter = None
+        sms = config.get('sms')
+        if sms:
+            alerter = SmsAlerter(client=client, **sms)
+        history = None
+        if config.get('history'):
+            history = HistoryStore(**config['history'])
+        return cls(checks, alerter, interval=config.get('interval', 60.0), history=history,
+                   realert_interval=config.get('realert_interval', 3600.0))
+
+    async def _restart(self, check):
+        logger.warning('restarting %s: %s', check.name, check.restart)
+        proc = await asyncio.create_subprocess_shell(check.restart, stdout=asyncio.subprocess.DEVNULL,
+                                                     stderr=asyncio.subprocess.DEVNULL,
+                                                     start_new_session=True)
+        try:
+            await asyncio.wait_for(proc.wait(), check.restart_timeout)
+        except asyncio.TimeoutError:
+            # 前台运行的服务（如 mysqld_safe）不会退出，保留它继续运行
+            pass
+
+    # 有历史记录时，上一次已经失败且最近报过警的检查不再重复发短信
+    def should_alert(self, check, result):
+        if self.history is None:
+            return True
+        if self.history.last_status(check.name) is not False:
+            return True
+        last = self.last_alert.get(check.name)
+        return last is None or result.timestamp - last >= self.realert_interval
+
+    def on_failure(self, check, result):
+        if self.alerter is not None and self.should_alert(check, result):
+            self.last_alert[check.name] = result.timestamp
+            date = time.strftime('%Y-%m-%d_%H:%M:%S', time.localtime(result.timestamp))
+            self.alerter.alert('{}_error_at_{}'.format(check.name, date))
+
+    # 所有检查并发执行一轮，失败的检查发报警并执行重启命令
+    # 同一轮的结果使用本轮开始的时间戳，保证历史记录按时间有序（检查完成的先后与配置顺序无关）
+    async def run_once(self):
+        round_start = time.time()
+        results = await asyncio.gather(*[check.run() for check in self.checks])
+        restarts = []
+        for check, result in zip(self.checks, results):
+            result.timestamp = round_start
+            logger.info('%s', result)
+            if not result.ok:
+                self.on_failure(check, result)
+                if check.restart:
+                    restarts.append(self._restart(check))
+            if self.history is not None:
+                self.history.append_result(result)
+        if restarts:
+            await asyncio.gather(*restarts)
+        return results
+
+    # 每个检查最近 window 秒的可用率、p50/p99 延迟（秒）和翻转次数
+    def report(self, window=3600.0):
+        if self.history is None:
+            return {}
+        return dict((check.name, self.history.summary(check.name, window)) for check in self.checks)
+
+    async def run(self):
+        sender = asyncio.ensure_future(self.alerter.run()) if self.alerter else None
+        try:
+            while True:
+                start = time.monotonic()
+                if sender is not None and sender.done():
+                    # 发送任务意外结束时记录原因并重新启动
+                    if not sender.cancelled() and sender.exception() is not None:
+                        logger.error('sms sender stopped: %r', sender.exception())
+                    sender = asyncio.ensure_future(self.alerter.run())
+                await self.run_once()
+                await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - start)))
+        finally:
+            if sender is not None:
+                sender.cancel()
+
+
+def load_config(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+async def _main(config, once, report_window=None):
+    client = HttpClient()
+    monitor = Monitor.from_config(config, client=client)
+    try:
+        if report_window is not None:
+            print(json.dumps(monitor.report(report_window), indent=2, sort_keys=True))
+            return 0
+        if once:
+            results = await monitor.run_once()
+            if monitor.alerter is not None:
+                await monitor.alerter.flush()
+            return 0 if all(r.ok for r in results) else 1
+        await monitor.run()
+    finally:
+        client.close()
+        if monitor.history is not None:
+            monitor.history.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Concurrent process / TCP / ping monitor with SMS alerts')
+    parser.add_argument('--config', required=True, help='JSON configuration file')
+    parser.add_argument('--once', action='store_true', help='run every check once and exit')
+    parser.add_argument('--report', type=float, metavar='SECONDS',
+                        help='print availability and latency percentiles from the history file and exit')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s %(levelname)s %(message)s')
+    try:
+        return asyncio.run(_main(load_config(args.config), args.once, args.report)) or 0
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,41 +1,47 @@
 # -*- coding: utf-8 -*-
-from decimal import Decimal, getcontext
+import math
+from itertools import product
 
-from vector import Vector
-
-getcontext().prec = 30
+from vector import Vector, in_backend_context, is_near_zero
 
 
 class Plane(object):
 
     NO_NONZERO_ELTS_FOUND_MSG = 'No nonzero elements found'
 
-    def __init__(self, normal_vector=None, constant_term=None):
-        self.dimension = 3
+    def __init__(self, normal_vector=None, constant_term=None, backend=None, dimension=3):
+        # 维度由法向量决定，未给出法向量时默认为三维
+        self.dimension = normal_vector.dimension if normal_vector else dimension
 
         if not normal_vector:
             all_zeros = ['0']*self.dimension
-            normal_vector = Vector(all_zeros)
+            normal_vector = Vector(all_zeros, backend)
+        elif backend is not None:
+            normal_vector = normal_vector.to_backend(backend)
         self.normal_vector = normal_vector
+        # 常数项与法向量使用同一个数值后端
+        self.backend = normal_vector.backend
 
         if not constant_term:
-            constant_term = Decimal('0')
-        self.constant_term = Decimal(constant_term)
+            constant_term = 0
+        self.constant_term = self.backend.convert(constant_term)
 
         self.set_basepoint()
 
 
+    # 除法在后端自己的decimal上下文中进行
+    @in_backend_context
     def set_basepoint(self):
         try:
             n = self.normal_vector
             c = self.constant_term
-            basepoint_coords = ['0']*self.dimension
+            basepoint_coords = [0]*self.dimension
 
             initial_index = Plane.first_nonzero_index(n)
             initial_coefficient = n[initial_index]
 
             basepoint_coords[initial_index] = c/initial_coefficient
-            self.basepoint = Vector(basepoint_coords)
+            self.basepoint = Vector(basepoint_coords, self.backend)
 
         except Exception as e:
             if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
@@ -93,10 +99,13 @@ class Plane(object):
     @staticmethod
     def first_nonzero_index(iterable):
         for k, item in enumerate(iterable):
-            if not MyDecimal(item).is_near_zero():
+            if not is_near_zero(item):
                 return k
         raise Exception(Plane.NO_NONZERO_ELTS_FOUND_MSG)
 
+    def canonical_keys(self, tolerance=1e-6):
+        return canonical_keys(self.normal_vector.coordinates, self.constant_term, tolerance)
+
     # 两平面是否平行
     def pingxing(self,other):
         n1 = self.normal_vector
@@ -104,6 +113,7 @@ class Plane(object):
         return n1.pingxing(n2)
 
     # 两平面是否相等
+    @in_backend_context
     def __eq__(self, other):
         if self.normal_vector.is_zero():
             # 如果一个平面法向量为0向量
@@ -113,7 +123,7 @@ class Plane(object):
             else:
                 # 如果另一平面法向量也为零向量，常量差值为0时两平面相等，差值不为0时两平面不相等
                 diff = self.constant_term - other.constant_term
-                return MyDecimal(diff).is_near_zero()
+                return is_near_zero(diff)
         elif other.normal_vector.is_zero():
             # 一平面法向量不为0，另一条法向量为0
             return False,2
@@ -131,9 +141,101 @@ class Plane(object):
         return basepoint_diff.zhengjiao(n)
 
 
-class MyDecimal(Decimal):
-    def is_near_zero(self, eps=1e-10):
-        return abs(self) < eps
+# 方程 n·x = k 规范化后按容差缩放的值：法向量除以长度并统一符号（第一个非零分量为正），
+# 再除以 tolerance，一个量化格子的宽度为1；法向量为0时返回 None
+def _scaled_values(coefficients, constant_term, tolerance):
+    coords = [float(x) for x in coefficients]
+    k = float(constant_term)
+    norm = math.sqrt(sum(x*x for x in coords))
+    if norm < 1e-10:
+        return None
+
+    scale = 1.0 / norm
+    for x in coords:
+        if abs(x) * scale > tolerance:
+            if x < 0:
+                scale = -scale
+            break
+    scale /= tolerance
+    return [x * scale for x in coords] + [k * scale]
+
+
+# 方程 n·x = k 的规范化哈希键：规范化后的值按容差量化
+# 返回 (平行键, 重合键)，平行的平面平行键相同，重合的平面重合键也相同
+def canonical_keys(coefficients, constant_term, tolerance=1e-6):
+    values = _scaled_values(coefficients, constant_term, tolerance)
+    if values is None:
+        # 法向量为0：0 = 0 为整个空间，0 = k 为空集
+        parallel = ('zero',)
+        return parallel, parallel + (round(float(constant_term) / tolerance) == 0,)
+
+    key = tuple(int(round(x)) for x in values)
+    return key[:-1], key
+
+
+# 量化格子上的分组。round() 会把格子边界两侧几乎相同的值分到不同格子，
+# 所以本格子没有组时，再查看边界附近分量的相邻格子；相邻格子中的组只有与代表值（组内第一个）
+# 每个分量相差不超过 2*margin 个格子时才合并。只有靠近边界的分量需要查相邻格子，通常只多查一两个格子
+class _GridGroups(object):
+
+    def __init__(self, margin=0.01):
+        self.margin = margin
+        # 格子 -> 组下标
+        self.cells = {}
+        # (代表值, 成员下标列表)，按第一次出现的顺序
+        self.groups = []
+
+    def add(self, key, values, index):
+        g = self.cells.get(key)
+        if g is None and values is not None:
+            g = self._find_neighbour(key, values)
+        if g is None:
+            g = len(self.groups)
+            self.cells[key] = g
+            self.groups.append((values, []))
+        self.groups[g][1].append(index)
+
+    def _find_neighbour(self, key, values):
+        margin = self.margin
+        options = []
+        for x, r in zip(values, key):
+            if abs(x - r) >= 0.5 - margin:
+                options.append((r, r + 1 if x > r else r - 1))
+            else:
+                options.append((r,))
+        for cell in product(*options):
+            g = self.cells.get(cell)
+            if g is None:
+                continue
+            representative = self.groups[g][0]
+            if all(abs(a - b) <= 2 * margin for a, b in zip(representative, values)):
+                return g
+        return None
+
+    def members(self):
+        return [members for _, members in self.groups]
+
+
+# 一次遍历把方程 (系数, 常数项) 分成平行类和重合类，哈希分组，约O(N)
+# 返回两个列表，元素为方程下标列表，按每类第一次出现的顺序排列
+def group_rows(rows, tolerance=1e-6):
+    parallel = _GridGroups()
+    coincident = _GridGroups()
+    for i, (coefficients, constant_term) in enumerate(rows):
+        values = _scaled_values(coefficients, constant_term, tolerance)
+        if values is None:
+            pk, ck = canonical_keys(coefficients, constant_term, tolerance)
+            parallel.add(pk, None, i)
+            coincident.add(ck, None, i)
+            continue
+        key = tuple(int(round(x)) for x in values)
+        parallel.add(key[:-1], values[:-1], i)
+        coincident.add(key, values, i)
+    return parallel.members(), coincident.members()
+
+
+def group_planes(planes, tolerance=1e-6):
+    return group_rows(((p.normal_vector.coordinates, p.constant_term) for p in planes), tolerance)
 
 
 # line1 = Plane(normal_vector=Vector(['-0.412','3.806','0.728']),constant_term='-3.46')
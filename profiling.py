@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import json
+import time
+
+
+# 消元过程的性能记录：每种操作的次数和累计耗时、算术运算次数、分配次数，可选逐条跟踪
+# LinearSystem.profiler 为 None 时不做任何记录，只多一次属性判断
+class EliminationProfiler(object):
+
+    def __init__(self, trace=False, max_trace=10000, clock=time.perf_counter):
+        self.clock = clock
+        self.trace_enabled = trace
+        self.max_trace = max_trace
+        self.reset()
+
+    def reset(self):
+        # 名称 -> [次数, 累计秒数]
+        self.operations = {}
+        # 算术运算次数、分配的行/Plane/方程组副本个数等
+        self.counters = {}
+        self.trace = []
+        self.trace_dropped = 0
+
+    # start 为操作开始时 clock() 的值；args 只在开启跟踪时保存
+    def record(self, name, start, args=None):
+        elapsed = self.clock() - start
+        entry = self.operations.get(name)
+        if entry is None:
+            self.operations[name] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+
+        if self.trace_enabled:
+            if len(self.trace) < self.max_trace:
+                self.trace.append({'op': name, 'start': start, 'seconds': elapsed, 'args': args})
+            else:
+                self.trace_dropped += 1
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self):
+        operations = dict((name, {'count': c, 'total_seconds': t, 'mean_seconds': t / c})
+                          for name, (c, t) in self.operations.items())
+        report = {'operations': operations, 'counters': dict(self.counters)}
+        if self.trace_enabled:
+            report['trace'] = list(self.trace)
+            report['trace_dropped'] = self.trace_dropped
+        return report
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.report(), sort_keys=True, **kwargs)
+
+    def __str__(self):
+        lines = ['{:<48}{:>10}{:>14}'.format('operation', 'count', 'total ms')]
+        for name, (c, t) in sorted(self.operations.items(), key=lambda kv: -kv[1][1]):
+            lines.append('{:<48}{:>10}{:>14.3f}'.format(name, c, t * 1000))
+        for name, n in sorted(self.counters.items()):
+            lines.append('{:<48}{:>10}'.format(name, n))
+        return '\n'.join(lines)
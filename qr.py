@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+import math
+
+from vector import Vector, FLOAT
+
+
+# 最小二乘 QR 分解：对增广矩阵 [A | b] 做Householder变换，只保留 R (n×n 上三角) 和 Q^T b 的前n项，
+# 不显式构造Q。Q^T b 其余分量的平方和就是残差平方和 ||Ax - b||^2。
+# 追加方程时用Givens旋转把新行消到R中，不需要重新分解
+class QRLeastSquares(object):
+
+    RANK_DEFICIENT_MSG = 'Coefficient matrix does not have full column rank'
+    WRONG_ROW_LENGTH_MSG = 'Row length does not match the number of variables'
+
+    def __init__(self, coefficients, constants, tolerance=1e-10):
+        if not coefficients or not coefficients[0]:
+            raise ValueError('The coefficient matrix must be nonempty')
+        if len(coefficients) != len(constants):
+            raise ValueError('Each equation needs a constant term')
+
+        self.backend = FLOAT
+        self.tolerance = tolerance
+        self.num_rows = len(coefficients)
+        self.dimension = n = len(coefficients[0])
+
+        rows = [[float(x) for x in row] + [float(k)] for row, k in zip(coefficients, constants)]
+        for row in rows:
+            if len(row) != n + 1:
+                raise ValueError(self.WRONG_ROW_LENGTH_MSG)
+        self._householder(rows)
+
+        # R 与 Q^T b 按行存放：rows[i][:n] 为R的第i行，rows[i][n] 为 (Q^T b)[i]
+        # 方程数少于未知数时用零行补齐，之后追加的方程会旋转进来
+        while len(rows) < n:
+            rows.append([0.0] * (n + 1))
+        self.residual_sum_of_squares = sum(row[n] * row[n] for row in rows[n:])
+        self.rows = rows[:n]
+
+    @classmethod
+    def from_system(cls, system, tolerance=1e-10):
+        coefficients = [system.coefficient_row(i) for i in range(len(system))]
+        constants = [system.constant_term(i) for i in range(len(system))]
+        return cls(coefficients, constants, tolerance=tolerance)
+
+    def _householder(self, rows):
+        m = len(rows)
+        n = self.dimension
+        for k in range(min(m - 1, n)):
+            x = [rows[i][k] for i in range(k, m)]
+            norm = math.sqrt(sum(v * v for v in x))
+            if norm == 0.0:
+                continue
+            # 选与x[0]异号的alpha，避免相消
+            alpha = -norm if x[0] >= 0 else norm
+            v = x
+            v[0] -= alpha
+            v_norm2 = sum(t * t for t in v)
+            if v_norm2 == 0.0:
+                continue
+
+            # (I - 2vv^T/v^Tv) 作用于第k列之后的每一列（包括常数项列）
+            for j in range(k + 1, n + 1):
+                s = 0.0
+                for t, i in zip(v, range(k, m)):
+                    s += t * rows[i][j]
+                if s == 0.0:
+                    continue
+                f = 2.0 * s / v_norm2
+                for t, i in zip(v, range(k, m)):
+                    rows[i][j] -= f * t
+            rows[k][k] = alpha
+            for i in range(k + 1, m):
+                rows[i][k] = 0.0
+
+    # 追加一个方程：依次用Givens旋转把新行的第j个系数与R[j][j]合并并消去
+    # 旋转后常数项剩下的部分计入残差平方和
+    def append_row(self, coefficients, constant):
+        if isinstance(coefficients, Vector):
+            coefficients = coefficients.coordinates
+        n = self.dimension
+        new = [float(x) for x in coefficients] + [float(constant)]
+        if len(new) != n + 1:
+            raise ValueError(self.WRONG_ROW_LENGTH_MSG)
+
+        for j in range(n):
+            b = new[j]
+            if b == 0.0:
+                continue
+            row = self.rows[j]
+            a = row[j]
+            r = math.hypot(a, b)
+            c = a / r
+            s = b / r
+            for k in range(j, n + 1):
+                x, y = row[k], new[k]
+                row[k] = c * x + s * y
+                new[k] = c * y - s * x
+            new[j] = 0.0
+
+        self.residual_sum_of_squares += new[n] * new[n]
+        self.num_rows += 1
+
+    def append_rows(self, coefficients, constants):
+        for row, k in zip(coefficients, constants):
+            self.append_row(row, k)
+
+    @property
+    def rank(self):
+        scale = max([abs(row[i]) for i, row in enumerate(self.rows)] + [0.0])
+        if scale == 0.0:
+            return 0
+        return sum(1 for i, row in enumerate(self.rows) if abs(row[i]) > self.tolerance * scale)
+
+    def is_rank_deficient(self):
+        return self.rank < self.dimension
+
+    @property
+    def residual_norm(self):
+        return math.sqrt(self.residual_sum_of_squares)
+
+    # 回代 R x = (Q^T b)[:n]，得到 ||Ax - b|| 最小的解
+    def solve(self):
+        if self.is_rank_deficient():
+            raise Exception(self.RANK_DEFICIENT_MSG)
+
+        n = self.dimension
+        rows = self.rows
+        x = [0.0] * n
+        for i in range(n - 1, -1, -1):
+            row = rows[i]
+            s = row[n]
+            for k in range(i + 1, n):
+                s -= row[k] * x[k]
+            x[i] = s / row[i]
+        return Vector(x, self.backend)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+from decimal import Decimal, localcontext
+
+from vector import Vector, FRACTION, decimal_backend
+from lu import LUDecomposition
+
+
+# 混合精度求解的结果：高精度解向量、迭代次数、每次的残差无穷范数、是否达到目标精度
+class RefinedSolution(object):
+    def __init__(self, solution, iterations, residual_norms, converged):
+        self.solution = solution
+        self.iterations = iterations
+        self.residual_norms = residual_norms
+        self.converged = converged
+
+    def __str__(self):
+        return 'RefinedSolution: converged={} iterations={}'.format(self.converged, self.iterations)
+
+
+# 混合精度迭代改进：LU分解只用float64做一次，残差 r = b - Ax 和解的累加用高精度完成，
+# 每一轮用同一个float分解求修正量 d (A d = r)，x += d，直到修正量相对 x 小于 tolerance
+# tolerance 默认为 10^-(precision/2)，给病态矩阵留出有效位数
+# residual='decimal' 时在局部decimal上下文中按 precision 位计算，不修改全局上下文；
+# residual='fraction' 时残差精确计算
+# pivot_tolerance 相对于系数绝对值的最大值，病态但非奇异的矩阵也能分解
+def refine_solve(system, precision=50, residual='decimal', tolerance=None, max_iterations=20,
+                 pivot_tolerance=1e-14):
+    if residual == 'decimal':
+        backend = decimal_backend(precision)
+    elif residual == 'fraction':
+        backend = FRACTION
+    else:
+        raise ValueError('Unknown residual precision: {}'.format(residual))
+
+    n = len(system)
+    coefficients = [system.coefficient_row(i) for i in range(n)]
+    constants = [system.constant_term(i) for i in range(n)]
+
+    float_coefficients = [[float(x) for x in row] for row in coefficients]
+    scale = max(abs(x) for row in float_coefficients for x in row) or 1.0
+    float_lu = LUDecomposition(float_coefficients, tolerance=pivot_tolerance * scale)
+
+    with localcontext(backend.context) as ctx:
+        ctx.prec = precision
+        if tolerance is None:
+            tolerance = Decimal(10) ** -(precision // 2)
+
+        convert = backend.convert
+        A = [[convert(x) for x in row] for row in coefficients]
+        b = [convert(k) for k in constants]
+        tolerance = convert(tolerance)
+
+        x = [convert(v) for v in float_lu.solve([float(k) for k in constants]).coordinates]
+        residual_norms = []
+        converged = False
+        iterations = 0
+
+        for iterations in range(1, max_iterations + 1):
+            r = [bi - sum(a * xi for a, xi in zip(row, x)) for row, bi in zip(A, b)]
+            r_norm = max(abs(v) for v in r)
+            residual_norms.append(r_norm)
+            if r_norm == 0:
+                converged = True
+                break
+            # 残差不再下降说明条件数超出了float分解能改进的范围
+            if len(residual_norms) > 2 and r_norm >= residual_norms[-3]:
+                break
+
+            d = float_lu.solve([float(v) for v in r]).coordinates
+            x = [xi + convert(di) for xi, di in zip(x, d)]
+
+            x_norm = max(abs(v) for v in x)
+            d_norm = max(abs(convert(di)) for di in d)
+            if d_norm <= tolerance * x_norm:
+                converged = True
+                break
+
+        # 结果在上下文内按目标精度构造
+        solution = Vector(x, backend)
+
+    return RefinedSolution(solution, iterations, residual_norms, converged)
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+import heapq
+
+from vector import Vector, get_backend, in_backend_context
+from linsys import LinearSystem, Parametrization
+
+
+# 稀疏线性方程组：每个方程只保存非零系数 {列: 系数}，内存和时间随非零元个数增长
+class SparseLinearSystem(object):
+
+    NO_SOLUTIONS_MSG = LinearSystem.NO_SOLUTIONS_MSG
+    COLUMN_OUT_OF_RANGE_MSG = 'Column index out of range'
+
+    # 阈值主元：候选主元绝对值不小于该列最大值的 PIVOT_THRESHOLD 倍时，优先选非零元少的行
+    PIVOT_THRESHOLD = 0.1
+
+    def __init__(self, rows, constants, dimension, backend=None, tolerance=1e-10):
+        if len(rows) != len(constants):
+            raise ValueError('rows and constants must have the same length')
+
+        self.backend = get_backend(backend)
+        self.dimension = dimension
+        self.tolerance = tolerance
+
+        self.rows = []
+        self.constants = []
+        for row, constant in zip(rows, constants):
+            self.add_equation(row, constant)
+
+    # 由Plane列表或稠密的LinearSystem构造
+    @classmethod
+    def from_planes(cls, planes, tolerance=1e-10):
+        system = LinearSystem(planes)
+        return cls.from_linear_system(system, tolerance=tolerance)
+
+    @classmethod
+    def from_linear_system(cls, system, tolerance=1e-10):
+        rows = []
+        for i in range(len(system)):
+            rows.append(dict((j, x) for j, x in enumerate(system.coefficient_row(i)) if x != 0))
+        constants = [system.constant_term(i) for i in range(len(system))]
+        return cls(rows, constants, system.dimension, backend=system.backend, tolerance=tolerance)
+
+    def __len__(self):
+        return len(self.rows)
+
+    # 非零元个数
+    @property
+    def nnz(self):
+        return sum(len(r) for r in self.rows)
+
+    # 追加一个方程，row可以是 {列: 系数} 或 (列, 系数) 序列
+    def add_equation(self, row, constant):
+        convert = self.backend.convert
+        r = {}
+        for col, value in (row.items() if isinstance(row, dict) else row):
+            if not 0 <= col < self.dimension:
+                raise IndexError(self.COLUMN_OUT_OF_RANGE_MSG)
+            value = convert(value)
+            if value != 0:
+                r[col] = value
+        self.rows.append(r)
+        self.constants.append(convert(constant))
+
+    # 稀疏高斯消元：每一步选当前（随消元更新的）非零元最少的列为主元列，
+    # 再在满足阈值的行中选非零元最少的行，是Markowitz策略的简化（列计数排序）
+    # 注意：这不是最小度/AMD排序，只看单列的计数，不考虑消元造成的填充；
+    # 对带状、块状等有结构的矩阵效果好，对没有结构的随机稀疏矩阵填充会很快使矩阵变稠密，
+    # 之后每步都是Python层的稠密消元（数千阶时需要数十秒以上）
+    # 返回按消元顺序排列的 (主元列, 主元行系数dict, 常数项)，以及是否存在0=k的矛盾方程
+    @in_backend_context
+    def eliminate(self):
+        is_near_zero = self.backend.is_near_zero
+        tolerance = self.tolerance
+        threshold = self.backend.convert(self.PIVOT_THRESHOLD)
+
+        rows = [dict(r) for r in self.rows]
+        constants = list(self.constants)
+        active = set(range(len(rows)))
+
+        # 每一列出现在哪些未消元的行中
+        col_rows = {}
+        for i, r in enumerate(rows):
+            for col in r:
+                col_rows.setdefault(col, set()).add(i)
+
+        heap = [(len(s), col) for col, s in col_rows.items()]
+        heapq.heapify(heap)
+        eliminated = set()
+        pivots = []
+
+        while heap:
+            degree, col = heapq.heappop(heap)
+            if col in eliminated:
+                continue
+            candidates = col_rows.get(col)
+            if not candidates or degree != len(candidates):
+                # 过期的堆元素，度数变化时已经重新入堆
+                continue
+
+            biggest = max(abs(rows[i][col]) for i in candidates)
+            if is_near_zero(biggest, tolerance):
+                # 该列系数都接近0，直接丢弃这些元素
+                for i in candidates:
+                    del rows[i][col]
+                del col_rows[col]
+                continue
+
+            limit = biggest * threshold
+            pivot_row = min((i for i in candidates if abs(rows[i][col]) >= limit),
+                            key=lambda i: (len(rows[i]), i))
+            pr = rows[pivot_row]
+            pk = constants[pivot_row]
+            pivot = pr[col]
+
+            active.discard(pivot_row)
+            eliminated.add(col)
+            for c in pr:
+                col_rows[c].discard(pivot_row)
+
+            # 主元行所在的列度数都会变化，需要重新入堆
+            touched = set(pr)
+            for i in list(candidates):
+                r = rows[i]
+                factor = r[col] / pivot
+                for c, x in pr.items():
+                    if c == col:
+                        continue
+                    value = r.get(c, 0) - factor * x
+                    if is_near_zero(value, tolerance):
+                        if c in r:
+                            del r[c]
+                            col_rows[c].discard(i)
+                    else:
+                        if c not in r:
+                            col_rows.setdefault(c, set()).add(i)
+                        r[c] = value
+                del r[col]
+                constants[i] -= factor * pk
+
+            del col_rows[col]
+            for c in touched:
+                if c in col_rows and c not in eliminated:
+                    heapq.heappush(heap, (len(col_rows[c]), c))
+
+            pivots.append((col, pr, pk))
+
+        # 剩余的行系数全为0，常数项不为0即矛盾
+        contradictory = any(not rows[i] and not is_near_zero(constants[i], tolerance) for i in active)
+        return pivots, contradictory
+
+    @in_backend_context
+    def compute_solution(self):
+        pivots, contradictory = self.eliminate()
+        if contradictory:
+            return self.NO_SOLUTIONS_MSG
+
+        pivot_cols = set(col for col, _, _ in pivots)
+        free_vars = [c for c in range(self.dimension) if c not in pivot_cols]
+
+        basepoint = self._back_substitute(pivots, None)
+        direction_vectors = [self._back_substitute(pivots, f) for f in free_vars]
+        return Parametrization(basepoint=basepoint, direction_vectors=direction_vectors)
+
+    # 按消元的逆序回代；free_var为None时求基点（自由变量取0），否则求该自由变量对应的方向向量
+    def _back_substitute(self, pivots, free_var):
+        zero = self.backend.convert(0)
+        x = {}
+        if free_var is not None:
+            x[free_var] = self.backend.convert(1)
+
+        for col, row, k in reversed(pivots):
+            s = zero if free_var is not None else k
+            for c, a in row.items():
+                if c != col and c in x:
+                    s -= a * x[c]
+            if s != 0:
+                x[col] = s / row[col]
+
+        coords = [zero] * self.dimension
+        for c, value in x.items():
+            coords[c] = value
+        return Vector(coords, self.backend)
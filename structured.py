@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+# 按系数矩阵的结构选择求解方法：
+#   diagonal          对角阵         O(n)
+#   lower_triangular  下三角，前代   O(n^2)
+#   upper_triangular  上三角，回代   O(n^2)
+#   tridiagonal       三对角，Thomas算法 O(n)
+#   banded            带状（下带宽p，上带宽q），带内消元 O(n*p*q)
+#   general           其他情况，由调用方使用一般的消元
+# 三对角和带状消元不选主元，遇到接近0的主元时返回None，由调用方退回一般消元
+
+
+class StructureReport(object):
+    def __init__(self, kind, lower_bandwidth, upper_bandwidth, size):
+        self.kind = kind
+        self.lower_bandwidth = lower_bandwidth
+        self.upper_bandwidth = upper_bandwidth
+        self.size = size
+        # 实际使用的求解方法；结构求解失败退回一般消元时为 'rref'
+        self.solver = None
+
+    def to_dict(self):
+        return {'kind': self.kind, 'lower_bandwidth': self.lower_bandwidth,
+                'upper_bandwidth': self.upper_bandwidth, 'size': self.size, 'solver': self.solver}
+
+    def __str__(self):
+        return 'StructureReport: {} (p={}, q={}, n={}) solved by {}'.format(
+            self.kind, self.lower_bandwidth, self.upper_bandwidth, self.size, self.solver)
+
+
+# 带状求解只在带宽较小时有意义
+def _banded_is_worthwhile(p, q, n):
+    return p + q + 1 <= n // 2
+
+
+# 逐行找出首尾非零系数，得到下带宽 p 和上带宽 q
+# 非三角且带宽已经过大时提前结束扫描
+def detect_structure(system, tolerance=1e-10):
+    n = len(system)
+    d = system.dimension
+    if n != d:
+        return StructureReport('general', None, None, n)
+
+    is_near_zero = system.backend.is_near_zero
+    p = q = 0
+    for i in range(n):
+        row = system.coefficient_row(i)
+        first = 0
+        while first < i and is_near_zero(row[first], tolerance):
+            first += 1
+        last = n - 1
+        while last > i and is_near_zero(row[last], tolerance):
+            last -= 1
+        p = max(p, i - first)
+        q = max(q, last - i)
+        if p and q and not _banded_is_worthwhile(p, q, n) and (p > 1 or q > 1):
+            return StructureReport('general', None, None, n)
+
+    if p == 0 and q == 0:
+        kind = 'diagonal'
+    elif p == 0:
+        kind = 'upper_triangular'
+    elif q == 0:
+        kind = 'lower_triangular'
+    elif p == 1 and q == 1:
+        kind = 'tridiagonal'
+    elif _banded_is_worthwhile(p, q, n):
+        kind = 'banded'
+    else:
+        kind = 'general'
+    return StructureReport(kind, p, q, n)
+
+
+def solve_diagonal(system, tolerance=1e-10):
+    is_near_zero = system.backend.is_near_zero
+    x = []
+    for i in range(len(system)):
+        a = system.coefficient(i, i)
+        if is_near_zero(a, tolerance):
+            return None
+        x.append(system.constant_term(i) / a)
+    return x
+
+
+def solve_lower_triangular(system, tolerance=1e-10):
+    is_near_zero = system.backend.is_near_zero
+    n = len(system)
+    x = []
+    for i in range(n):
+        row = system.coefficient_row(i)
+        if is_near_zero(row[i], tolerance):
+            return None
+        s = system.constant_term(i)
+        for k in range(i):
+            s -= row[k] * x[k]
+        x.append(s / row[i])
+    return x
+
+
+def solve_upper_triangular(system, tolerance=1e-10):
+    is_near_zero = system.backend.is_near_zero
+    n = len(system)
+    x = [None] * n
+    for i in range(n - 1, -1, -1):
+        row = system.coefficient_row(i)
+        if is_near_zero(row[i], tolerance):
+            return None
+        s = system.constant_term(i)
+        for k in range(i + 1, n):
+            s -= row[k] * x[k]
+        x[i] = s / row[i]
+    return x
+
+
+# Thomas算法：a 为次对角线，b 为主对角线，c 为超对角线
+def solve_tridiagonal(system, tolerance=1e-10):
+    is_near_zero = system.backend.is_near_zero
+    n = len(system)
+    a = [system.coefficient(i, i - 1) if i > 0 else None for i in range(n)]
+    b = [system.coefficient(i, i) for i in range(n)]
+    c = [system.coefficient(i, i + 1) if i < n - 1 else None for i in range(n)]
+    d = [system.constant_term(i) for i in range(n)]
+
+    # 前向消元，c、d 被改写为消元后的值
+    for i in range(n):
+        if i > 0:
+            factor = a[i]
+            b[i] -= factor * c[i - 1]
+            d[i] -= factor * d[i - 1]
+        if is_near_zero(b[i], tolerance):
+            return None
+        if i < n - 1:
+            c[i] = c[i] / b[i]
+        d[i] = d[i] / b[i]
+
+    x = d
+    for i in range(n - 2, -1, -1):
+        x[i] -= c[i] * x[i + 1]
+    return x
+
+
+# 带状消元：第i行只保存第 i-p 列到 i+q 列，不选主元时消元不会产生带外的非零元
+def solve_banded(system, p, q, tolerance=1e-10):
+    is_near_zero = system.backend.is_near_zero
+    zero = system.backend.convert(0)
+    n = len(system)
+
+    # band[i][j - i + p] 对应 A[i][j]
+    band = []
+    for i in range(n):
+        row = system.coefficient_row(i)
+        lo = max(0, i - p)
+        hi = min(n, i + q + 1)
+        band.append([zero] * (lo - (i - p)) + list(row[lo:hi]) + [zero] * (i + q + 1 - hi))
+    rhs = [system.constant_term(i) for i in range(n)]
+
+    for k in range(n):
+        pivot_row = band[k]
+        pivot = pivot_row[p]
+        if is_near_zero(pivot, tolerance):
+            return None
+        for i in range(k + 1, min(n, k + p + 1)):
+            row = band[i]
+            offset = k - i + p
+            factor = row[offset] / pivot
+            if factor == 0:
+                continue
+            for j in range(1, min(q, n - 1 - k) + 1):
+                row[offset + j] -= factor * pivot_row[p + j]
+            row[offset] = zero
+            rhs[i] -= factor * rhs[k]
+
+    x = [None] * n
+    for i in range(n - 1, -1, -1):
+        row = band[i]
+        s = rhs[i]
+        for j in range(1, min(q, n - 1 - i) + 1):
+            s -= row[p + j] * x[i + j]
+        x[i] = s / row[p]
+    return x
+
+
+# 按检测到的结构求解，返回解的坐标；一般结构或遇到奇异/需要选主元的情况返回 None
+def solve_structured(system, report, tolerance=1e-10):
+    kind = report.kind
+    if kind == 'diagonal':
+        return solve_diagonal(system, tolerance)
+    if kind == 'lower_triangular':
+        return solve_lower_triangular(system, tolerance)
+    if kind == 'upper_triangular':
+        return solve_upper_triangular(system, tolerance)
+    if kind == 'tridiagonal':
+        return solve_tridiagonal(system, tolerance)
+    if kind == 'banded':
+        return solve_banded(system, report.lower_bandwidth, report.upper_bandwidth, tolerance)
+    return None
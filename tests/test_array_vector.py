@@ -0,0 +1,93 @@
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import unittest
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from linsys import LinearSystem
+from matrix_file import MappedMatrix, write_system
+from vector import Vector, ArrayVector
+
+
+class ArrayVectorTestCase(unittest.TestCase):
+    """Test for zero-copy float64 vector views"""
+
+    def assertSameVector(self, a, b):
+        self.assertIsInstance(a, ArrayVector, 'Wrong answer')
+        self.assertEqual(len(a.coordinates), len(b.coordinates), 'Wrong answer')
+        for x, y in zip(a.coordinates, b.coordinates):
+            self.assertAlmostEqual(x, y, 12, 'Wrong answer')
+
+    def test_arithmetic_matches_vector(self):
+        u, w = [1.5, -2.0, 3.25], [0.5, 4.0, -1.0]
+        a, b = ArrayVector(u), ArrayVector(w)
+        v, x = Vector(u), Vector(w)
+        self.assertSameVector(a.plus(b), v.plus(x))
+        self.assertSameVector(a.minus(b), v.minus(x))
+        self.assertSameVector(a.times_scalar(-3), v.times_scalar(-3))
+        self.assertSameVector(a.unit_xiangliang(), v.unit_xiangliang())
+        self.assertSameVector(a.touying(b), v.touying(x))
+        self.assertSameVector(a.chuizhi(b), v.chuizhi(x))
+        self.assertSameVector(a.xiangliangji(b), v.xiangliangji(x))
+        self.assertAlmostEqual(a.xiangliang_val(), v.xiangliang_val(), 12, 'Wrong answer')
+        self.assertAlmostEqual(a.xiangliang_chengfa(b), v.xiangliang_chengfa(x), 12, 'Wrong answer')
+        self.assertAlmostEqual(a.xiangliang_hudu(b), v.xiangliang_hudu(x), 12, 'Wrong answer')
+        self.assertAlmostEqual(a.sanjiaoxing_mianji(b), v.sanjiaoxing_mianji(x), 12, 'Wrong answer')
+        # 与普通 Vector 混合运算
+        self.assertSameVector(a.plus(x), v.plus(x))
+        self.assertTrue(a == v and a.pingxing(a.times_scalar(2)), 'Wrong answer')
+        self.assertEqual((a.dimension, len(a), a.backend.name), (3, 3, 'float'), 'Wrong answer')
+
+    def test_views_and_slices_share_memory(self):
+        buffer = array('d', range(6))
+        rows = ArrayVector.rows(buffer, 3)
+        tail = rows[1][1:]
+        buffer[4] = 40.0
+        self.assertEqual(rows[1].tolist(), [3.0, 40.0, 5.0], 'Wrong answer')
+        self.assertEqual(tail.tolist(), [40.0, 5.0], 'Wrong answer')
+        self.assertEqual(rows[0][::2].tolist(), [0.0, 2.0], 'Wrong answer')
+
+        # 空切片和零长度视图
+        empty = rows[0][2:1]
+        self.assertEqual((len(empty), empty.tolist()), (0, []), 'Wrong answer')
+        self.assertEqual(len(ArrayVector.view(buffer, 6, 0)), 0, 'Wrong answer')
+        self.assertEqual(len(rows[0][::-5][1:]), 0, 'Wrong answer')
+        self.assertEqual(len(pickle.loads(pickle.dumps(empty))), 0, 'Wrong answer')
+        with self.assertRaises(IndexError):
+            ArrayVector.view(buffer, 4, 3)
+
+    def test_constructor_copies(self):
+        buffer = array('d', [1, 2, 3])
+        view = ArrayVector.view(buffer)
+        for copy in (ArrayVector(view), ArrayVector(buffer), pickle.loads(pickle.dumps(view))):
+            buffer[0] = -1.0
+            self.assertEqual(view[0], -1.0, 'Wrong answer')
+            self.assertEqual(copy.tolist()[1:], [2.0, 3.0], 'Wrong answer')
+            self.assertNotEqual(copy[0], -1.0, 'Wrong answer')
+            buffer[0] = 1.0
+        with self.assertRaises(ValueError):
+            ArrayVector([])
+
+    def test_mapped_matrix_rows(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'system.bin')
+            system = LinearSystem.from_matrix([[1, 2, 3], [4, 5, 6]], [7, 8])
+            write_system(path, system)
+            with MappedMatrix(path) as m:
+                row = m.vector(1)
+                self.assertIsInstance(row, ArrayVector, 'Wrong answer')
+                self.assertEqual(row.tolist(), [4.0, 5.0, 6.0], 'Wrong answer')
+                self.assertSameVector(row.minus(m.vector(0)), Vector([3, 3, 3]))
+                self.assertAlmostEqual(row[1:].xiangliang_val(), 61 ** 0.5, 12, 'Wrong answer')
+                del row
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import sys
+import unittest
+from fractions import Fraction
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from linsys import LinearSystem
+from plane import Plane
+from vector import Vector
+from bareiss import BareissElimination
+
+
+class BareissTestCase(unittest.TestCase):
+    """Test for exact Bareiss elimination"""
+
+    def test_float_input_uses_binary_value(self):
+        # float按实际存储的二进制值精确求解
+        for value in (0.1, 0.2, 1e-300, 2.5):
+            solution = LinearSystem.from_matrix([[1]], [value]).compute_exact_solution()
+            self.assertEqual(solution.basepoint.coordinates, (Fraction(value),), 'Wrong answer')
+        solution = LinearSystem.from_matrix([[3, 0.1]], [0.7]).compute_exact_solution()
+        self.assertEqual(solution.basepoint.coordinates, (Fraction(0.7) / 3, 0), 'Wrong answer')
+        self.assertEqual([v.coordinates for v in solution.direction_vectors],
+                         [(-Fraction(0.1) / 3, 1)], 'Wrong answer')
+        self.assertEqual(BareissElimination([[1.0, 0.1]], [0.3]).row_scales, [2 ** 55], 'Wrong answer')
+
+        # 二进制下 0.1 + 0.2 != 0.3，方程组精确地无解；用字符串给出小数时有解
+        s = LinearSystem.from_matrix([[1, 0], [0, 1], [1, 1]], [0.1, 0.2, 0.3])
+        self.assertEqual(s.compute_exact_solution(), LinearSystem.NO_SOLUTIONS_MSG, 'Wrong answer')
+        s = LinearSystem.from_matrix([[1, 0], [0, 1], [1, 1]], ['0.1', '0.2', '0.3'], 'fraction')
+        self.assertEqual(s.compute_exact_solution().basepoint.coordinates, (Fraction(1, 10), Fraction(1, 5)),
+                         'Wrong answer')
+
+    def test_example_system_on_every_backend(self):
+        rows = [(['5.262', '2.739', '-9.878'], '-3.441'),
+                (['5.111', '6.358', '7.638'], '-2.152'),
+                (['2.016', '-9.924', '-1.367'], '-9.278'),
+                (['2.167', '-13.543', '-18.883'], '-10.567')]
+        expected = None
+        for backend in ('decimal', 'fraction'):
+            planes = [Plane(normal_vector=Vector(n, backend), constant_term=k, backend=backend) for n, k in rows]
+            solution = LinearSystem(planes).compute_exact_solution()
+            self.assertNotEqual(solution, LinearSystem.NO_SOLUTIONS_MSG, 'Wrong answer')
+            self.assertEqual(solution.direction_vectors, [], 'Wrong answer')
+            coords = solution.basepoint.coordinates
+            if expected is None:
+                expected = coords
+            self.assertEqual(coords, expected, 'Wrong answer')
+        self.assertEqual([round(float(x), 3) for x in expected], [-1.177, 0.707, -0.083], 'Wrong answer')
+
+        # 四个方程三个未知数，float输入的舍入使方程组精确地不相容
+        planes = [Plane(normal_vector=Vector(n), constant_term=k) for n, k in rows]
+        self.assertEqual(LinearSystem(planes).compute_exact_solution(), LinearSystem.NO_SOLUTIONS_MSG,
+                         'Wrong answer')
+
+    def test_determinant(self):
+        elimination = BareissElimination([[2, 1], [0.5, 3]])
+        self.assertEqual(elimination.determinant(), Fraction(11, 2), 'Wrong answer')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import random
+import sys
+import unittest
+from fractions import Fraction
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from basis import OrthonormalBasis
+from vector import Vector, VectorArray
+
+
+class OrthonormalBasisTestCase(unittest.TestCase):
+    """Test for Gram-Schmidt subspace bases and projections"""
+
+    def setUp(self):
+        self.rng = random.Random(666)
+
+    def assertCoordinatesEqual(self, v, expected, places=9):
+        self.assertEqual(len(v.coordinates), len(expected), 'Wrong answer')
+        for x, y in zip(v.coordinates, expected):
+            self.assertAlmostEqual(float(x), float(y), places, 'Wrong answer')
+
+    def test_rank_detection(self):
+        b = OrthonormalBasis([[1, 2, 0, 0], [2, 4, 0, 0], [0, 1, 1, 0], [1, 3, 1, 0], [0, 0, 0, 0]])
+        self.assertEqual(b.rank, 2, 'Wrong answer')
+        self.assertEqual(b.extend([[1, 0, 0, 0], [0, 0, 0, 5]]), [True, True], 'Wrong answer')
+        self.assertEqual(len(b), 4, 'Wrong answer')
+        # 满秩后任何向量都已在子空间内
+        self.assertFalse(b.append([self.rng.random() for _ in range(4)]), 'Wrong answer')
+
+        # 随机低秩向量组
+        gens = [[self.rng.gauss(0, 1) for _ in range(6)] for _ in range(3)]
+        weights = [[self.rng.gauss(0, 1) for _ in gens] for _ in range(10)]
+        combos = [[sum(w * g[k] for w, g in zip(ws, gens)) for k in range(6)] for ws in weights]
+        b = OrthonormalBasis(combos)
+        self.assertEqual(b.rank, 3, 'Wrong answer')
+        for i, p in enumerate(b.basis):
+            for j, q in enumerate(b.basis):
+                self.assertAlmostEqual(sum(x * y for x, y in zip(p, q)), float(i == j), 12, 'Wrong answer')
+
+    def test_append_vector_in_span(self):
+        b = OrthonormalBasis([[1, 0, 0], [1, 1, 0]])
+        basis = list(b.basis)
+        self.assertFalse(b.append(Vector([3, -2, 0])), 'Wrong answer')
+        self.assertFalse(b.append([0, 0, 1e-12]), 'Wrong answer')
+        self.assertEqual((b.rank, b.basis), (2, basis), 'Wrong answer')
+        self.assertTrue(b.append([1, 1, 1]), 'Wrong answer')
+        self.assertEqual(b.rank, 3, 'Wrong answer')
+        with self.assertRaises(ValueError):
+            b.append([1, 2])
+
+    def test_project(self):
+        b = OrthonormalBasis([[1, 1, 0]])
+        v = Vector([3, 1, 4])
+        self.assertCoordinatesEqual(b.project(v), [2, 2, 0])
+        self.assertCoordinatesEqual(b.reject(v), [1, -1, 4])
+        self.assertAlmostEqual(b.distance(v), (18 ** 0.5), 12, 'Wrong answer')
+        self.assertAlmostEqual(b.coefficients(v)[0], 4 / 2 ** 0.5, 12, 'Wrong answer')
+        self.assertTrue(b.contains(Vector([-2, -2, 0])), 'Wrong answer')
+        self.assertFalse(b.contains(v), 'Wrong answer')
+
+        # 平面 z=0 上的投影即去掉 z 分量；VectorArray 与逐个计算一致
+        b = OrthonormalBasis([[1, 2, 0], [2, -1, 0]])
+        vectors = [[self.rng.uniform(-5, 5) for _ in range(3)] for _ in range(8)]
+        projected = b.project(VectorArray(vectors))
+        for v, p, q in zip(vectors, projected, b.project([Vector(v) for v in vectors])):
+            self.assertCoordinatesEqual(p, [v[0], v[1], 0])
+            self.assertCoordinatesEqual(q, [v[0], v[1], 0])
+        self.assertEqual(len(b.distance(VectorArray(vectors))), 8, 'Wrong answer')
+
+    def test_fraction_backend_is_approximate(self):
+        b = OrthonormalBasis([Vector([1, 1, 0], 'fraction')])
+        p = b.project(Vector([1, 0, 0], 'fraction'))
+        self.assertIsInstance(p.coordinates[0], Fraction, 'Wrong answer')
+        # 单位化借助30位Decimal开方，结果接近但不等于 1/2
+        self.assertNotEqual(p.coordinates[0], Fraction(1, 2), 'Wrong answer')
+        self.assertTrue(abs(p.coordinates[0] - Fraction(1, 2)) < Fraction(1, 10 ** 25), 'Wrong answer')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from batch import solve_batch, iter_solve_batch, encode_system, decode_system
+from linsys import LinearSystem, Parametrization
+
+
+def random_systems(rng, count):
+    systems = []
+    for i in range(count):
+        n = rng.randint(1, 4)
+        A = [[rng.randint(-5, 5) for _ in range(n)] for _ in range(n)]
+        b = [rng.randint(-5, 5) for _ in range(n)]
+        if i % 4 == 1 and n > 1:
+            # 两个方程系数相同、常数项不同，无解
+            A[-1] = list(A[0])
+            b[-1] = b[0] + 1
+        systems.append(LinearSystem.from_matrix(A, b, ('float', 'decimal', 'fraction')[i % 3]))
+    return systems
+
+
+class SolveBatchTestCase(unittest.TestCase):
+    """Test for solving many systems in a process pool"""
+
+    def setUp(self):
+        self.systems = random_systems(random.Random(666), 40)
+        self.expected = [s.compute_solution() for s in self.systems]
+
+    def assertSameSolutions(self, results, expected):
+        self.assertEqual(len(results), len(expected), 'Wrong answer')
+        for r, e in zip(results, expected):
+            if not isinstance(e, Parametrization):
+                self.assertEqual(r, e, 'Wrong answer')
+                continue
+            self.assertIsInstance(r, Parametrization, 'Wrong answer')
+            self.assertIs(r.basepoint.backend, e.basepoint.backend, 'Wrong answer')
+            self.assertEqual(r.basepoint.coordinates, e.basepoint.coordinates, 'Wrong answer')
+            self.assertEqual([v.coordinates for v in r.direction_vectors],
+                             [v.coordinates for v in e.direction_vectors], 'Wrong answer')
+
+    def test_results_in_input_order(self):
+        self.assertIn(LinearSystem.NO_SOLUTIONS_MSG, self.expected, 'Wrong answer')
+        results = list(solve_batch(iter(self.systems), max_workers=2, chunksize=3, max_pending=2))
+        self.assertSameSolutions(results, self.expected)
+
+    def test_single_worker(self):
+        results = list(solve_batch(self.systems, max_workers=1, chunksize=7))
+        self.assertSameSolutions(results, self.expected)
+        indexed = sorted(iter_solve_batch(self.systems, max_workers=1, chunksize=5))
+        self.assertEqual([i for i, _ in indexed], list(range(len(self.systems))), 'Wrong answer')
+        self.assertEqual(list(solve_batch([], max_workers=1)), [], 'Wrong answer')
+
+    def test_encode_round_trip(self):
+        for s in self.systems[:6]:
+            t = decode_system(encode_system(s))
+            self.assertIs(t.backend, s.backend, 'Wrong answer')
+            self.assertEqual(t.matrix, s.matrix, 'Wrong answer')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'linear_algebra-master'))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    from datagen import (iter_points, iter_matrices, point_range, matrix_range, write_dataset,
+                         line_parameters, POINT_BLOCK, MATRIX_BLOCK)
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class DatagenTestCase(unittest.TestCase):
+    """Test for the chunked, reproducible dataset generator"""
+
+    def test_points_do_not_depend_on_chunking(self):
+        total = 2 * POINT_BLOCK + 123
+        expected = np.concatenate(list(iter_points(666, total, chunk_size=total)))
+        self.assertEqual(expected.shape, (total, 2), 'Wrong answer')
+        for chunk_size in (1000, POINT_BLOCK, POINT_BLOCK + 1, 7 * POINT_BLOCK):
+            points = np.concatenate(list(iter_points(666, total, chunk_size=chunk_size)))
+            self.assertTrue(np.array_equal(points, expected), 'Wrong answer')
+        self.assertTrue(np.array_equal(point_range(666, POINT_BLOCK - 5, 10),
+                                       expected[POINT_BLOCK - 5:POINT_BLOCK + 5]), 'Wrong answer')
+        self.assertFalse(np.array_equal(point_range(667, 0, 10), expected[:10]), 'Wrong answer')
+
+        # 散点在 generatePoints 的取值范围内，并落在直线附近
+        m, b = line_parameters(666)
+        self.assertTrue(-5 <= m <= 5 and 5 <= b <= 15, 'Wrong answer')
+        x, y = expected[:, 0], expected[:, 1]
+        self.assertTrue(((x >= -5) & (x < 5)).all(), 'Wrong answer')
+        self.assertTrue(abs(np.mean(y - m * x - b)) < 0.05, 'Wrong answer')
+
+    def test_matrices_do_not_depend_on_chunking(self):
+        count = MATRIX_BLOCK + 10
+        for singular in (False, True):
+            expected = np.concatenate(list(iter_matrices(1, count, 5, chunk_size=count, singular=singular)))
+            for chunk_size in (3, MATRIX_BLOCK, 50):
+                matrices = np.concatenate(list(iter_matrices(1, count, 5, chunk_size=chunk_size,
+                                                             singular=singular)))
+                self.assertTrue(np.array_equal(matrices, expected), 'Wrong answer')
+            self.assertTrue(np.array_equal(matrix_range(1, 60, 8, 5, singular), expected[60:68]),
+                            'Wrong answer')
+            self.assertTrue(((expected >= -10) & (expected < 10)).all(), 'Wrong answer')
+            ranks = [np.linalg.matrix_rank(a) for a in expected]
+            if singular:
+                self.assertTrue(all(1 <= r < 5 for r in ranks), 'Wrong answer')
+            else:
+                self.assertEqual(ranks, [5] * count, 'Wrong answer')
+
+    def test_write_dataset(self):
+        directory = tempfile.mkdtemp()
+        try:
+            paths = [os.path.join(directory, '{}.npy'.format(i)) for i in range(3)]
+            total = POINT_BLOCK + 100
+            write_dataset(paths[0], 'points', 5, total, total, workers=1)
+            write_dataset(paths[1], 'points', 5, total, 999, workers=2)
+            expected = point_range(5, 0, total)
+            for path in paths[:2]:
+                self.assertTrue(np.array_equal(np.load(path, mmap_mode='r'), expected), 'Wrong answer')
+
+            write_dataset(paths[2], 'matrices', 5, 20, 6, n=4, singular=True, workers=2)
+            self.assertTrue(np.array_equal(np.load(paths[2]), matrix_range(5, 0, 20, 4, True)), 'Wrong answer')
+            with self.assertRaises(ValueError):
+                write_dataset(paths[2], 'vectors', 5, 10, 10)
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from history import (HistoryStore, HEADER_SIZE, RECORD_SIZE, BAD_MAGIC_MSG, TRUNCATED_FILE_MSG,
+                     check_id)
+
+
+class HistoryStoreTestCase(unittest.TestCase):
+    """Test for the mmap ring-buffer history store"""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'history.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    # 打开失败时返回异常信息，并检查文件句柄没有泄漏
+    def open_error(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always', ResourceWarning)
+            try:
+                HistoryStore(self.path)
+            except ValueError as e:
+                message = str(e)
+            else:
+                message = None
+        self.assertEqual([w for w in caught if issubclass(w.category, ResourceWarning)], [], 'Wrong answer')
+        return message
+
+    def test_ring_buffer_keeps_latest_records(self):
+        with HistoryStore(self.path, capacity=4) as store:
+            for i in range(6):
+                store.append('web', i % 2 == 0, 0.01 * i, timestamp=100.0 + i)
+            self.assertEqual(len(store), 4, 'Wrong answer')
+            self.assertEqual([r[0] for r in store.records()], [102.0, 103.0, 104.0, 105.0], 'Wrong answer')
+            self.assertEqual([r[0] for r in store.records(since=103.5, until=105.0)], [104.0], 'Wrong answer')
+            self.assertEqual(store.last_status('web'), False, 'Wrong answer')
+            self.assertIsNone(store.last_status('db'), 'Wrong answer')
+
+        # 重新打开时容量和记录数以文件头为准
+        with HistoryStore(self.path, capacity=100) as store:
+            self.assertEqual((store.capacity, len(store)), (4, 4), 'Wrong answer')
+            self.assertEqual(store.last_status('web'), False, 'Wrong answer')
+            self.assertEqual({r[1] for r in store.records()}, {check_id('web')}, 'Wrong answer')
+
+    def test_summary(self):
+        with HistoryStore(self.path, capacity=16) as store:
+            for i, ok in enumerate([True, True, False, True]):
+                store.append('web', ok, 0.1 * (i + 1), timestamp=100.0 + i)
+            summary = store.summary('web', window=10, now=104.0)
+            self.assertEqual(summary['samples'], 4, 'Wrong answer')
+            self.assertEqual(summary['availability'], 0.75, 'Wrong answer')
+            self.assertEqual(summary['transitions'], 2, 'Wrong answer')
+            self.assertAlmostEqual(summary['p50'], 0.2, 6, 'Wrong answer')
+
+    def test_truncated_records(self):
+        with HistoryStore(self.path, capacity=8) as store:
+            for i in range(5):
+                store.append('web', True, 0.0, timestamp=100.0 + i)
+        with open(self.path, 'r+b') as f:
+            f.truncate(HEADER_SIZE + 3 * RECORD_SIZE)
+        self.assertEqual(self.open_error(), TRUNCATED_FILE_MSG, 'Wrong answer')
+
+    def test_truncated_header(self):
+        HistoryStore(self.path, capacity=8).close()
+        with open(self.path, 'r+b') as f:
+            f.truncate(HEADER_SIZE - 1)
+        self.assertEqual(self.open_error(), BAD_MAGIC_MSG, 'Wrong answer')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from linsys import LinearSystem
+from plane import Plane
+from vector import Vector
+
+BACKENDS = ('float', 'decimal', 'fraction')
+
+
+def random_matrix(rng, n, m=None, low=-9, high=9):
+    return [[rng.randint(low, high) for _ in range(m or n)] for _ in range(n)]
+
+
+class IncrementalRrefTestCase(unittest.TestCase):
+    """Test for incremental RREF maintained by add_equation"""
+
+    def test_add_equation_matches_batch_solution(self):
+        rng = random.Random(42)
+        for n in range(2, 6):
+            A = random_matrix(rng, n + 2, n)
+            x = [rng.randint(-5, 5) for _ in range(n)]
+            b = [sum(a * xi for a, xi in zip(row, x)) for row in A]
+            for backend in BACKENDS:
+                s = LinearSystem.from_matrix(A[:1], b[:1], backend)
+                for row, k in zip(A[1:], b[1:]):
+                    self.assertTrue(s.add_equation(Plane(normal_vector=Vector(row), constant_term=k)),
+                                    'Wrong answer')
+                incremental = s.compute_solution()
+                self.assertEqual(s.last_structure.solver, 'incremental_rref', 'Wrong answer')
+                batch = LinearSystem.from_matrix(A, b, backend).compute_solution()
+                self.assertEqual(len(incremental.direction_vectors), len(batch.direction_vectors),
+                                 'Wrong answer')
+                for u, v in zip(incremental.basepoint.coordinates, batch.basepoint.coordinates):
+                    self.assertAlmostEqual(float(u), float(v), 6, 'Wrong answer')
+
+    def test_add_equation_detects_contradiction(self):
+        for backend in BACKENDS:
+            s = LinearSystem.from_matrix([[1, 1], [1, -1]], [2, 0], backend)
+            self.assertTrue(s.is_consistent(), 'Wrong answer')
+            self.assertTrue(s.add_equation(Plane(normal_vector=Vector([2, 0]), constant_term=2)),
+                            'Wrong answer')
+            self.assertFalse(s.add_equation(Plane(normal_vector=Vector([0, 1]), constant_term=3)),
+                             'Wrong answer')
+            self.assertFalse(s.is_consistent(), 'Wrong answer')
+            self.assertEqual(len(s), 4, 'Wrong answer')
+            self.assertEqual(s.compute_solution(), LinearSystem.NO_SOLUTIONS_MSG, 'Wrong answer')
+
+    def test_row_operation_resets_maintained_rref(self):
+        s = LinearSystem.from_matrix([[1, 1], [1, -1]], [2, 0])
+        s.add_equation(Plane(normal_vector=Vector([1, 0]), constant_term=1))
+        s[2] = Plane(normal_vector=Vector([1, 0]), constant_term=5)
+        self.assertEqual(s.compute_solution(), LinearSystem.NO_SOLUTIONS_MSG, 'Wrong answer')
+
+    def test_add_equation_keeps_backends_consistent(self):
+        for backend in BACKENDS:
+            s = LinearSystem.from_matrix([[1, 2, 3]], [6], backend)
+            s.add_equation(Plane(normal_vector=Vector([0, 1, 1]), constant_term=2))
+            s.add_equation(Plane(normal_vector=Vector([1, 0, 0]), constant_term=1))
+            solution = s.compute_solution()
+            for x in solution.basepoint.coordinates:
+                self.assertAlmostEqual(float(x), 1.0, 6, 'Wrong answer')
+            self.assertEqual(solution.direction_vectors, [], 'Wrong answer')
+
+
+if __name__ == '__main__':
+    unittest.main()
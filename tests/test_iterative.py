@@ -0,0 +1,82 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from linsys import LinearSystem
+from vector import Vector
+from iterative import jacobi, gauss_seidel, conjugate_gradient, gmres
+
+
+def random_matrix(rng, n, m=None, low=-9, high=9):
+    return [[rng.randint(low, high) for _ in range(m or n)] for _ in range(n)]
+
+
+# 对角占优矩阵
+def dominant_matrix(rng, n):
+    A = random_matrix(rng, n, low=-3, high=3)
+    for i in range(n):
+        A[i][i] = sum(abs(x) for x in A[i]) + rng.randint(1, 5)
+    return A
+
+
+# 对称正定矩阵 B^T B + I
+def spd_matrix(rng, n):
+    B = random_matrix(rng, n, low=-3, high=3)
+    return [[sum(B[k][i] * B[k][j] for k in range(n)) + (i == j) for j in range(n)] for i in range(n)]
+
+
+# 精确解（fraction后端的Bareiss消元），无唯一解时返回None
+def exact_solution(A, b):
+    solution = LinearSystem.from_matrix(A, b, 'fraction').compute_exact_solution()
+    if solution == LinearSystem.NO_SOLUTIONS_MSG or solution.direction_vectors:
+        return None
+    return solution.basepoint.coordinates
+
+
+class IterativeSolverTestCase(unittest.TestCase):
+    """Test for Jacobi, Gauss-Seidel, CG and GMRES against exact solutions"""
+
+    def setUp(self):
+        self.rng = random.Random(666)
+
+    def assertVectorAlmostEqual(self, u, v, places=6):
+        u = u.coordinates if isinstance(u, Vector) else u
+        self.assertEqual(len(u), len(v), 'Wrong answer')
+        for x, y in zip(u, v):
+            self.assertAlmostEqual(float(x), float(y), places, 'Wrong answer')
+
+    def test_iterative_solvers(self):
+        for n in range(2, 8):
+            b = [self.rng.randint(-9, 9) for _ in range(n)]
+            A = dominant_matrix(self.rng, n)
+            expected = exact_solution(A, b)
+            system = LinearSystem.from_matrix(A, b)
+            for result in (jacobi(system), gauss_seidel(system), gauss_seidel(system, omega=1.2),
+                           gmres(system), gmres(system, preconditioner='ilu0', restart=2)):
+                self.assertTrue(result.converged, 'Wrong answer')
+                self.assertVectorAlmostEqual(result.solution, expected)
+
+            A = spd_matrix(self.rng, n)
+            expected = exact_solution(A, b)
+            system = LinearSystem.from_matrix(A, b)
+            for result in (conjugate_gradient(system), conjugate_gradient(system, preconditioner='jacobi')):
+                self.assertTrue(result.converged, 'Wrong answer')
+                self.assertTrue(result.iterations <= n + 1, 'Wrong answer')
+                self.assertVectorAlmostEqual(result.solution, expected)
+
+    def test_iterative_reports_residuals(self):
+        system = LinearSystem.from_matrix([[4, 1], [1, 3]], [1, 2])
+        norms = []
+        result = jacobi(system, callback=lambda it, r: norms.append(r))
+        self.assertEqual(norms, result.residual_norms, 'Wrong answer')
+        self.assertEqual(len(norms), result.iterations + 1, 'Wrong answer')
+
+        result = jacobi(system, max_iterations=2)
+        self.assertFalse(result.converged, 'Wrong answer')
+
+
+if __name__ == '__main__':
+    unittest.main()
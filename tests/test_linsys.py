@@ -0,0 +1,217 @@
+import decimal
+import os
+import random
+import sys
+import unittest
+from fractions import Fraction
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from linsys import LinearSystem, Parametrization
+from plane import Plane
+from vector import Vector, DECIMAL
+
+BACKENDS = ('float', 'decimal', 'fraction')
+
+# linsys.py 中的三个示例方程组及其参数化结果（保留3位小数）
+EXAMPLES = [
+    ([(['0.786', '0.786', '0.588'], '-0.714'),
+      (['-0.138', '-0.138', '0.244'], '0.319')],
+     [-1.326, 0.0, 0.558], [[-1.0, 1.0, 0.0]]),
+    ([(['8.631', '5.112', '-1.816'], '-5.113'),
+      (['4.315', '11.132', '-5.27'], '-6.775'),
+      (['-2.158', '3.01', '-1.727'], '-0.831')],
+     [-0.301, -0.492, 0.0], [[-0.091, 0.509, 1.0]]),
+    ([(['5.262', '2.739', '-9.878'], '-3.441'),
+      (['5.111', '6.358', '7.638'], '-2.152'),
+      (['2.016', '-9.924', '-1.367'], '-9.278'),
+      (['2.167', '-13.543', '-18.883'], '-10.567')],
+     [-1.177, 0.707, -0.083], []),
+]
+
+
+def make_system(rows, backend):
+    planes = [Plane(normal_vector=Vector(n, backend), constant_term=k, backend=backend) for n, k in rows]
+    return LinearSystem(planes)
+
+
+def rounded(v):
+    return [round(float(x), 3) + 0.0 for x in v.coordinates]
+
+
+def random_matrix(rng, n, m=None, low=-9, high=9):
+    return [[rng.randint(low, high) for _ in range(m or n)] for _ in range(n)]
+
+
+class LinearSystemTestCase(unittest.TestCase):
+    """Test for LinearSystem storage, row operations and elimination"""
+
+    def setUp(self):
+        self.rng = random.Random(666)
+
+    def test_examples_on_every_backend(self):
+        for rows, basepoint, directions in EXAMPLES:
+            for backend in BACKENDS:
+                solution = make_system(rows, backend).compute_solution()
+                self.assertIsInstance(solution, Parametrization, 'Wrong answer')
+                self.assertEqual(rounded(solution.basepoint), basepoint, 'Wrong answer')
+                self.assertEqual([rounded(v) for v in solution.direction_vectors], directions, 'Wrong answer')
+
+    def test_no_solutions(self):
+        for backend in BACKENDS:
+            s = LinearSystem.from_matrix([[1, 1, 1], [0, 1, 0], [1, 1, -1], [1, 0, -2]],
+                                         [1, 2, 3, 3], backend)
+            self.assertEqual(s.compute_solution(), LinearSystem.NO_SOLUTIONS_MSG, 'Wrong answer')
+
+    def test_from_matrix_matches_planes(self):
+        for rows, _, _ in EXAMPLES:
+            for backend in BACKENDS:
+                s = make_system(rows, backend)
+                t = LinearSystem.from_matrix([n for n, _ in rows], [k for _, k in rows], backend)
+                self.assertEqual(s.matrix, t.matrix, 'Wrong answer')
+                self.assertEqual((len(s), s.dimension), (len(t), t.dimension), 'Wrong answer')
+
+    def test_row_operations(self):
+        p0 = Plane(normal_vector=Vector(['1', '1', '1']), constant_term='1')
+        p1 = Plane(normal_vector=Vector(['0', '1', '0']), constant_term='2')
+        p2 = Plane(normal_vector=Vector(['1', '1', '-1']), constant_term='3')
+        p3 = Plane(normal_vector=Vector(['1', '0', '-2']), constant_term='2')
+        s = LinearSystem([p0, p1, p2, p3])
+
+        s.swap_rows(0, 1)
+        self.assertTrue(s[0] == p1 and s[1] == p0 and s[2] == p2 and s[3] == p3, 'Wrong answer')
+        s.swap_rows(1, 3)
+        self.assertTrue(s[0] == p1 and s[1] == p3 and s[2] == p2 and s[3] == p0, 'Wrong answer')
+        s.swap_rows(3, 1)
+        self.assertTrue(s[0] == p1 and s[1] == p0 and s[2] == p2 and s[3] == p3, 'Wrong answer')
+        s.swap_rows(-1, 3)
+        self.assertTrue(s[3] == p3, 'Wrong answer')
+
+        s.multiply_coefficient_and_row(1, 0)
+        self.assertTrue(s[0] == p1, 'Wrong answer')
+        s.multiply_coefficient_and_row(-1, 2)
+        self.assertTrue(s[2] == Plane(normal_vector=Vector(['-1', '-1', '1']), constant_term='-3'),
+                        'Wrong answer')
+        s.multiply_coefficient_and_row(10, 1)
+        self.assertTrue(s[1] == Plane(normal_vector=Vector(['10', '10', '10']), constant_term='10'),
+                        'Wrong answer')
+
+        s.add_multiple_times_row_to_row(0, 0, 1)
+        self.assertTrue(s[1] == Plane(normal_vector=Vector(['10', '10', '10']), constant_term='10'),
+                        'Wrong answer')
+        s.add_multiple_times_row_to_row(1, 0, 1)
+        self.assertTrue(s[1] == Plane(normal_vector=Vector(['10', '11', '10']), constant_term='12'),
+                        'Wrong answer')
+        s.add_multiple_times_row_to_row(-1, 1, 0)
+        self.assertTrue(s[0] == Plane(normal_vector=Vector(['-10', '-10', '-10']), constant_term='-10'),
+                        'Wrong answer')
+
+    def test_add_multiple_times_row_to_row_start_col(self):
+        for backend in BACKENDS:
+            s = LinearSystem.from_matrix([[2, 4, 6], [0, 3, 5]], [8, 7], backend)
+            t = s.copy()
+            s.add_multiple_times_row_to_row(2, 1, 0, start_col=1)
+            t.add_multiple_times_row_to_row(2, 1, 0)
+            self.assertEqual(s.matrix, t.matrix, 'Wrong answer')
+            self.assertEqual([float(x) for x in s.coefficient_row(0)], [2.0, 10.0, 16.0], 'Wrong answer')
+            self.assertEqual(float(s.constant_term(0)), 22.0, 'Wrong answer')
+
+    def test_getitem_setitem(self):
+        for backend in BACKENDS:
+            s = LinearSystem.from_matrix([[1, 2], [3, 4]], [5, 6], backend)
+            p = s[1]
+            self.assertIs(p.backend, s.backend, 'Wrong answer')
+            self.assertEqual([float(x) for x in p.normal_vector.coordinates], [3.0, 4.0], 'Wrong answer')
+            self.assertEqual(float(p.constant_term), 6.0, 'Wrong answer')
+            self.assertTrue(s[-1] == p, 'Wrong answer')
+
+            s[0] = Plane(normal_vector=Vector([7, 8]), constant_term=9)
+            self.assertEqual([float(x) for x in s.matrix], [7.0, 8.0, 9.0, 3.0, 4.0, 6.0], 'Wrong answer')
+            self.assertTrue(all(type(x) is type(s.matrix[-1]) for x in s.matrix), 'Wrong answer')
+            with self.assertRaises(Exception):
+                s[0] = Plane(normal_vector=Vector([1, 2, 3]), constant_term=4)
+            with self.assertRaises(IndexError):
+                s[2]
+
+    def test_copy_is_independent(self):
+        s = LinearSystem.from_matrix([[1, 2], [3, 4]], [5, 6])
+        t = s.copy()
+        t.swap_rows(0, 1)
+        t.multiply_coefficient_and_row(2, 0)
+        self.assertEqual(s.matrix, [1.0, 2.0, 5.0, 3.0, 4.0, 6.0], 'Wrong answer')
+        self.assertEqual(t.matrix, [6.0, 8.0, 12.0, 1.0, 2.0, 5.0], 'Wrong answer')
+
+    def test_compute_rref(self):
+        s = LinearSystem.from_matrix([[1, 1, 1], [0, 1, 0], [1, 1, -1], [1, 0, -2]], [1, 2, 3, 2],
+                                     'fraction')
+        r = s.compute_rref()
+        self.assertEqual(r.matrix, [1, 0, 0, 0, 0, 1, 0, 2, 0, 0, 1, -1, 0, 0, 0, 0], 'Wrong answer')
+        self.assertEqual(s.matrix[:4], [1, 1, 1, 1], 'Wrong answer')
+
+    def test_random_systems_match_exact_solution(self):
+        for n in range(1, 7):
+            for _ in range(5):
+                A = random_matrix(self.rng, n)
+                b = [self.rng.randint(-9, 9) for _ in range(n)]
+                exact = LinearSystem.from_matrix(A, b, 'fraction').compute_exact_solution()
+                for backend in BACKENDS:
+                    solution = LinearSystem.from_matrix(A, b, backend).compute_solution()
+                    if exact == LinearSystem.NO_SOLUTIONS_MSG:
+                        self.assertEqual(solution, exact, 'Wrong answer')
+                        continue
+                    self.assertEqual(len(solution.direction_vectors), len(exact.direction_vectors),
+                                     'Wrong answer')
+                    for x, y in zip(solution.basepoint.coordinates, exact.basepoint.coordinates):
+                        self.assertAlmostEqual(float(x), float(y), 6, 'Wrong answer')
+
+    def test_singular_random_systems(self):
+        for n in range(2, 6):
+            A = random_matrix(self.rng, n)
+            A[-1] = [x + 2 * y for x, y in zip(A[0], A[1 % (n - 1)])]
+            x = [self.rng.randint(-5, 5) for _ in range(n)]
+            b = [sum(a * xi for a, xi in zip(row, x)) for row in A]
+            for backend in BACKENDS:
+                s = LinearSystem.from_matrix(A, b, backend)
+                solution = s.compute_solution()
+                self.assertIsInstance(solution, Parametrization, 'Wrong answer')
+                self.assertTrue(len(solution.direction_vectors) >= 1, 'Wrong answer')
+                # 解集中任取一点都满足方程组
+                point = solution.evaluate([Fraction(1, 3)] * solution.num_parameters)
+                for i in range(n):
+                    lhs = sum(float(a) * float(p) for a, p in zip(s.coefficient_row(i), point.coordinates))
+                    self.assertAlmostEqual(lhs, float(b[i]), 6, 'Wrong answer')
+
+
+class DecimalBackendTestCase(unittest.TestCase):
+    """Test for the decimal backend's own precision"""
+
+    def test_global_context_is_untouched(self):
+        self.assertEqual(decimal.getcontext().prec, decimal.DefaultContext.prec, 'Wrong answer')
+
+    def test_precision_does_not_follow_caller_context(self):
+        A = [[Fraction(1, i + j + 1) for j in range(3)] for i in range(3)]
+        b = [1, 0, 0]
+        exact = LinearSystem.from_matrix(A, b, 'fraction').compute_exact_solution().basepoint.coordinates
+        with decimal.localcontext() as ctx:
+            ctx.prec = 6
+            solution = LinearSystem.from_matrix(A, b, 'decimal').compute_solution()
+            self.assertEqual(ctx.prec, 6, 'Wrong answer')
+        for x, y in zip(solution.basepoint.coordinates, exact):
+            self.assertTrue(abs(Fraction(x) - y) < Fraction(1, 10 ** 20), 'Wrong answer')
+        self.assertEqual(len(str(DECIMAL.convert(Fraction(1, 3)))), 32, 'Wrong answer')
+
+    def test_vector_and_plane_use_backend_precision(self):
+        with decimal.localcontext() as ctx:
+            ctx.prec = 6
+            v = Vector([1, 2, 2], 'decimal')
+            third = v.times_scalar(Fraction(1, 3)).coordinates[0]
+            unit = v.unit_xiangliang().coordinates[0]
+            basepoint = Plane(normal_vector=Vector([3, 0, 0], 'decimal'), constant_term=1).basepoint
+            total = v.plus(Vector(['1e-20', 0, 0], 'decimal')).coordinates[0]
+        for x in (third, unit, basepoint.coordinates[0]):
+            self.assertTrue(abs(Fraction(x) - Fraction(1, 3)) < Fraction(1, 10 ** 25), 'Wrong answer')
+        self.assertEqual(total, decimal.Decimal('1.00000000000000000001'), 'Wrong answer')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from linsys import LinearSystem
+from vector import Vector
+from lu import LUDecomposition
+
+BACKENDS = ('float', 'decimal', 'fraction')
+
+
+def random_matrix(rng, n, m=None, low=-9, high=9):
+    return [[rng.randint(low, high) for _ in range(m or n)] for _ in range(n)]
+
+
+# 精确解（fraction后端的Bareiss消元），无唯一解时返回None
+def exact_solution(A, b):
+    solution = LinearSystem.from_matrix(A, b, 'fraction').compute_exact_solution()
+    if solution == LinearSystem.NO_SOLUTIONS_MSG or solution.direction_vectors:
+        return None
+    return solution.basepoint.coordinates
+
+
+class LUDecompositionTestCase(unittest.TestCase):
+    """Test for PA = LU factorization against exact solutions"""
+
+    def setUp(self):
+        self.rng = random.Random(666)
+
+    def assertVectorAlmostEqual(self, u, v, places=6):
+        u = u.coordinates if isinstance(u, Vector) else u
+        self.assertEqual(len(u), len(v), 'Wrong answer')
+        for x, y in zip(u, v):
+            self.assertAlmostEqual(float(x), float(y), places, 'Wrong answer')
+
+    def test_lu_solve_and_determinant(self):
+        for n in range(1, 7):
+            A = random_matrix(self.rng, n)
+            B = [[self.rng.randint(-9, 9) for _ in range(n)] for _ in range(3)]
+            exact = [exact_solution(A, b) for b in B]
+            det = LinearSystem.from_matrix(A, B[0], 'fraction').bareiss().determinant()
+            for backend in BACKENDS:
+                lu = LUDecomposition(A, backend=backend)
+                self.assertAlmostEqual(float(lu.determinant()), float(det), 6, 'Wrong answer')
+                if det == 0:
+                    self.assertTrue(lu.is_singular(), 'Wrong answer')
+                    continue
+                self.assertEqual(lu.rank, n, 'Wrong answer')
+                for x, y in zip(lu.solve_many(B), exact):
+                    self.assertVectorAlmostEqual(x, y)
+
+    def test_lu_rank_of_singular_matrix(self):
+        A = [[1, 2, 3], [2, 4, 6], [1, 0, 1]]
+        for backend in BACKENDS:
+            lu = LinearSystem.from_matrix(A, [0, 0, 0], backend).lu()
+            self.assertEqual(lu.rank, 2, 'Wrong answer')
+            self.assertTrue(lu.is_singular(), 'Wrong answer')
+            with self.assertRaises(Exception):
+                lu.solve([1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
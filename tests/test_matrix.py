@@ -0,0 +1,70 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'linear_algebra-master'))
+
+import matrix
+from matrix import shape, transpose, augmentMatrix, matxMultiply
+
+
+# 朴素三重循环，按 k 从小到大累加
+def naive_multiply(A, B):
+    return [[sum(A[i][k] * B[k][j] for k in range(len(B))) for j in range(len(B[0]))]
+            for i in range(len(A))]
+
+
+class MatrixTestCase(unittest.TestCase):
+    """Test for the importable matrix helpers"""
+
+    def setUp(self):
+        self.rng = random.Random(666)
+
+    def random_matrix(self, r, c, integer=False):
+        if integer:
+            return [[self.rng.randint(-10, 10) for _ in range(c)] for _ in range(r)]
+        return [[self.rng.uniform(-10, 10) for _ in range(c)] for _ in range(r)]
+
+    def test_shape_transpose_augment(self):
+        A = self.random_matrix(3, 5)
+        self.assertEqual(shape(A), (3, 5), 'Wrong answer')
+        t = transpose(A)
+        self.assertEqual(shape(t), (5, 3), 'Wrong answer')
+        self.assertTrue(all(t[j][i] == A[i][j] for i in range(3) for j in range(5)), 'Wrong answer')
+        self.assertEqual(transpose(t), A, 'Wrong answer')
+
+        before = [list(row) for row in A]
+        Ab = augmentMatrix(A, [[1], [2], [3]])
+        self.assertEqual(A, before, "Matrix A shouldn't be modified.")
+        self.assertEqual([row[-1] for row in Ab], [1, 2, 3], 'Wrong answer')
+        self.assertEqual([row[:-1] for row in Ab], A, 'Wrong answer')
+
+    def test_tiled_multiply_matches_naive_bitwise(self):
+        for r, d, c in ((1, 1, 1), (7, 3, 11), (70, 65, 130), (2, 64, 1)):
+            A, B = self.random_matrix(r, d), self.random_matrix(d, c)
+            self.assertEqual(matxMultiply(A, B), naive_multiply(A, B), 'Wrong answer')
+            # 块大小不整除行数、列数时
+            self.assertEqual(matrix._tiled_multiply(A, B, tile=4), naive_multiply(A, B), 'Wrong answer')
+        with self.assertRaises(ValueError):
+            matxMultiply(self.random_matrix(2, 3), self.random_matrix(2, 3))
+
+    def test_strassen_matches_naive(self):
+        threshold, leaf = matrix.STRASSEN_THRESHOLD, matrix.STRASSEN_LEAF
+        matrix.STRASSEN_THRESHOLD, matrix.STRASSEN_LEAF = 8, 4
+        try:
+            for n in (8, 9, 16, 23):
+                A, B = self.random_matrix(n, n, True), self.random_matrix(n, n, True)
+                self.assertEqual(matrix._strassen(A, B), naive_multiply(A, B), 'Wrong answer')
+                self.assertEqual(matxMultiply(A, B), naive_multiply(A, B), 'Wrong answer')
+            # 含float或bool时不走 Strassen，结果仍正确
+            A, B = self.random_matrix(9, 9, True), self.random_matrix(9, 9)
+            A[0][0] = True
+            self.assertEqual(matxMultiply(A, B), naive_multiply(A, B), 'Wrong answer')
+            self.assertFalse(matrix._all_int(A), 'Wrong answer')
+        finally:
+            matrix.STRASSEN_THRESHOLD, matrix.STRASSEN_LEAF = threshold, leaf
+
+
+if __name__ == '__main__':
+    unittest.main()
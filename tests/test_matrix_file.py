@@ -0,0 +1,68 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from linsys import LinearSystem
+from matrix_file import (MappedMatrix, write_system, HEADER_SIZE, BAD_MAGIC_MSG, TRUNCATED_FILE_MSG)
+
+
+class MappedMatrixTestCase(unittest.TestCase):
+    """Test for the memory-mapped binary matrix file"""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'system.bin')
+        self.system = LinearSystem.from_matrix([[1, 2, 3], [4, 5, 6], [7, 8, 10]], [1, 2, 3])
+        write_system(self.path, self.system)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    # 打开失败时返回异常信息，并检查文件句柄没有泄漏
+    def open_error(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always', ResourceWarning)
+            try:
+                MappedMatrix(self.path)
+            except ValueError as e:
+                message = str(e)
+            else:
+                message = None
+        self.assertEqual([w for w in caught if issubclass(w.category, ResourceWarning)], [], 'Wrong answer')
+        return message
+
+    def truncate(self, size):
+        with open(self.path, 'r+b') as f:
+            f.truncate(size)
+
+    def test_round_trip(self):
+        with MappedMatrix(self.path) as m:
+            self.assertEqual((len(m), m.dimension), (3, 3), 'Wrong answer')
+            self.assertEqual(m.to_linear_system().matrix, self.system.matrix, 'Wrong answer')
+            self.assertEqual(m.matvec([1, 1, 1]), [6.0, 15.0, 25.0], 'Wrong answer')
+
+    def test_truncated_data(self):
+        self.truncate(os.path.getsize(self.path) - 8)
+        self.assertEqual(self.open_error(), TRUNCATED_FILE_MSG, 'Wrong answer')
+        self.truncate(HEADER_SIZE)
+        self.assertEqual(self.open_error(), TRUNCATED_FILE_MSG, 'Wrong answer')
+
+    def test_truncated_header(self):
+        for size in (HEADER_SIZE - 1, 4, 0):
+            self.truncate(size)
+            self.assertEqual(self.open_error(), BAD_MAGIC_MSG, 'Wrong answer')
+
+    def test_bad_dtype(self):
+        with open(self.path, 'r+b') as f:
+            f.seek(6)
+            f.write(b'\xff')
+        self.assertIsNotNone(self.open_error(), 'Wrong answer')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,259 @@
+import asyncio
+import http.client
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from monitor import Check, HttpClient, Monitor, SmsAlerter, TcpCheck
+from history import HistoryStore
+
+
+# 本地短信接口桩：记录收到的表单和客户端连接，statuses 中的状态码依次返回，用完后返回200
+class StubSmsServer(object):
+
+    def __init__(self, statuses=()):
+        self.requests = []
+        self.connections = set()
+        self.statuses = list(statuses)
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                length = int(self.headers['Content-Length'])
+                stub.requests.append(parse_qs(self.rfile.read(length).decode('utf-8')))
+                stub.connections.add(self.client_address)
+                status = stub.statuses.pop(0) if stub.statuses else 200
+                self.send_response(status)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:{}/sms'.format(self.server.server_port)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def messages(self):
+        return [r['message'][0] for r in self.requests]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# 对任何请求都回复非HTTP内容的服务器
+class GarbageServer(object):
+
+    def __init__(self):
+        self.sock = socket.socket()
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(5)
+        self.url = 'http://127.0.0.1:{}/sms'.format(self.sock.getsockname()[1])
+        self.requests = 0
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            conn.recv(65536)
+            self.requests += 1
+            conn.sendall(b'GARBAGE\r\n\r\n')
+            conn.close()
+
+    def close(self):
+        self.sock.close()
+
+
+class FailingCheck(Check):
+    async def probe(self):
+        return False, 'down'
+
+
+# 延迟 delay 秒后返回正常
+class SlowCheck(Check):
+    def __init__(self, name, delay):
+        Check.__init__(self, name)
+        self.delay = delay
+
+    async def probe(self):
+        await asyncio.sleep(self.delay)
+        return True, ''
+
+
+class MonitorTestCase(unittest.TestCase):
+    """Test for the monitor against a local stub SMS server"""
+
+    def setUp(self):
+        self.client = HttpClient()
+
+    def tearDown(self):
+        self.client.close()
+
+    def _alerter(self, url, **kwargs):
+        return SmsAlerter(url, 'u', 'p', ['13900000058'], client=self.client, **kwargs)
+
+    def test_batching_over_one_connection(self):
+        stub = StubSmsServer()
+        try:
+            async def scenario():
+                alerter = self._alerter(stub.url)
+                for name in ('a', 'b', 'c'):
+                    alerter.alert(name)
+                self.assertTrue(await alerter.flush())
+                alerter.alert('d')
+                self.assertTrue(await alerter.flush())
+                return alerter
+            alerter = asyncio.run(scenario())
+            self.assertEqual(stub.messages(), ['a;b;c', 'd'], 'Wrong answer')
+            self.assertEqual(len(stub.connections), 1, 'Wrong answer')
+            self.assertEqual(alerter.sent, 2, 'Wrong answer')
+            self.assertEqual(stub.requests[0]['mobiles'], ['13900000058'], 'Wrong answer')
+        finally:
+            stub.close()
+
+    def test_rate_limit_keeps_messages_queued(self):
+        stub = StubSmsServer()
+        try:
+            async def scenario():
+                alerter = self._alerter(stub.url, max_per_window=2)
+                results = []
+                for i in range(3):
+                    alerter.alert('m{}'.format(i))
+                    results.append(await alerter.flush())
+                return alerter, results
+            alerter, results = asyncio.run(scenario())
+            self.assertEqual(results, [True, True, False], 'Wrong answer')
+            self.assertEqual(alerter.pending, ['m2'], 'Wrong answer')
+            self.assertEqual(stub.messages(), ['m0', 'm1'], 'Wrong answer')
+        finally:
+            stub.close()
+
+    def test_server_error_is_retried(self):
+        stub = StubSmsServer(statuses=[500])
+        try:
+            async def scenario():
+                alerter = self._alerter(stub.url)
+                alerter.alert('x')
+                first = await alerter.flush()
+                second = await alerter.flush()
+                return alerter, first, second
+            alerter, first, second = asyncio.run(scenario())
+            self.assertEqual((first, second), (False, True), 'Wrong answer')
+            self.assertEqual(alerter.failed, 1, 'Wrong answer')
+            self.assertEqual(stub.messages(), ['x', 'x'], 'Wrong answer')
+        finally:
+            stub.close()
+
+    def test_malformed_reply_keeps_messages_and_sender_alive(self):
+        garbage = GarbageServer()
+        try:
+            async def scenario():
+                alerter = self._alerter(garbage.url, batch_interval=0.01)
+                alerter.alert('x')
+                self.assertFalse(await alerter.flush())
+                self.assertEqual(alerter.pending, ['x'], 'Wrong answer')
+
+                task = asyncio.ensure_future(alerter.run())
+                alerter.alert('y')
+                await asyncio.sleep(0.2)
+                done = task.done()
+                task.cancel()
+                return alerter, done
+            alerter, done = asyncio.run(scenario())
+            self.assertFalse(done, 'sender task stopped')
+            self.assertEqual(alerter.sent, 0, 'Wrong answer')
+            self.assertEqual(alerter.pending[:2], ['x', 'y'], 'Wrong answer')
+        finally:
+            garbage.close()
+
+    def test_monitor_alerts_through_stub(self):
+        stub = StubSmsServer()
+        try:
+            async def scenario():
+                alerter = self._alerter(stub.url)
+                monitor = Monitor([FailingCheck('apache'), FailingCheck('mysql')], alerter)
+                results = await monitor.run_once()
+                await alerter.flush()
+                return results
+            results = asyncio.run(scenario())
+            self.assertEqual([r.ok for r in results], [False, False], 'Wrong answer')
+            self.assertEqual(len(stub.messages()), 1, 'Wrong answer')
+            message = stub.messages()[0]
+            self.assertIn('apache_error_at_', message)
+            self.assertIn('mysql_error_at_', message)
+        finally:
+            stub.close()
+
+    def test_history_is_time_ordered(self):
+        directory = tempfile.mkdtemp()
+        try:
+            history = HistoryStore(os.path.join(directory, 'history.bin'), capacity=16)
+            # 配置中靠前的检查完成得更晚
+            monitor = Monitor([SlowCheck('slow', 0.05), SlowCheck('fast', 0)], history=history)
+
+            async def scenario():
+                for _ in range(3):
+                    await monitor.run_once()
+            asyncio.run(scenario())
+
+            timestamps = [r[0] for r in history.records()]
+            self.assertEqual(len(timestamps), 6, 'Wrong answer')
+            self.assertEqual(timestamps, sorted(timestamps), 'Wrong answer')
+            # 每一轮的两条记录时间相同，按时间查询时不会漏掉或多出记录
+            for i in range(0, 6, 2):
+                self.assertEqual(timestamps[i], timestamps[i + 1], 'Wrong answer')
+                window = list(history.records(since=timestamps[i]))
+                self.assertEqual(len(window), 6 - i, 'Wrong answer')
+            history.close()
+        finally:
+            shutil.rmtree(directory)
+
+    def test_broken_check_does_not_abort_round(self):
+        directory = tempfile.mkdtemp()
+        try:
+            history = HistoryStore(os.path.join(directory, 'history.bin'), capacity=16)
+            checks = [TcpCheck('long_label', 'a' * 64 + '.example', 80),
+                      TcpCheck('bad_port', '127.0.0.1', 70000),
+                      SlowCheck('fine', 0)]
+            monitor = Monitor(checks, history=history)
+            results = asyncio.run(monitor.run_once())
+            self.assertEqual([r.ok for r in results], [False, False, True], 'Wrong answer')
+            self.assertIn('Error', results[0].detail)
+            self.assertEqual(len(history), 3, 'Wrong answer')
+            self.assertEqual(history.last_status('bad_port'), False, 'Wrong answer')
+            history.close()
+        finally:
+            shutil.rmtree(directory)
+
+    def test_post_is_not_retried(self):
+        garbage = GarbageServer()
+        try:
+            with self.assertRaises(http.client.HTTPException):
+                self.client._request('POST', garbage.url, 'a=1', {})
+            self.assertEqual(garbage.requests, 1, 'Wrong answer')
+            with self.assertRaises(http.client.HTTPException):
+                self.client._request('GET', garbage.url, None, {})
+            self.assertEqual(garbage.requests, 3, 'Wrong answer')
+        finally:
+            garbage.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import sys
+import unittest
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from linsys import LinearSystem, Parametrization
+from vector import Vector, VectorArray
+
+
+def line(backend='float'):
+    # 过 (1, 0, 0)、方向 (0, 2, 0) 的直线
+    return Parametrization(Vector([1, 0, 0], backend), [Vector([0, 2, 0], backend)])
+
+
+class ParametrizationTestCase(unittest.TestCase):
+    """Test for evaluating, sampling and measuring against solution sets"""
+
+    def assertCoordinatesEqual(self, v, expected):
+        self.assertEqual(len(v.coordinates), len(expected), 'Wrong answer')
+        for x, y in zip(v.coordinates, expected):
+            self.assertAlmostEqual(float(x), float(y), 9, 'Wrong answer')
+
+    def test_evaluate_batch_matches_evaluate(self):
+        s = LinearSystem.from_matrix([[1, 1, 1, 1], [0, 1, -1, 2]], [4, 1])
+        p = s.compute_solution()
+        params = [(0, 0), (1, -2), (0.5, 3.25), (-4, 1)]
+        batch = p.evaluate_batch(params)
+        self.assertIsInstance(batch, VectorArray, 'Wrong answer')
+        for t, v in zip(params, batch):
+            self.assertCoordinatesEqual(v, p.evaluate(t).coordinates)
+        self.assertEqual(len(p.evaluate_batch([])), 0, 'Wrong answer')
+        with self.assertRaises(ValueError):
+            p.evaluate_batch([(1,)])
+        with self.assertRaises(ValueError):
+            p.evaluate([1, 2, 3])
+
+    def test_sample(self):
+        p = line()
+        points = list(p.sample(5, scale=2.0, seed=7))
+        self.assertEqual(len(points), 5, 'Wrong answer')
+        self.assertEqual([v.coordinates for v in p.sample(5, scale=2.0, seed=7)],
+                         [v.coordinates for v in points], 'Wrong answer')
+        for v in points:
+            self.assertEqual((v.coordinates[0], v.coordinates[2]), (1.0, 0.0), 'Wrong answer')
+            self.assertTrue(abs(v.coordinates[1]) <= 4.0, 'Wrong answer')
+            self.assertTrue(p.contains(v), 'Wrong answer')
+
+    def test_distance_and_project(self):
+        p = line()
+        # (4, 5, -4) 到直线 x=1, z=0 的距离为 sqrt(3^2 + 4^2) = 5，最近点为 (1, 5, 0)
+        for point in (Vector([4, 5, -4]), (4, 5, -4), [4, 5, -4], [Decimal(4), 5, -4]):
+            self.assertAlmostEqual(p.distance(point), 5.0, 12, 'Wrong answer')
+            self.assertCoordinatesEqual(p.project(point), [1, 5, 0])
+            self.assertFalse(p.contains(point), 'Wrong answer')
+        self.assertTrue(p.contains((1, -3.5, 0)), 'Wrong answer')
+
+        points = [(4, 5, -4), Vector([1, 2, 0]), [0, 0, 0]]
+        self.assertEqual([round(d, 12) for d in p.distance(points)], [5.0, 0.0, 1.0], 'Wrong answer')
+        self.assertEqual(p.contains(points), [False, True, False], 'Wrong answer')
+        self.assertCoordinatesEqual(p.project(points)[2], [1, 0, 0])
+
+        batch = VectorArray(points)
+        self.assertEqual([round(d, 12) for d in p.distance(batch)], [5.0, 0.0, 1.0], 'Wrong answer')
+        self.assertEqual(p.contains(batch), [False, True, False], 'Wrong answer')
+        self.assertCoordinatesEqual(p.project(batch)[0], [1, 5, 0])
+
+    def test_unique_solution_and_decimal_backend(self):
+        # 没有方向向量时，距离就是到 basepoint 的距离
+        p = Parametrization(Vector([1, 2]), [])
+        self.assertAlmostEqual(p.distance((4, 6)), 5.0, 12, 'Wrong answer')
+        self.assertCoordinatesEqual(p.project((4, 6)), [1, 2])
+
+        p = line('decimal')
+        self.assertIsInstance(p.distance((4, 5, -4)), Decimal, 'Wrong answer')
+        self.assertCoordinatesEqual(p.project(Vector([4, 5, -4])), [1, 5, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
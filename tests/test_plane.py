@@ -0,0 +1,49 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from linsys import LinearSystem
+from plane import Plane, group_planes
+from vector import Vector
+
+
+def plane(n, k):
+    return Plane(normal_vector=Vector(n), constant_term=k)
+
+
+class GroupPlanesTestCase(unittest.TestCase):
+    """Test for hashing planes into parallel and coincident classes"""
+
+    def test_parallel_and_coincident(self):
+        planes = [plane([1, 2, 3], 4), plane([-2, -4, -6], -8), plane([1, 2, 3], 5),
+                  plane([0, 1, 0], 1), plane([0, 0, 0], 0)]
+        parallel, coincident = group_planes(planes)
+        self.assertEqual(parallel, [[0, 1, 2], [3], [4]], 'Wrong answer')
+        self.assertEqual(coincident, [[0, 1], [2], [3], [4]], 'Wrong answer')
+
+    def test_planes_on_cell_boundary(self):
+        # 法向量第二个分量落在量化格子边界（0.5 * tolerance）两侧
+        a = plane([1, 5e-7 + 1e-12, 0], 1)
+        b = plane([1, 5e-7 - 1e-12, 0], 1)
+        c = plane([1, 5e-7 - 1e-12, 0], 1 + 5e-7 + 1e-12)
+        d = plane([1, 5e-7 - 1e-12, 0], 1 + 5e-7 - 1e-12)
+        parallel, coincident = group_planes([a, b, c, d])
+        self.assertEqual(parallel, [[0, 1, 2, 3]], 'Wrong answer')
+        self.assertEqual(coincident, [[0, 1], [2, 3]], 'Wrong answer')
+
+        s = LinearSystem([a, b, c, d, plane([0, 0, 0], 0)])
+        self.assertEqual(len(s.drop_redundant_equations()), 2, 'Wrong answer')
+
+    def test_distinct_planes_stay_apart(self):
+        # 相差超过容差的平面即使在相邻格子里也不合并
+        a = plane([1, 0, 0], 1)
+        b = plane([1, 0, 0], 1 + 1.5e-6)
+        parallel, coincident = group_planes([a, b])
+        self.assertEqual(coincident, [[0], [1]], 'Wrong answer')
+        self.assertEqual(len(LinearSystem([a, b]).drop_redundant_equations()), 2, 'Wrong answer')
+
+
+if __name__ == '__main__':
+    unittest.main()
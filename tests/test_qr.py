@@ -0,0 +1,73 @@
+import math
+import os
+import random
+import sys
+import unittest
+from fractions import Fraction
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from linsys import LinearSystem
+from vector import Vector
+from qr import QRLeastSquares
+
+
+def random_matrix(rng, n, m=None, low=-9, high=9):
+    return [[rng.randint(low, high) for _ in range(m or n)] for _ in range(n)]
+
+
+# 精确解（fraction后端的Bareiss消元），无唯一解时返回None
+def exact_solution(A, b):
+    solution = LinearSystem.from_matrix(A, b, 'fraction').compute_exact_solution()
+    if solution == LinearSystem.NO_SOLUTIONS_MSG or solution.direction_vectors:
+        return None
+    return solution.basepoint.coordinates
+
+
+class QRLeastSquaresTestCase(unittest.TestCase):
+    """Test for Householder QR least squares against the exact normal equations"""
+
+    def setUp(self):
+        self.rng = random.Random(666)
+
+    def assertVectorAlmostEqual(self, u, v, places=6):
+        u = u.coordinates if isinstance(u, Vector) else u
+        self.assertEqual(len(u), len(v), 'Wrong answer')
+        for x, y in zip(u, v):
+            self.assertAlmostEqual(float(x), float(y), places, 'Wrong answer')
+
+    def test_qr_least_squares(self):
+        for n in range(1, 5):
+            m = n + 3
+            A = random_matrix(self.rng, m, n)
+            b = [self.rng.randint(-9, 9) for _ in range(m)]
+            # 正规方程 A^T A x = A^T b 的精确解
+            AtA = [[sum(A[k][i] * A[k][j] for k in range(m)) for j in range(n)] for i in range(n)]
+            Atb = [sum(A[k][i] * b[k] for k in range(m)) for i in range(n)]
+            expected = exact_solution(AtA, Atb)
+            if expected is None:
+                continue
+            residual = math.sqrt(sum(float(sum(Fraction(a) * x for a, x in zip(row, expected)) - k) ** 2
+                                     for row, k in zip(A, b)))
+
+            x, norm = LinearSystem.from_matrix(A, b).compute_least_squares_solution()
+            self.assertVectorAlmostEqual(x, expected)
+            self.assertAlmostEqual(norm, residual, 6, 'Wrong answer')
+
+            # 先分解前n行，再逐行追加，结果相同
+            qr = QRLeastSquares(A[:n], b[:n])
+            for row, k in zip(A[n:], b[n:]):
+                qr.append_row(row, k)
+            self.assertEqual(qr.num_rows, m, 'Wrong answer')
+            self.assertVectorAlmostEqual(qr.solve(), expected)
+            self.assertAlmostEqual(qr.residual_norm, residual, 6, 'Wrong answer')
+
+    def test_qr_rank_deficient(self):
+        qr = QRLeastSquares([[1, 2], [2, 4], [3, 6]], [1, 2, 3])
+        self.assertTrue(qr.is_rank_deficient(), 'Wrong answer')
+        with self.assertRaises(Exception):
+            qr.solve()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import random
+import sys
+import unittest
+from fractions import Fraction
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from linsys import LinearSystem
+from vector import Vector
+
+
+def random_matrix(rng, n, m=None, low=-9, high=9):
+    return [[rng.randint(low, high) for _ in range(m or n)] for _ in range(n)]
+
+
+# 精确解（fraction后端的Bareiss消元），无唯一解时返回None
+def exact_solution(A, b):
+    solution = LinearSystem.from_matrix(A, b, 'fraction').compute_exact_solution()
+    if solution == LinearSystem.NO_SOLUTIONS_MSG or solution.direction_vectors:
+        return None
+    return solution.basepoint.coordinates
+
+
+class RefinementTestCase(unittest.TestCase):
+    """Test for mixed-precision iterative refinement"""
+
+    def setUp(self):
+        self.rng = random.Random(666)
+
+    def assertVectorAlmostEqual(self, u, v, places=6):
+        u = u.coordinates if isinstance(u, Vector) else u
+        self.assertEqual(len(u), len(v), 'Wrong answer')
+        for x, y in zip(u, v):
+            self.assertAlmostEqual(float(x), float(y), places, 'Wrong answer')
+
+    def test_refined_solution_of_hilbert_matrix(self):
+        n = 8
+        A = [[Fraction(1, i + j + 1) for j in range(n)] for i in range(n)]
+        b = [sum(row) for row in A]
+        system = LinearSystem.from_matrix(A, b, 'fraction')
+        for residual in ('decimal', 'fraction'):
+            result = system.compute_refined_solution(residual=residual)
+            self.assertTrue(result.converged, 'Wrong answer')
+            for x in result.solution.coordinates:
+                self.assertAlmostEqual(float(x), 1.0, 12, 'Wrong answer')
+
+    def test_refined_solution_matches_exact(self):
+        for n in range(2, 6):
+            A = random_matrix(self.rng, n)
+            b = [self.rng.randint(-9, 9) for _ in range(n)]
+            expected = exact_solution(A, b)
+            if expected is None:
+                continue
+            result = LinearSystem.from_matrix(A, b).compute_refined_solution(residual='fraction')
+            self.assertTrue(result.converged, 'Wrong answer')
+            self.assertVectorAlmostEqual(result.solution, expected, 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
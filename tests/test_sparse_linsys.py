@@ -0,0 +1,51 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from linsys import LinearSystem
+from vector import Vector
+from sparse_linsys import SparseLinearSystem
+
+BACKENDS = ('float', 'decimal', 'fraction')
+
+
+def random_matrix(rng, n, m=None, low=-9, high=9):
+    return [[rng.randint(low, high) for _ in range(m or n)] for _ in range(n)]
+
+
+class SparseLinearSystemTestCase(unittest.TestCase):
+    """Test for sparse elimination against the dense solver"""
+
+    def setUp(self):
+        self.rng = random.Random(666)
+
+    def assertVectorAlmostEqual(self, u, v, places=6):
+        u = u.coordinates if isinstance(u, Vector) else u
+        self.assertEqual(len(u), len(v), 'Wrong answer')
+        for x, y in zip(u, v):
+            self.assertAlmostEqual(float(x), float(y), places, 'Wrong answer')
+
+    def test_sparse_matches_dense(self):
+        for n in range(2, 8):
+            A = random_matrix(self.rng, n)
+            for row in A:
+                for j in self.rng.sample(range(n), n // 2):
+                    row[j] = 0
+            b = [self.rng.randint(-9, 9) for _ in range(n)]
+            for backend in BACKENDS:
+                dense = LinearSystem.from_matrix(A, b, backend)
+                solution = SparseLinearSystem.from_linear_system(dense).compute_solution()
+                expected = dense.compute_solution()
+                if expected == LinearSystem.NO_SOLUTIONS_MSG:
+                    self.assertEqual(solution, expected, 'Wrong answer')
+                    continue
+                self.assertEqual(len(solution.direction_vectors), len(expected.direction_vectors),
+                                 'Wrong answer')
+                self.assertVectorAlmostEqual(solution.basepoint, expected.basepoint.coordinates)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import random
+import sys
+import unittest
+from fractions import Fraction
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'linear_algebra-master'))
+
+from streaming_regression import StreamingLinearRegression, linearRegression
+
+
+# 一次性用全部数据的精确最小二乘解 (m, b) 和均方误差
+def batch_least_squares(points):
+    points = [(Fraction(x), Fraction(y)) for x, y in points]
+    n = len(points)
+    sx = sum(x for x, _ in points)
+    sy = sum(y for _, y in points)
+    sxx = sum(x * x for x, _ in points)
+    sxy = sum(x * y for x, y in points)
+    m = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+    b = (sy - m * sx) / n
+    mse = sum((y - m * x - b) ** 2 for x, y in points) / n
+    return float(m), float(b), float(mse)
+
+
+def noisy_line(rng, count, m, b, offset=0.0):
+    xs = [offset + rng.uniform(-10, 10) for _ in range(count)]
+    return [(x, m * x + b + rng.gauss(0, 0.5)) for x in xs]
+
+
+class StreamingRegressionTestCase(unittest.TestCase):
+    """Test for the O(1)-memory streaming linear regression"""
+
+    def setUp(self):
+        self.rng = random.Random(666)
+
+    def assertFitEqual(self, model, points, places=9):
+        m, b, mse = batch_least_squares(points)
+        fit_m, fit_b = model.coefficients()
+        self.assertAlmostEqual(fit_m, m, places, 'Wrong answer')
+        self.assertAlmostEqual(fit_b, b, places, 'Wrong answer')
+        self.assertAlmostEqual(model.mse(), mse, places, 'Wrong answer')
+
+    def test_matches_batch_least_squares(self):
+        points = noisy_line(self.rng, 500, 2.5, -3.0)
+        model = StreamingLinearRegression().partial_fit(iter(points))
+        self.assertEqual(model.n, 500, 'Wrong answer')
+        self.assertFitEqual(model, points)
+        m, b = linearRegression([x for x, _ in points], [y for _, y in points])
+        self.assertEqual((m, b), model.coefficients(), 'Wrong answer')
+
+    def test_merge_matches_sequential(self):
+        points = noisy_line(self.rng, 300, -1.25, 7.0)
+        parts = [points[:1], points[1:120], [], points[120:]]
+        merged = StreamingLinearRegression()
+        for part in parts:
+            shard = StreamingLinearRegression().partial_fit(part)
+            merged.merge(StreamingLinearRegression.from_state(shard.state()))
+        sequential = StreamingLinearRegression().partial_fit(points)
+        self.assertEqual(merged.n, sequential.n, 'Wrong answer')
+        for a, b in zip(merged.state(), sequential.state()):
+            self.assertAlmostEqual(a, b, 7, 'Wrong answer')
+        self.assertFitEqual(merged, points)
+
+    def test_large_offset(self):
+        # x 在 1e8 附近，按原始和式计算会损失全部有效数字
+        points = noisy_line(self.rng, 200, 0.5, 1.0, offset=1e8)
+        model = StreamingLinearRegression().partial_fit(points)
+        m, b, mse = batch_least_squares(points)
+        fit_m, fit_b = model.coefficients()
+        # 截距外推到 x=0，只能要求相对误差小
+        self.assertTrue(abs(fit_m - m) < 1e-9, 'Wrong answer')
+        self.assertTrue(abs(fit_b - b) < 1e-7 * abs(b), 'Wrong answer')
+        self.assertAlmostEqual(model.mse(), mse, 6, 'Wrong answer')
+
+    def test_not_enough_points(self):
+        for points in ([], [(1, 2)], [(3, 1), (3, 5)]):
+            model = StreamingLinearRegression().partial_fit(points)
+            with self.assertRaises(ValueError):
+                model.coefficients()
+            with self.assertRaises(ValueError):
+                model.mse()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import random
+import sys
+import unittest
+from fractions import Fraction
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from linsys import LinearSystem
+from plane import Plane
+from vector import Vector
+
+
+def random_matrix(rnd, n, p, q, diagonal=10):
+    return [[diagonal if i == j else (rnd.randint(-5, 5) if -p <= j - i <= q else 0)
+             for j in range(n)] for i in range(n)]
+
+
+class StructuredSolveTestCase(unittest.TestCase):
+    """Test for structure detection and structure-specific solvers"""
+
+    def test_dispatch_matches_exact_solution(self):
+        rnd = random.Random(25)
+        n = 12
+        cases = [((0, 0), 'diagonal'), ((n, 0), 'lower_triangular'), ((0, n), 'upper_triangular'),
+                 ((1, 1), 'tridiagonal'), ((2, 3), 'banded'), ((n, n), 'general')]
+        for (p, q), kind in cases:
+            A = random_matrix(rnd, n, p, q)
+            b = [rnd.randint(-9, 9) for _ in range(n)]
+            s = LinearSystem.from_matrix(A, b, 'fraction')
+            solution = s.compute_solution()
+            self.assertEqual(s.last_structure.kind, kind, 'Wrong answer')
+            self.assertEqual(s.last_structure.solver, 'rref' if kind == 'general' else kind, 'Wrong answer')
+            exact = LinearSystem.from_matrix(A, b, 'fraction').compute_exact_solution()
+            self.assertEqual(solution.basepoint.coordinates, exact.basepoint.coordinates, 'Wrong answer')
+
+    def test_fallback_when_pivoting_is_needed(self):
+        s = LinearSystem.from_matrix([[0, 1], [1, 0]], [1, 2])
+        solution = s.compute_solution()
+        self.assertEqual(s.last_structure.solver, 'rref', 'Wrong answer')
+        self.assertEqual(solution.basepoint.coordinates, (2.0, 1.0), 'Wrong answer')
+
+    def test_singular_triangular_falls_back(self):
+        s = LinearSystem.from_matrix([[1, 2], [0, 0]], [1, 1])
+        self.assertEqual(s.compute_solution(), LinearSystem.NO_SOLUTIONS_MSG, 'Wrong answer')
+        self.assertEqual(s.last_structure.solver, 'rref', 'Wrong answer')
+
+    def test_profiler_records_structured_solve(self):
+        s = LinearSystem.from_matrix([[1, 2], [0, 3]], [1, 2], 'decimal')
+        s.enable_profiling()
+        s.compute_solution()
+        report = s.profiler.report()
+        self.assertIn('detect_structure', report['operations'])
+        self.assertIn('structured_solve', report['operations'])
+        self.assertEqual(report['counters'].get('structured_upper_triangular'), 1, 'Wrong answer')
+
+    def test_last_structure_updated_for_incremental_rref(self):
+        s = LinearSystem.from_matrix([[1, 2], [0, 3]], [1, 2], 'fraction')
+        s.compute_solution()
+        self.assertEqual(s.last_structure.solver, 'upper_triangular', 'Wrong answer')
+        s.add_equation(Plane(Vector([1, 1], 'fraction'), Fraction(1, 3), backend='fraction'))
+        solution = s.compute_solution()
+        self.assertEqual(s.last_structure.solver, 'incremental_rref', 'Wrong answer')
+        self.assertEqual(solution.basepoint.coordinates, (Fraction(-1, 3), Fraction(2, 3)), 'Wrong answer')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from vector import Vector, VectorArray
+
+
+def random_vectors(rng, count, dimension):
+    return [[rng.uniform(-5, 5) for _ in range(dimension)] for _ in range(count)]
+
+
+class VectorArrayTestCase(unittest.TestCase):
+    """Test for batched vector operations against the per-Vector methods"""
+
+    def setUp(self):
+        self.rng = random.Random(666)
+
+    def assertVectorsEqual(self, result, expected):
+        self.assertIsInstance(result, VectorArray, 'Wrong answer')
+        self.assertEqual(len(result), len(expected), 'Wrong answer')
+        for r, e in zip(result, expected):
+            for x, y in zip(r.coordinates, e.coordinates):
+                self.assertAlmostEqual(x, y, 9, 'Wrong answer')
+
+    def assertValuesEqual(self, result, expected):
+        self.assertEqual(len(result), len(expected), 'Wrong answer')
+        for x, y in zip(result, expected):
+            self.assertAlmostEqual(x, y, 9, 'Wrong answer')
+
+    def test_pairwise_matches_vector(self):
+        for dimension in (2, 3):
+            us = random_vectors(self.rng, 20, dimension)
+            ws = random_vectors(self.rng, 20, dimension)
+            a, b = VectorArray(us), VectorArray(ws)
+            pairs = [(Vector(u), Vector(w)) for u, w in zip(us, ws)]
+            self.assertVectorsEqual(a.plus(b), [v.plus(w) for v, w in pairs])
+            self.assertVectorsEqual(a.minus(b), [v.minus(w) for v, w in pairs])
+            self.assertVectorsEqual(a.times_scalar(2.5), [v.times_scalar(2.5) for v, _ in pairs])
+            self.assertVectorsEqual(a.touying(b), [v.touying(w) for v, w in pairs])
+            self.assertVectorsEqual(a.chuizhi(b), [v.chuizhi(w) for v, w in pairs])
+            self.assertVectorsEqual(a.xiangliangji(b), [v.xiangliangji(w) for v, w in pairs])
+            self.assertValuesEqual(a.xiangliang_chengfa(b), [v.xiangliang_chengfa(w) for v, w in pairs])
+            self.assertValuesEqual(a.xiangliang_val(), [v.xiangliang_val() for v, _ in pairs])
+            self.assertValuesEqual(a.sanjiaoxing_mianji(b), [v.sanjiaoxing_mianji(w) for v, w in pairs])
+            self.assertValuesEqual(a.pingxingsibianxing_mianji(b),
+                                   [v.pingxingsibianxing_mianji(w) for v, w in pairs])
+            self.assertEqual(a.zhengjiao(b), [v.zhengjiao(w) for v, w in pairs], 'Wrong answer')
+
+    def test_broadcast_matches_vector(self):
+        us = random_vectors(self.rng, 15, 3)
+        a = VectorArray(us)
+        b = Vector([1.0, -2.0, 0.5])
+        self.assertVectorsEqual(a.touying(b), [Vector(u).touying(b) for u in us])
+        self.assertVectorsEqual(a.chuizhi(b), [Vector(u).chuizhi(b) for u in us])
+        self.assertVectorsEqual(a.xiangliangji(Vector([1, 2])), [Vector(u).xiangliangji(Vector([1, 2])) for u in us])
+        self.assertValuesEqual(a.xiangliang_chengfa([0, 1, 0]), [u[1] for u in us])
+        self.assertEqual(a.zhengjiao(Vector([0, 0, 0])), [True] * 15, 'Wrong answer')
+
+    def test_mismatch_errors(self):
+        a = VectorArray(random_vectors(self.rng, 4, 3))
+        with self.assertRaises(ValueError):
+            a.plus(VectorArray(random_vectors(self.rng, 5, 3)))
+        with self.assertRaises(ValueError):
+            a.xiangliang_chengfa(VectorArray(random_vectors(self.rng, 4, 2)))
+        with self.assertRaises(ValueError):
+            a.touying(Vector([1, 2]))
+        with self.assertRaises(ValueError):
+            VectorArray([[1, 2, 3], [4, 5]])
+        with self.assertRaises(ValueError):
+            a.append([1, 2])
+        with self.assertRaises(Exception):
+            a.touying(Vector([0, 0, 0]))
+        with self.assertRaises(Exception):
+            VectorArray(random_vectors(self.rng, 2, 4)).xiangliangji(Vector([1, 2, 3]))
+
+    def test_construction(self):
+        vectors = random_vectors(self.rng, 6, 3)
+        a = VectorArray(vectors)
+        b = VectorArray.from_buffer([x for v in vectors for x in v], 3)
+        c = VectorArray(dimension=3)
+        c.extend(Vector(v) for v in vectors)
+        for other in (b, c):
+            self.assertEqual([v.coordinates for v in other], [v.coordinates for v in a], 'Wrong answer')
+        self.assertEqual(a[2].coordinates, tuple(vectors[2]), 'Wrong answer')
+        self.assertEqual(len(VectorArray(dimension=2)), 0, 'Wrong answer')
+
+
+if __name__ == '__main__':
+    unittest.main()
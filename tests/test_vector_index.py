@@ -0,0 +1,103 @@
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from vector import Vector
+from vector_index import VectorIndex
+
+
+def random_vectors(rng, count, dimension):
+    return [[rng.gauss(0, 1) for _ in range(dimension)] for _ in range(count)]
+
+
+def cosine(u, v):
+    return sum(a * b for a, b in zip(u, v)) / math.sqrt(sum(a * a for a in u) * sum(b * b for b in v))
+
+
+# 暴力计算：按 cos 从大到小、id 从小到大排序的前k个
+def brute_force(vectors, query, k):
+    scored = sorted(((-cosine(v, query), i) for i, v in vectors.items()))
+    return [(i, -c) for c, i in scored[:k]]
+
+
+class VectorIndexTestCase(unittest.TestCase):
+    """Test for top-k angular similarity queries"""
+
+    def setUp(self):
+        self.rng = random.Random(666)
+
+    def assertResultsEqual(self, result, expected):
+        self.assertEqual([i for i, _ in result], [i for i, _ in expected], 'Wrong answer')
+        for (_, c), (_, e) in zip(result, expected):
+            self.assertAlmostEqual(c, e, 9, 'Wrong answer')
+
+    def test_exact_insert_query_delete_reinsert(self):
+        index = VectorIndex(5)
+        vectors = random_vectors(self.rng, 50, 5)
+        stored = dict(zip(index.extend(vectors), vectors))
+        queries = random_vectors(self.rng, 5, 5)
+        for q in queries:
+            self.assertResultsEqual(index.query(q, k=3), brute_force(stored, q, 3))
+
+        # 删除后不再返回，空出的位置被再次插入复用
+        for vector_id in list(stored)[::2]:
+            index.delete(vector_id)
+            del stored[vector_id]
+        size = len(index.data)
+        for v in random_vectors(self.rng, 10, 5):
+            stored[index.insert(Vector(v))] = v
+        self.assertEqual(len(index.data), size, 'Wrong answer')
+        self.assertEqual(len(index), len(stored), 'Wrong answer')
+
+        results = index.query_batch(queries, k=4)
+        for q, result in zip(queries, results):
+            self.assertResultsEqual(result, brute_force(stored, q, 4))
+
+        with self.assertRaises(KeyError):
+            index.delete(0)
+
+    def test_lsh_finds_near_duplicates(self):
+        index = VectorIndex(8, mode='lsh', num_tables=6, num_bits=8, seed=1)
+        vectors = random_vectors(self.rng, 200, 8)
+        ids = index.extend(vectors)
+        for vector_id, v in list(zip(ids, vectors))[:20]:
+            query = [x + self.rng.gauss(0, 1e-3) for x in v]
+            self.assertEqual(index.query(query, k=1)[0][0], vector_id, 'Wrong answer')
+
+        # 删除后再插入相同的向量，桶也随之更新
+        index.delete(ids[0])
+        self.assertNotEqual(index.query(vectors[0], k=1)[0][0], ids[0], 'Wrong answer')
+        new_id = index.insert(vectors[0])
+        self.assertEqual(index.query(vectors[0], k=1)[0][0], new_id, 'Wrong answer')
+
+    def test_lsh_probes_widen_candidates(self):
+        vectors = random_vectors(self.rng, 300, 6)
+        query = random_vectors(self.rng, 1, 6)[0]
+        sizes = []
+        for probes in range(4):
+            index = VectorIndex(6, mode='lsh', num_tables=2, num_bits=10, probes=probes, seed=3)
+            index.extend(vectors)
+            sizes.append(len(index._candidates(index._unit(query))))
+        self.assertEqual(sizes, sorted(sizes), 'Wrong answer')
+        self.assertTrue(sizes[0] < sizes[1] < sizes[2] < sizes[3], 'Wrong answer')
+
+    def test_k_zero_and_metrics(self):
+        index = VectorIndex(2)
+        index.extend([[1, 0], [0, 1]])
+        self.assertEqual(index.query([1, 0], k=0), [], 'Wrong answer')
+        self.assertEqual(index.query_batch([[1, 0], [0, 1]], k=-1), [[], []], 'Wrong answer')
+        self.assertResultsEqual(index.query([1, 1], k=5, metric='angle'), [(0, math.pi / 4), (1, math.pi / 4)])
+        with self.assertRaises(ValueError):
+            index.query([1, 0], metric='dot')
+        with self.assertRaises(ValueError):
+            index.insert([1, 0, 0])
+        with self.assertRaises(Exception):
+            index.insert([0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,16 +1,117 @@
 # -*- coding: utf-8 -*-
 import math
-from decimal import Decimal,getcontext
+from array import array
+from functools import wraps
+from itertools import repeat
+from operator import add, sub, mul, truediv
+from decimal import Context, Decimal, localcontext
+from fractions import Fraction
+
+
+# 数值后端：决定坐标的存储类型以及开方、判零方式
+class Backend(object):
+    def __init__(self, name, convert, sqrt, exact=False, context=None):
+        self.name = name
+        self.convert = convert
+        self.sqrt = sqrt
+        # 精确后端（Fraction）判零不使用容差
+        self.exact = exact
+        # decimal运算使用的上下文，其他后端为None
+        self.context = context
+
+    def is_near_zero(self, x, eps=1e-10):
+        if self.exact:
+            return x == 0
+        return abs(x) < eps
+
+    def __repr__(self):
+        return 'Backend({!r})'.format(self.name)
+
+
+# 有效数字为precision位的decimal后端：转换、开方和消元使用后端自己的上下文，不修改全局decimal上下文
+def decimal_backend(precision=30, name='decimal'):
+    context = Context(prec=precision)
+
+    def convert(x):
+        # Decimal不能直接由Fraction构造
+        if isinstance(x, Fraction):
+            return context.divide(Decimal(x.numerator), Decimal(x.denominator))
+        return Decimal(x)
+
+    return Backend(name, convert, lambda x: context.sqrt(convert(x)), context=context)
+
+
+FLOAT = Backend('float', float, math.sqrt)
+DECIMAL = decimal_backend(30)
+
+
+def _fraction_sqrt(x):
+    # 有理数一般没有精确平方根，借助Decimal开方后再转回Fraction
+    c = DECIMAL.context
+    return Fraction(c.divide(c.sqrt(Decimal(x.numerator)), c.sqrt(Decimal(x.denominator))))
+
+
+FRACTION = Backend('fraction', Fraction, _fraction_sqrt, exact=True)
+
+BACKENDS = {b.name: b for b in (FLOAT, DECIMAL, FRACTION)}
+
+# 默认使用float64，追求吞吐量；需要精度时可切换为decimal或fraction
+_default_backend = FLOAT
+
+
+def get_backend(backend=None):
+    if backend is None:
+        return _default_backend
+    if isinstance(backend, Backend):
+        return backend
+    try:
+        return BACKENDS[backend]
+    except KeyError:
+        raise ValueError('Unknown backend: {}'.format(backend))
+
+
+def set_backend(backend):
+    global _default_backend
+    _default_backend = get_backend(backend)
+    return _default_backend
+
+
+# 方法装饰器：在 self.backend 的运算上下文中执行，用于消元、分解等成批运算的入口
+# 单个向量的运算不切换上下文，decimal向量直接运算时使用调用方的上下文
+def in_backend_context(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.backend.context is None:
+            return method(self, *args, **kwargs)
+        with localcontext(self.backend.context):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+# 根据数值类型判断是否接近0，Fraction按精确值判断
+def is_near_zero(x, eps=1e-10):
+    if isinstance(x, Fraction):
+        return x == 0
+    return abs(x) < eps
 
-# 全局设置小数点后30位
-getcontext().prec = 30
 
 class Vector(object):
-    def __init__(self, coordinates):
+
+    # 做运算的方法在后端自己的decimal上下文中计算，结果不受调用方全局上下文精度的影响
+    # 不使用实例字典，每个向量只占三个槽位
+    __slots__ = ('backend', 'coordinates', 'dimension')
+
+    CANNOT_NORMALIZE_ZERO_VECTOR_MSG = 'xiangliang da xiao buneng wei 0'
+    NO_UNIQUE_PARALLEL_COMPONENT_MSG = 'No unique parallel component'
+    ONLY_DEFINED_IN_TWO_THREE_DIMS_MSG = 'Only defined in two and three dimensions'
+
+    def __init__(self, coordinates, backend=None):
         try:
             if not coordinates:
                 raise ValueError
-            self.coordinates = tuple([Decimal(x) for x in coordinates])
+            self.backend = get_backend(backend)
+            convert = self.backend.convert
+            self.coordinates = tuple([convert(x) for x in coordinates])
             self.dimension = len(self.coordinates)
 
         except ValueError:
@@ -21,7 +122,22 @@ class Vector(object):
 
 
     def __getitem__(self,index):
-        return Decimal(self.coordinates[index])
+        return self.coordinates[index]
+
+    # 转换到另一个数值后端
+    def to_backend(self, backend):
+        backend = get_backend(backend)
+        if backend is self.backend:
+            return self
+        return Vector(self.coordinates, backend)
+
+    # 运算结果已经是后端类型，跳过逐个转换直接构造
+    def _new(self, coordinates):
+        v = Vector.__new__(Vector)
+        v.backend = self.backend
+        v.coordinates = tuple(coordinates)
+        v.dimension = len(v.coordinates)
+        return v
 
 
     # print时调用的方法
@@ -32,34 +148,41 @@ class Vector(object):
     def __eq__(self, v):
         return self.coordinates == v.coordinates
 
+    @in_backend_context
     def plus(self, other):
         new_res = [x+y for x,y in zip(self.coordinates,other.coordinates)]
-        return Vector(new_res)
+        return self._new(new_res)
 
+    @in_backend_context
     def minus(self, other):
         new_res = [x-y for x,y in zip(self.coordinates,other.coordinates)]
-        return Vector(new_res)
+        return self._new(new_res)
 
     # 常量与向量相乘
+    @in_backend_context
     def times_scalar(self, c):
-        new_res = [Decimal(c)*x for x in self.coordinates]
-        return Vector(new_res)
+        c = self.backend.convert(c)
+        new_res = [c*x for x in self.coordinates]
+        return self._new(new_res)
 
     # 向量大小 勾股定理
+    @in_backend_context
     def xiangliang_val(self):
-        res = [x**2 for x in self.coordinates]
-        # 使用Decimal模块内置了一个计算开方的函数，返回decimal类型，否则判断平行时会因为精度问题判断错误
-        return sum(res).sqrt()
+        res = [x*x for x in self.coordinates]
+        # 由后端负责开方，decimal后端返回decimal类型，否则判断平行时会因为精度问题判断错误
+        return self.backend.sqrt(sum(res))
 
     # 单位向量
+    @in_backend_context
     def unit_xiangliang(self):
         try:
             magnitude = self.xiangliang_val()
-            return self.times_scalar(Decimal('1.0')/Decimal(magnitude))
+            return self.times_scalar(1/magnitude)
         except ZeroDivisionError:
-            raise Exception('xiangliang da xiao buneng wei 0')
+            raise Exception(self.CANNOT_NORMALIZE_ZERO_VECTOR_MSG)
 
     # 向量相乘
+    @in_backend_context
     def xiangliang_chengfa(self, v):
         new_res = [x*y for x, y in zip(self.coordinates, v.coordinates)]
         return sum(new_res)
@@ -70,7 +193,8 @@ class Vector(object):
         unit_w = other.unit_xiangliang()
         try:
             cos_val = unit_v.xiangliang_chengfa(unit_w)
-            hudu = math.acos(cos_val)
+            # float舍入可能使cos值略超出[-1,1]
+            hudu = math.acos(max(-1.0, min(1.0, float(cos_val))))
             if type == 'jiaodu':
                 # 返回角度值
                 degree_per_radian = 180./math.pi
@@ -85,9 +209,12 @@ class Vector(object):
         ji = self.xiangliang_chengfa(v)
         return abs(ji) < tolerance
 
-    # 是否平行
-    def pingxing(self,v):
-        return self.is_zero() or v.is_zero() or self.xiangliang_hudu(v) == math.pi or self.xiangliang_hudu(v) == 0
+    # 是否平行，夹角cos值的绝对值为1
+    def pingxing(self,v,tolerance=1e-10):
+        if self.is_zero() or v.is_zero():
+            return True
+        cos_val = self.unit_xiangliang().xiangliang_chengfa(v.unit_xiangliang())
+        return abs(abs(cos_val) - 1) < tolerance
 
     # 是否是零向量
     def is_zero(self,tolerance=1e-10):
@@ -120,33 +247,290 @@ class Vector(object):
 
 
     # 向量积
+    @in_backend_context
     def xiangliangji(self,w):
-        try:
-            x1,y1,z1 = self.coordinates
-            x2,y2,z2 = w.coordinates
-            return Vector([y1*z2-y2*z1,-(x1*z2-x2*z1),x1*y2-x2*y1])
-        except Exception as e:
-            msg = str(e)
-            if msg == 'need more than 2 values to unpack':
-                # 如果向量为二维（有两个值）则增加第三个值为0
-                a = Vector(self.coordinates+('0',))
-                b = Vector(w.coordinates+('0',))
-                return a.xiangliangji(b)
-            elif (msg == 'too many values to unpack' or msg == 'need more than 1 values to unpack'):
-                # 如果向量值超过3个或者少于2个，报错
-                raise Exception(self.ONLY_DEFINED_IN_TWO_THREE_DIMS_MSG)
-            else:
-                raise e
+        # 如果向量值超过3个或者少于2个，报错
+        if not (2 <= self.dimension <= 3 and 2 <= w.dimension <= 3):
+            raise Exception(self.ONLY_DEFINED_IN_TWO_THREE_DIMS_MSG)
+        # 二维向量的第三个值按0计算，不复制坐标补齐
+        zero = self.backend.convert(0)
+        x1, y1 = self.coordinates[0], self.coordinates[1]
+        z1 = self.coordinates[2] if self.dimension == 3 else zero
+        x2, y2 = w.coordinates[0], w.coordinates[1]
+        z2 = w.coordinates[2] if w.dimension == 3 else zero
+        return self._new([y1*z2-y2*z1,-(x1*z2-x2*z1),x1*y2-x2*y1])
 
     # 两个向量组成平行四边形的面积
     def pingxingsibianxing_mianji(self,w):
         ji = self.xiangliangji(w)
-        return Vector(ji).xiangliang_val()
+        return ji.xiangliang_val()
 
     # 两个向量组成三角形的面积
     def sanjiaoxing_mianji(self, w):
         ji = self.xiangliangji(w)
-        return Vector(ji).xiangliang_val()/Decimal('2.0')
+        return ji.xiangliang_val()/2
+
+
+# float64坐标直接存放在 array('d') 或任意支持缓冲区协议的对象中（通过memoryview访问）
+# 可以作为一块共享内存（如矩阵的一行、mmap文件）上的零复制视图：对象只保存
+# 共享的memoryview、起始位置和长度，切片同样不复制
+# 注意：视图存在期间，底层的 array 不能改变长度，mmap 不能关闭
+# 只新增 data、offset 两个槽位，backend 和 dimension（即长度）沿用 Vector 的槽位；
+# Vector 的 coordinates 槽位被下面的属性覆盖，每个视图仍有这一个指针用不到
+# 构造函数总是复制出一块新的内存（传入 ArrayVector 也一样）；要共享内存用 view/rows/切片
+class ArrayVector(Vector):
+
+    __slots__ = ('data', 'offset')
+
+    def __init__(self, coordinates, backend=None):
+        if backend is not None and get_backend(backend) is not FLOAT:
+            raise ValueError('ArrayVector only supports the float backend')
+        if isinstance(coordinates, ArrayVector):
+            coordinates = coordinates.coordinates
+        data = memoryview(array('d', _as_double_buffer(coordinates)))
+        if not len(data):
+            raise ValueError('The coordinates must be nonempty')
+        self.backend = FLOAT
+        self.data = data
+        self.offset = 0
+        self.dimension = len(data)
+
+    # buffer 中从第 offset 个double开始、长度为 dimension 的视图，dimension 可以为0
+    @classmethod
+    def view(cls, buffer, offset=0, dimension=None):
+        data = _as_double_buffer(buffer)
+        if dimension is None:
+            dimension = len(data) - offset
+        if offset < 0 or dimension < 0 or offset + dimension > len(data):
+            raise IndexError('view out of range')
+        return cls._from_buffer(data, offset, dimension)
+
+    # 把连续存放的一块数据按行切分为若干个 dimension 维向量，都是零复制视图
+    @classmethod
+    def rows(cls, buffer, dimension):
+        data = _as_double_buffer(buffer)
+        if len(data) % dimension:
+            raise ValueError('Buffer length is not a multiple of the dimension')
+        return [cls._from_buffer(data, i, dimension) for i in range(0, len(data), dimension)]
+
+    @classmethod
+    def _from_buffer(cls, data, offset, length):
+        v = cls.__new__(cls)
+        v.backend = FLOAT
+        v.data = data
+        v.offset = offset
+        v.dimension = length
+        return v
+
+    @property
+    def coordinates(self):
+        return self.data[self.offset:self.offset+self.dimension]
+
+    def __len__(self):
+        return self.dimension
+
+    # 下标直接读共享内存；步长为1的切片返回共享同一块内存的 ArrayVector（可以为空），
+    # 其他步长复制
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.dimension)
+            if step != 1:
+                return self._new(self.coordinates[index])
+            return self._from_buffer(self.data, self.offset + start, max(0, stop - start))
+        if index < 0:
+            index += self.dimension
+        if not 0 <= index < self.dimension:
+            raise IndexError('index out of range')
+        return self.data[self.offset + index]
+
+    def _new(self, coordinates):
+        data = memoryview(array('d', coordinates))
+        return self._from_buffer(data, 0, len(data))
+
+    def tolist(self):
+        return self.coordinates.tolist()
+
+    def __eq__(self, v):
+        return tuple(self.coordinates) == tuple(v.coordinates)
+
+    def __str__(self):
+        return 'Vector: {}'.format(tuple(self.coordinates))
+
+    def __reduce__(self):
+        return (ArrayVector.view, (array('d', self.coordinates),))
+
+
+# 缓冲区协议对象转为按double访问的一维memoryview：bytes/bytearray/mmap 按double解释，
+# 已是double的直接使用，其他类型（list、其他类型的数组）复制为 array('d')
+def _as_double_buffer(obj):
+    try:
+        data = memoryview(obj)
+    except TypeError:
+        return memoryview(array('d', obj))
+    if data.format == 'd' and data.ndim == 1:
+        return data
+    if data.format in ('B', 'b', 'c'):
+        return data.cast('B').cast('d')
+    return memoryview(array('d', data.tolist()))
+
+
+# N个float64向量按列存放：columns[k] 为所有向量第k个坐标组成的 array('d')
+# 投影、垂直分量、向量积、三角形面积、正交判断一次作用于所有向量，
+# 另一个操作数可以是单个 Vector（广播）或等长的 VectorArray（逐个配对），循环都在 map 中完成
+# 只用标准库，每个元素仍是一个Python float：三维、30万对时投影/垂直分量约 20-25 万对/秒，
+# 向量积约 60 万对/秒，内积约 80 万对/秒，是逐对调用 Vector 方法的 4-10 倍，
+# 但达不到每秒百万对以上；需要更高吞吐时应改用 numpy
+class VectorArray(object):
+
+    __slots__ = ('columns', 'dimension')
+
+    LENGTH_MISMATCH_MSG = 'VectorArrays must have the same length'
+    DIMENSION_MISMATCH_MSG = 'Vectors must have the same dimension'
+
+    def __init__(self, vectors=(), dimension=None):
+        vectors = [v.coordinates if isinstance(v, Vector) else v for v in vectors]
+        if dimension is None:
+            if not vectors:
+                raise ValueError('dimension is required for an empty VectorArray')
+            dimension = len(vectors[0])
+        self.dimension = dimension
+        if any(len(v) != dimension for v in vectors):
+            raise ValueError(self.DIMENSION_MISMATCH_MSG)
+        self.columns = [array('d', col) for col in zip(*vectors)] if vectors \
+            else [array('d') for _ in range(dimension)]
+
+    @classmethod
+    def from_columns(cls, columns):
+        columns = [c if isinstance(c, array) and c.typecode == 'd' else array('d', c) for c in columns]
+        if not columns or len(set(len(c) for c in columns)) != 1:
+            raise ValueError('Columns must be nonempty and of equal length')
+        va = cls.__new__(cls)
+        va.columns = columns
+        va.dimension = len(columns)
+        return va
+
+    # 行优先连续存放的数据（如 array('d')、mmap 文件）转为按列存放
+    @classmethod
+    def from_buffer(cls, buffer, dimension):
+        data = _as_double_buffer(buffer)
+        return cls.from_columns([data[k::dimension].tolist() for k in range(dimension)])
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def __getitem__(self, i):
+        return Vector([col[i] for col in self.columns], FLOAT)
+
+    def __iter__(self):
+        for coords in zip(*self.columns):
+            yield Vector(coords, FLOAT)
+
+    def append(self, v):
+        coords = v.coordinates if isinstance(v, Vector) else v
+        if len(coords) != self.dimension:
+            raise ValueError(self.DIMENSION_MISMATCH_MSG)
+        for col, x in zip(self.columns, coords):
+            col.append(x)
+
+    def extend(self, vectors):
+        for v in vectors:
+            self.append(v)
+
+    def to_vectors(self):
+        return list(self)
+
+    # 另一个操作数的各列：单个向量每一列为重复的常数，VectorArray 需等长
+    def _other_columns(self, other, dimension=None):
+        dimension = dimension or self.dimension
+        if isinstance(other, VectorArray):
+            if len(other) != len(self):
+                raise ValueError(self.LENGTH_MISMATCH_MSG)
+            if other.dimension != dimension:
+                raise ValueError(self.DIMENSION_MISMATCH_MSG)
+            return other.columns
+        coords = other.coordinates if isinstance(other, Vector) else other
+        if len(coords) != dimension:
+            raise ValueError(self.DIMENSION_MISMATCH_MSG)
+        n = len(self)
+        return [repeat(float(x), n) for x in coords]
+
+    def _new(self, columns):
+        return VectorArray.from_columns([array('d', c) for c in columns])
+
+    def plus(self, other):
+        return self._new([map(add, a, b) for a, b in zip(self.columns, self._other_columns(other))])
+
+    def minus(self, other):
+        return self._new([map(sub, a, b) for a, b in zip(self.columns, self._other_columns(other))])
+
+    def times_scalar(self, c):
+        c = float(c)
+        return self._new([map(mul, a, repeat(c)) for a in self.columns])
+
+    # 逐个内积，返回 array('d')
+    def xiangliang_chengfa(self, other):
+        cols = self._other_columns(other)
+        result = array('d', map(mul, self.columns[0], cols[0]))
+        for a, b in zip(self.columns[1:], cols[1:]):
+            result = array('d', map(add, result, map(mul, a, b)))
+        return result
+
+    # 逐个向量大小
+    def xiangliang_val(self):
+        return array('d', map(math.sqrt, self.xiangliang_chengfa(self)))
+
+    # 是否正交，内积绝对值小于容差
+    def zhengjiao(self, other, tolerance=1e-10):
+        return [abs(x) < tolerance for x in self.xiangliang_chengfa(other)]
+
+    # 投影到b上：(v·b / b·b) b。b为单个向量时只计算一次b·b
+    def touying(self, b):
+        dots = self.xiangliang_chengfa(b)
+        cols = self._other_columns(b)
+        if isinstance(b, VectorArray):
+            norms2 = b.xiangliang_chengfa(b)
+            if any(x == 0 for x in norms2):
+                raise Exception(Vector.CANNOT_NORMALIZE_ZERO_VECTOR_MSG)
+            factors = array('d', map(truediv, dots, norms2))
+        else:
+            norm2 = sum(x * x for x in (float(y) for y in b.coordinates))
+            if norm2 == 0:
+                raise Exception(Vector.CANNOT_NORMALIZE_ZERO_VECTOR_MSG)
+            factors = array('d', map(mul, dots, repeat(1 / norm2)))
+        return self._new([map(mul, factors, c) for c in cols])
+
+    # 垂直于b的分量：v - 投影
+    def chuizhi(self, b):
+        return self.minus(self.touying(b))
+
+    # 逐个向量积，二维向量的第三个坐标按0计算
+    def xiangliangji(self, w):
+        if not 2 <= self.dimension <= 3:
+            raise Exception(Vector.ONLY_DEFINED_IN_TWO_THREE_DIMS_MSG)
+        n = len(self)
+        w_dimension = w.dimension
+        if not 2 <= w_dimension <= 3:
+            raise Exception(Vector.ONLY_DEFINED_IN_TWO_THREE_DIMS_MSG)
+        zeros = repeat(0.0, n)
+        x1, y1 = self.columns[0], self.columns[1]
+        z1 = self.columns[2] if self.dimension == 3 else array('d', zeros)
+        wc = self._other_columns(w, w_dimension)
+        # 广播时的 repeat 只能遍历一次，先展开为列
+        x2, y2 = array('d', wc[0]), array('d', wc[1])
+        z2 = array('d', wc[2]) if w_dimension == 3 else array('d', repeat(0.0, n))
+        return self._new([
+            map(sub, map(mul, y1, z2), map(mul, y2, z1)),
+            map(sub, map(mul, x2, z1), map(mul, x1, z2)),
+            map(sub, map(mul, x1, y2), map(mul, x2, y1)),
+        ])
+
+    # 逐个平行四边形面积
+    def pingxingsibianxing_mianji(self, w):
+        return self.xiangliangji(w).xiangliang_val()
+
+    # 逐个三角形面积
+    def sanjiaoxing_mianji(self, w):
+        return array('d', map(mul, self.pingxingsibianxing_mianji(w), repeat(0.5)))
 
 
 # test = Vector([1,2])
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+import heapq
+import math
+import random
+from array import array
+from itertools import combinations
+from operator import mul
+
+from vector import Vector
+
+
+# 按夹角（余弦相似度）查找最接近的向量
+# 向量单位化后连续存放在一个 array('d') 中，删除的位置放入空闲列表供再次插入复用
+# mode='exact' 批量线性扫描；mode='lsh' 随机超平面局部敏感哈希，只对候选向量精确打分
+class VectorIndex(object):
+
+    ZERO_VECTOR_MSG = 'Cannot index the zero vector'
+    WRONG_DIMENSION_MSG = 'Vector dimension does not match the index'
+    UNKNOWN_ID_MSG = 'Unknown vector id'
+
+    def __init__(self, dimension, mode='exact', num_tables=8, num_bits=12, probes=1, seed=0):
+        if mode not in ('exact', 'lsh'):
+            raise ValueError('Unknown mode: {}'.format(mode))
+
+        self.dimension = dimension
+        self.mode = mode
+        self.data = array('d')
+        # slot -> id，-1 表示已删除
+        self.slot_ids = []
+        self.id_slots = {}
+        self.free_slots = []
+        self.next_id = 0
+
+        self.num_bits = num_bits
+        # 查询时除了原桶，还探查与签名汉明距离不超过 probes 的相邻桶（0为只查原桶）
+        self.probes = probes
+        self._flip_masks = [sum(1 << bit for bit in bits)
+                            for r in range(1, probes + 1) for bits in combinations(range(num_bits), r)]
+        self.hyperplanes = []
+        self.tables = []
+        if mode == 'lsh':
+            rnd = random.Random(seed)
+            for _ in range(num_tables):
+                self.hyperplanes.append([[rnd.gauss(0, 1) for _ in range(dimension)]
+                                         for _ in range(num_bits)])
+                self.tables.append({})
+
+    def __len__(self):
+        return len(self.id_slots)
+
+    def __contains__(self, vector_id):
+        return vector_id in self.id_slots
+
+    def _unit(self, v):
+        coords = v.coordinates if isinstance(v, Vector) else v
+        if len(coords) != self.dimension:
+            raise ValueError(self.WRONG_DIMENSION_MSG)
+        coords = [float(x) for x in coords]
+        norm = math.sqrt(sum(x*x for x in coords))
+        if norm < 1e-10:
+            raise Exception(self.ZERO_VECTOR_MSG)
+        return [x / norm for x in coords]
+
+    def _signatures(self, u):
+        sigs = []
+        for planes in self.hyperplanes:
+            sig = 0
+            for bit, h in enumerate(planes):
+                if sum(map(mul, h, u)) >= 0:
+                    sig |= 1 << bit
+            sigs.append(sig)
+        return sigs
+
+    def insert(self, vector):
+        u = self._unit(vector)
+        d = self.dimension
+
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.data[slot*d:(slot+1)*d] = array('d', u)
+        else:
+            slot = len(self.slot_ids)
+            self.data.extend(u)
+            self.slot_ids.append(-1)
+
+        vector_id = self.next_id
+        self.next_id += 1
+        self.slot_ids[slot] = vector_id
+        self.id_slots[vector_id] = slot
+
+        for table, sig in zip(self.tables, self._signatures(u)):
+            table.setdefault(sig, set()).add(slot)
+        return vector_id
+
+    def extend(self, vectors):
+        return [self.insert(v) for v in vectors]
+
+    def delete(self, vector_id):
+        try:
+            slot = self.id_slots.pop(vector_id)
+        except KeyError:
+            raise KeyError(self.UNKNOWN_ID_MSG)
+
+        if self.tables:
+            d = self.dimension
+            u = self.data[slot*d:(slot+1)*d]
+            for table, sig in zip(self.tables, self._signatures(u)):
+                bucket = table[sig]
+                bucket.discard(slot)
+                if not bucket:
+                    del table[sig]
+
+        self.slot_ids[slot] = -1
+        self.free_slots.append(slot)
+
+    # 返回单位化后的向量
+    def get(self, vector_id):
+        d = self.dimension
+        slot = self.id_slots[vector_id]
+        return Vector(self.data[slot*d:(slot+1)*d])
+
+    def _candidates(self, u):
+        if self.mode == 'exact':
+            return None
+        slots = set()
+        for table, sig in zip(self.tables, self._signatures(u)):
+            bucket = table.get(sig)
+            if bucket:
+                slots.update(bucket)
+            for mask in self._flip_masks:
+                bucket = table.get(sig ^ mask)
+                if bucket:
+                    slots.update(bucket)
+        return slots
+
+    # 对一批查询一起扫描：每个存储向量只取出一次，与所有查询做点积
+    def _scan(self, units, k, slots):
+        d = self.dimension
+        data = self.data
+        slot_ids = self.slot_ids
+        heaps = [[] for _ in units]
+
+        if slots is None:
+            slots = range(len(slot_ids))
+        for slot in slots:
+            vector_id = slot_ids[slot]
+            if vector_id < 0:
+                continue
+            row = data[slot*d:(slot+1)*d]
+            for heap, u in zip(heaps, units):
+                item = (sum(map(mul, row, u)), -vector_id)
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+        return [[(-neg_id, min(1.0, max(-1.0, cos))) for cos, neg_id in sorted(heap, reverse=True)]
+                for heap in heaps]
+
+    # 返回最相近的k个 (id, cos值)；metric='angle' 时返回 (id, 弧度)
+    def query(self, vector, k=10, metric='cos'):
+        return self.query_batch([vector], k, metric)[0]
+
+    def query_batch(self, vectors, k=10, metric='cos'):
+        if metric not in ('cos', 'angle'):
+            raise ValueError('Unknown metric: {}'.format(metric))
+        units = [self._unit(v) for v in vectors]
+        if k <= 0:
+            return [[] for _ in units]
+        if self.mode == 'exact':
+            results = self._scan(units, k, None)
+        else:
+            results = [self._scan([u], k, self._candidates(u))[0] for u in units]
+
+        if metric == 'angle':
+            return [[(i, math.acos(c)) for i, c in r] for r in results]
+        return results